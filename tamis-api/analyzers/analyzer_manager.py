@@ -52,6 +52,14 @@ class AnalyzerManager:
                 'outputs': ['hatay_coordinates.json'],
                 'estimated_time': 30
             },
+            'raster_cache': {
+                'name': 'Raster Önbelleği (COG)',
+                'description': 'Uydu görüntülerinin overview piramitli COG kopyalarını oluştur',
+                'script': 'raster_cache.py',
+                'class': 'RasterCache',
+                'outputs': ['console_output'],
+                'estimated_time': 600
+            },
             'visualization': {
                 'name': 'Statik Görselleştirme',
                 'description': 'Yan yana karşılaştırma görselleştirmeleri oluştur',
@@ -73,7 +81,7 @@ class AnalyzerManager:
                 'description': 'Şiddet analizi ile AI destekli hasar sınıflandırması',
                 'script': 'disaster_labeling.py',
                 'class': 'DisasterLabeler',
-                'outputs': ['hatay_damage_assessment.png', 'hatay_damage_report.json', 'hatay_field_analysis.json'],
+                'outputs': ['hatay_damage_assessment.png', 'hatay_damage_report.json', 'hatay_field_analysis.json', 'hatay_fields.ndjson'],
                 'estimated_time': 180
             },
             'full_analysis': {
@@ -153,13 +161,15 @@ class AnalyzerManager:
         
         return status
     
-    def run_analyzer_script(self, analyzer_id: str, analysis_id: str = None) -> Dict[str, Any]:
+    def run_analyzer_script(self, analyzer_id: str, analysis_id: str = None,
+                            options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Bir analizörü subprocess kullanarak çalıştır (script tabanlı yaklaşım)
         
         Args:
             analyzer_id: Çalıştırılacak analizörün ID'si
             analysis_id: Bu analiz çalışması için benzersiz ID
+            options: Analizöre --options JSON argümanı olarak aktarılacak seçenekler
             
         Returns:
             Analiz sonuçları ve meta verileri içeren Dict
@@ -199,6 +209,8 @@ class AnalyzerManager:
             cmd = [sys.executable, os.path.join(self.analyzers_dir, analyzer['script'])]
             if analyzer_id == 'full_analysis':
                 cmd.append('--auto')
+            if options:
+                cmd += ['--options', json.dumps(options)]
             
             self._update_progress(analysis_id, 20, f"{analyzer['name']} çalıştırılıyor...")
             
@@ -264,13 +276,15 @@ class AnalyzerManager:
         
         return result
     
-    def run_analyzer_class(self, analyzer_id: str, analysis_id: str = None) -> Dict[str, Any]:
+    def run_analyzer_class(self, analyzer_id: str, analysis_id: str = None,
+                           options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Doğrudan sınıf örneklemesi kullanarak analizör çalıştır (sınıf tabanlı yaklaşım)
         
         Args:
             analyzer_id: Çalıştırılacak analizörün ID'si
             analysis_id: Bu analiz çalışması için benzersiz ID
+            options: Analizörün apply_options metoduna aktarılacak seçenekler
             
         Returns:
             Analiz sonuçları ve meta verileri içeren Dict
@@ -282,7 +296,7 @@ class AnalyzerManager:
         
         if not analyzer['class']:
             # Fall back to script-based approach
-            return self.run_analyzer_script(analyzer_id, analysis_id)
+            return self.run_analyzer_script(analyzer_id, analysis_id, options)
         
         analysis_id = analysis_id or f"{analyzer_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         self.current_analysis = analysis_id
@@ -330,7 +344,9 @@ class AnalyzerManager:
             
             # Run the analysis
             if analyzer_id == 'damage_labeling':
-                analysis_result = analyzer_instance.run_analysis()
+                # Options such as damage thresholds or mode='reclassify' become run arguments
+                run_kwargs = analyzer_instance.apply_options(options or {})
+                analysis_result = analyzer_instance.run_analysis(**run_kwargs)
             elif analyzer_id == 'coordinates':
                 analysis_result = analyzer_instance.extract_all_coordinates()
             else:
@@ -367,7 +383,8 @@ class AnalyzerManager:
         
         return result
     
-    def run_analyzer(self, analyzer_id: str, analysis_id: str = None, use_class: bool = True) -> Dict[str, Any]:
+    def run_analyzer(self, analyzer_id: str, analysis_id: str = None, use_class: bool = True,
+                     options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Otomatik yöntem seçimi ile analizör çalıştır
         
@@ -375,6 +392,7 @@ class AnalyzerManager:
             analyzer_id: Çalıştırılacak analizörün ID'si
             analysis_id: Bu analiz çalışması için benzersiz ID
             use_class: Mevcut olduğunda sınıf tabanlı yaklaşımı tercih edip etmeme
+            options: Analizöre aktarılacak seçenekler (ör. damage_thresholds, mode)
             
         Returns:
             Analiz sonuçları ve meta verileri içeren Dict
@@ -386,9 +404,9 @@ class AnalyzerManager:
         
         # Choose execution method
         if use_class and analyzer['class']:
-            return self.run_analyzer_class(analyzer_id, analysis_id)
+            return self.run_analyzer_class(analyzer_id, analysis_id, options)
         else:
-            return self.run_analyzer_script(analyzer_id, analysis_id)
+            return self.run_analyzer_script(analyzer_id, analysis_id, options)
     
     def _check_output_files(self, expected_outputs: List[str]) -> Dict[str, Any]:
         """Beklenen çıktı dosyalarının oluşturulup oluşturulmadığını kontrol et"""
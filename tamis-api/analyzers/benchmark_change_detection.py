@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Değişiklik Tespiti Çekirdeği Karşılaştırması
+Ara bellekleri yeniden kullanan float32 çekirdeği (DisasterLabeler.compute_change_detection_fast)
+önceki float64/geçici dizi sürümüyle hız, bellek ve sonuç farkı açısından karşılaştırır;
+OpenCV SSIM haritasını (compute_ssim_map) skimage structural_similarity ile doğrular;
+Numba kuruluysa JIT çekirdeklerini (kernel_backend='numba') NumPy yoluyla karşılaştırır
+
+Küçük harita farkları referansın gri tonu float np.dot ile hesaplayıp kesmesinden gelir
+(tam sayıya çok yakın değerler bir alta yuvarlanır); aynı gri görüntüyle iki çekirdek
+kayan nokta hassasiyetinde aynı sonucu verir.
+
+Kullanım:
+    python analyzers/benchmark_change_detection.py [--tile 1024] [--tiles 8] [--repeat 3]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+from contextlib import redirect_stdout
+
+import numpy as np
+import cv2
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from disaster_labeling import DisasterLabeler
+from tile_pipeline import TileWorkspace
+from numba_kernels import NUMBA_AVAILABLE
+from region_stitching import measure_tile_regions
+
+
+def reference_change_detection(img1, img2):
+    """
+    Önceki compute_change_detection_fast uygulaması (karşılaştırma referansı)
+
+    Args:
+        img1, img2: Giriş görüntüleri (3D diziler: kanallar, yükseklik, genişlik)
+
+    Returns:
+        (change_map, change_binary)
+    """
+    img1_hwc = np.transpose(img1, (1, 2, 0))
+    img2_hwc = np.transpose(img2, (1, 2, 0))
+
+    gray1 = np.dot(img1_hwc[..., :3], [0.299, 0.587, 0.114]).astype(np.uint8)
+    gray2 = np.dot(img2_hwc[..., :3], [0.299, 0.587, 0.114]).astype(np.uint8)
+
+    mean1 = cv2.blur(gray1.astype(np.float32), (11, 11))
+    mean2 = cv2.blur(gray2.astype(np.float32), (11, 11))
+
+    sqr1 = cv2.blur((gray1.astype(np.float32))**2, (11, 11))
+    sqr2 = cv2.blur((gray2.astype(np.float32))**2, (11, 11))
+
+    std1 = np.sqrt(np.maximum(sqr1 - mean1**2, 0)) + 1e-10
+    std2 = np.sqrt(np.maximum(sqr2 - mean2**2, 0)) + 1e-10
+
+    corr = cv2.blur(gray1.astype(np.float32) * gray2.astype(np.float32), (11, 11))
+    ncc = (corr - mean1 * mean2) / (std1 * std2)
+    change_structural = 1 - np.clip(ncc, -1, 1)
+
+    diff_color = np.linalg.norm(img1_hwc.astype(np.float32) - img2_hwc.astype(np.float32), axis=2)
+    diff_color_norm = diff_color / (np.sqrt(3) * 255)
+
+    sobelx1 = cv2.Sobel(gray1, cv2.CV_64F, 1, 0, ksize=3)
+    sobely1 = cv2.Sobel(gray1, cv2.CV_64F, 0, 1, ksize=3)
+    edges1 = np.sqrt(sobelx1**2 + sobely1**2)
+
+    sobelx2 = cv2.Sobel(gray2, cv2.CV_64F, 1, 0, ksize=3)
+    sobely2 = cv2.Sobel(gray2, cv2.CV_64F, 0, 1, ksize=3)
+    edges2 = np.sqrt(sobelx2**2 + sobely2**2)
+
+    max_edge = max(np.max(edges1), np.max(edges2), 1e-10)
+    edge_diff = np.abs(edges1 - edges2) / max_edge
+
+    change_map = 0.5 * change_structural + 0.3 * diff_color_norm + 0.2 * edge_diff
+    change_map = cv2.GaussianBlur(change_map.astype(np.float32), (3, 3), 0.8)
+
+    threshold = np.mean(change_map) + 1.5 * np.std(change_map)
+    change_binary = (change_map > threshold).astype(np.uint8)
+
+    return change_map, change_binary
+
+
+def make_tile_pair(size, seed):
+    """
+    Yapılı sentetik bir kutucuk çifti üret (yumuşak doku + 2023'te değişen bloklar)
+
+    Args:
+        size: Kutucuk kenar uzunluğu (piksel)
+        seed: Rastgele sayı tohumu
+
+    Returns:
+        (tile_2015, tile_2023) uint8 (3, size, size) dizileri
+    """
+    rng = np.random.default_rng(seed)
+    base = cv2.GaussianBlur(rng.integers(0, 256, (size, size, 3), dtype=np.uint8), (0, 0), 3)
+    after = base.copy()
+    for _ in range(max(1, size // 64)):
+        y, x = rng.integers(0, size - 48, 2)
+        h, w = rng.integers(8, 48, 2)
+        after[y:y + h, x:x + w] = rng.integers(0, 256, 3, dtype=np.uint8)
+    noise = rng.normal(0, 4, after.shape)
+    after = np.clip(after + noise, 0, 255).astype(np.uint8)
+    return np.ascontiguousarray(base.transpose(2, 0, 1)), np.ascontiguousarray(after.transpose(2, 0, 1))
+
+
+def run(func, tiles, repeat):
+    """
+    Fonksiyonu tüm kutucuklarda çalıştır; en iyi süreyi ve numpy bellek tepe değerini ölç
+
+    Returns:
+        (en iyi toplam süre (sn), tepe bellek (bayt), son turun sonuçları)
+    """
+    best = float('inf')
+    results = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [func(t1, t2) for t1, t2 in tiles]
+        best = min(best, time.perf_counter() - start)
+
+    # Peak is measured on a separate pass so tracing does not distort the timings
+    tracemalloc.start()
+    for t1, t2 in tiles:
+        func(t1, t2)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak, results
+
+
+def compare_ssim(labeler, tiles, repeat):
+    """
+    compute_ssim_map'i skimage ile ve hassas dedektörü hızlı dedektörle karşılaştır
+
+    Returns:
+        (skimage süresi, OpenCV süresi, en büyük SSIM farkı, hassas süre, hızlı süre)
+    """
+    from skimage.metrics import structural_similarity
+
+    grays = [(cv2.cvtColor(np.ascontiguousarray(t1.transpose(1, 2, 0)), cv2.COLOR_RGB2GRAY),
+              cv2.cvtColor(np.ascontiguousarray(t2.transpose(1, 2, 0)), cv2.COLOR_RGB2GRAY))
+             for t1, t2 in tiles]
+
+    max_diff = 0.0
+    for g1, g2 in grays:
+        reference = structural_similarity(g1, g2, full=True)[1]
+        max_diff = max(max_diff, float(np.abs(reference - labeler.compute_ssim_map(g1, g2)).max()))
+
+    skimage_time = run(lambda g1, g2: structural_similarity(g1, g2, full=True), grays, repeat)[0]
+    opencv_time = run(labeler.compute_ssim_map, grays, repeat)[0]
+    accurate_time = run(labeler.compute_change_detection_accurate, tiles, repeat)[0]
+    fast_time = run(labeler.compute_change_detection_fast, tiles, repeat)[0]
+    return skimage_time, opencv_time, max_diff, accurate_time, fast_time
+
+
+def compare_kernel_backends(labeler, tiles, repeat):
+    """
+    Hızlı değişiklik haritasını ve bölge istatistiklerini NumPy ve Numba arka uçlarıyla karşılaştır
+
+    Returns:
+        (NumPy harita süresi, Numba harita süresi, en büyük harita farkı,
+         NumPy bölge süresi, Numba bölge süresi, bölge istatistikleri aynı mı)
+    """
+    def change_map(backend):
+        def compute(img1, img2):
+            labeler.kernel_backend = backend
+            return labeler.compute_change_map_fast(img1, img2)
+        return compute
+
+    # Warm-up compiles (or loads from the cache) before anything is timed
+    change_map('numba')(*tiles[0])
+    numpy_time, _, numpy_maps = run(change_map('numpy'), tiles, repeat)
+    numba_time, _, numba_maps = run(change_map('numba'), tiles, repeat)
+    max_diff = max(float(np.abs(a - b).max()) for a, b in zip(numpy_maps, numba_maps))
+
+    # Region stats on each tile's own mean + 1.5 std mask
+    components = []
+    for change in numpy_maps:
+        threshold = np.float32(change.mean() + 1.5 * change.std())
+        num_labels, labels, stats, centroids = cv2.connectedComponentsWithStats(
+            (change > threshold).view(np.uint8), connectivity=8)
+        components.append((labels, num_labels, stats, centroids, change))
+
+    def regions(jit):
+        return lambda component, _: measure_tile_regions(*component, (0, 0), jit=jit)
+
+    pairs = [(component, None) for component in components]
+    regions(True)(*pairs[0])
+    numpy_region_time, _, numpy_regions = run(regions(False), pairs, repeat)
+    numba_region_time, _, numba_regions = run(regions(True), pairs, repeat)
+    identical = all(np.array_equal(a[name], b[name])
+                    for a, b in zip(numpy_regions, numba_regions) for name in a if name not in ('count', 'edges'))
+    return numpy_time, numba_time, max_diff, numpy_region_time, numba_region_time, identical
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Değişiklik tespiti çekirdeği karşılaştırması")
+    parser.add_argument('--tile', type=int, default=1024, help="Kutucuk kenar uzunluğu (piksel)")
+    parser.add_argument('--tiles', type=int, default=8, help="Tur başına kutucuk sayısı")
+    parser.add_argument('--repeat', type=int, default=3, help="Tur sayısı (en iyi süre raporlanır)")
+    args = parser.parse_args()
+
+    # Single-threaded OpenCV keeps the comparison about allocations, not thread scheduling
+    cv2.setNumThreads(1)
+
+    # The kernel only needs the workspace, so skip the data-dependent constructor
+    labeler = DisasterLabeler.__new__(DisasterLabeler)
+    labeler.workspace = TileWorkspace()
+    labeler.kernel_backend = 'numpy'
+    tiles = [make_tile_pair(args.tile, seed) for seed in range(args.tiles)]
+
+    def fused(img1, img2):
+        return labeler.compute_change_detection_fast(img1, img2)
+
+    # The labeler logs every tile; keep the report readable
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        ref_time, ref_peak, ref_results = run(reference_change_detection, tiles, args.repeat)
+        new_time, new_peak, new_results = run(fused, tiles, args.repeat)
+        skimage_time, opencv_time, ssim_diff, accurate_time, fast_time = compare_ssim(labeler, tiles, args.repeat)
+        backends = compare_kernel_backends(labeler, tiles, args.repeat) if NUMBA_AVAILABLE else None
+
+    max_diff = max(float(np.abs(a[0] - b[0]).max()) for a, b in zip(ref_results, new_results))
+    mask_mismatch = sum(int(np.count_nonzero(a[1] != b[1])) for a, b in zip(ref_results, new_results))
+    total_pixels = args.tiles * args.tile * args.tile
+
+    print(f"{args.tiles} kutucuk x {args.tile}x{args.tile} piksel, en iyi {args.repeat} tur")
+    print(f"  Referans (float64 geçiciler) : {ref_time:7.3f} sn, tepe numpy belleği {ref_peak / 1024**2:7.1f} MB")
+    print(f"  float32 + ara bellekler      : {new_time:7.3f} sn, tepe numpy belleği {new_peak / 1024**2:7.1f} MB")
+    print(f"  Hızlanma: {ref_time / new_time:.2f}x")
+    print(f"  En büyük değişiklik haritası farkı: {max_diff:.2e}")
+    print(f"  Farklı maske pikseli: {mask_mismatch} / {total_pixels} ({100 * mask_mismatch / total_pixels:.4f}%)")
+    print("SSIM haritası")
+    print(f"  skimage structural_similarity : {skimage_time:7.3f} sn")
+    print(f"  OpenCV compute_ssim_map       : {opencv_time:7.3f} sn ({skimage_time / opencv_time:.2f}x)")
+    print(f"  En büyük SSIM farkı: {ssim_diff:.2e}")
+    print(f"  Hassas dedektör: {accurate_time:.3f} sn, hızlı dedektör: {fast_time:.3f} sn")
+    print("Çekirdek arka ucu (NumPy/OpenCV -> Numba)")
+    if backends is None:
+        print("  Numba mevcut değil, karşılaştırma atlandı")
+    else:
+        numpy_time, numba_time, map_diff, numpy_region_time, numba_region_time, identical = backends
+        print(f"  Değişiklik haritası: {numpy_time:7.3f} sn -> {numba_time:7.3f} sn ({numpy_time / numba_time:.2f}x), "
+              f"en büyük fark {map_diff:.2e}")
+        print(f"  Bölge istatistikleri: {numpy_region_time:7.3f} sn -> {numba_region_time:7.3f} sn "
+              f"({numpy_region_time / numba_region_time:.2f}x), {'aynı' if identical else 'FARKLI'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Hatay Hasar Analizi için Hasar Bölgesi Poligonları
+Sahnenin alan kimliği rasterını kutucuk kutucuk rasterio.features.shapes ile
+poligonlara çevirir, kutucuk kenarlarında bölünen poligonları alan başına birleştirir
+ve sadeleştirir. Her poligon tek bir alanın ayak izidir ve alan kimliğini taşır. Tüm
+geometri piksel koordinatlarında üretilir; kenarlar tam sayı olduğu için komşu
+kutucukların ortak kenarları birebir çakışır.
+"""
+
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+from affine import Affine
+from rasterio import features
+
+try:
+    import shapely
+    from shapely.geometry import shape
+except ImportError:
+    print("Uyarı: shapely mevcut değil")
+    shapely = None
+
+# Tile side used for vectorizing (label tiles are uint8, so this stays small in memory)
+POLYGON_TILE_SIZE = 2048
+
+
+def vectorize_damage_labels(damage_labels: np.ndarray, field_ids: np.ndarray, tile_size: int = POLYGON_TILE_SIZE,
+                            simplify_tolerance: float = 1.0,
+                            transform_coords: Optional[Callable[[np.ndarray], np.ndarray]] = None
+                            ) -> Tuple[List, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Hasarlı alanları alan başına sadeleştirilmiş poligonlara çevir
+
+    Alanlar 8-bağlantılı değişiklik bölgeleridir ve birbirine köşeden bile değmez; bu
+    yüzden alan kimliği rasterının hasarlı piksellerini vektörleştirmek her alan için
+    tam olarak bir ayak izi verir. Kutucuk içindeki bir kenara değmeyen poligonlar
+    olduğu gibi tutulur; değenler alan kimliğine göre birleştirilir, böylece kenar
+    boyunca bölünen bir alan tek geometri olur.
+
+    Args:
+        damage_labels: (yükseklik, genişlik) uint8 hasar seviyesi rasterı (0 = hasarsız)
+        field_ids: Aynı boyutta alan kimliği rasterı (hasarlı piksellerde alanın field_id'si)
+        tile_size: Vektörleştirme kutucuğu kenarı (piksel)
+        simplify_tolerance: Douglas-Peucker toleransı (piksel, 0 ise sadeleştirilmez)
+        transform_coords: Sadeleştirmeden sonra tüm köşelere tek seferde uygulanacak
+            (N, 2) piksel -> (N, 2) hedef koordinat dönüşümü (None ise piksel koordinatları kalır)
+
+    Returns:
+        (geometries, fields, levels, areas); field_id sırasıyla geometriler, alan kimlikleri,
+        hasar seviyesi dizinleri ve sadeleştirme öncesi piksel alanları
+    """
+    height, width = damage_labels.shape
+    geometries, fields, levels = [], [], []
+    seam_parts = {}
+
+    for y_start in range(0, height, tile_size):
+        y_end = min(y_start + tile_size, height)
+        for x_start in range(0, width, tile_size):
+            x_end = min(x_start + tile_size, width)
+            tile = np.ascontiguousarray(damage_labels[y_start:y_end, x_start:x_end])
+            mask = tile > 0
+            if not mask.any():
+                continue
+            tile_ids = np.ascontiguousarray(field_ids[y_start:y_end, x_start:x_end], dtype=np.int32)
+
+            # A field has one level, so any of its pixels gives it
+            tile_fields, first = np.unique(tile_ids[mask], return_index=True)
+            tile_levels = dict(zip(tile_fields.tolist(), tile[mask][first].tolist()))
+
+            shapes = features.shapes(tile_ids, mask=mask, connectivity=8,
+                                     transform=Affine.translation(x_start, y_start))
+            for geojson, value in shapes:
+                polygon = shape(geojson)
+                field = int(value)
+                min_x, min_y, max_x, max_y = polygon.bounds
+
+                # Only polygons on an inner tile edge can continue into the neighbouring tile
+                on_seam = ((min_x == x_start and x_start > 0) or (max_x == x_end and x_end < width)
+                           or (min_y == y_start and y_start > 0) or (max_y == y_end and y_end < height))
+                if on_seam:
+                    seam_parts.setdefault(field, (tile_levels[field], []))[1].append(polygon)
+                else:
+                    geometries.append(polygon)
+                    fields.append(field)
+                    levels.append(tile_levels[field])
+
+    # Join each split field; pieces touching only at a corner stay one multipolygon
+    for field, (level, parts) in seam_parts.items():
+        geometries.append(parts[0] if len(parts) == 1 else shapely.union_all(parts))
+        fields.append(field)
+        levels.append(level)
+
+    order = np.argsort(np.array(fields, dtype=np.int64), kind='stable')
+    geometries = np.array(geometries, dtype=object)[order]
+    areas = shapely.area(geometries) if len(geometries) else np.zeros(0)
+    if simplify_tolerance > 0 and len(geometries):
+        geometries = shapely.simplify(geometries, simplify_tolerance, preserve_topology=True)
+    if transform_coords is not None and len(geometries):
+        geometries = shapely.transform(geometries, transform_coords)
+    return (list(geometries), np.array(fields, dtype=np.int64)[order], np.array(levels, dtype=np.uint8)[order],
+            np.asarray(areas, dtype=np.float64))
@@ -5,17 +5,24 @@ Değişiklik tespiti ve hasar sınıflandırması için optimize edilmiş görü
 """
 
 import os
+import sys
 import numpy as np
 import rasterio
+from rasterio import features
 from rasterio.windows import Window
-from rasterio.warp import reproject, Resampling
+from rasterio.warp import Resampling
+from rasterio.vrt import WarpedVRT
+from rasterio.crs import CRS
+from affine import Affine
+from contextlib import contextmanager
 import cv2
 from sklearn.cluster import KMeans
 from sklearn.preprocessing import StandardScaler
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
-from concurrent.futures import ThreadPoolExecutor
 import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import warnings
 warnings.filterwarnings('ignore')
@@ -36,7 +43,79 @@ except ImportError:
             print("Uyarı: CoordinateExtractor mevcut değil")
             CoordinateExtractor = None
 
+# Import the read/compute/write tile pipeline
+try:
+    from .tile_pipeline import TilePipeline, SharedTileSlots, TileWorkspace, init_labeler_worker, run_labeler_tile
+except ImportError:
+    from tile_pipeline import TilePipeline, SharedTileSlots, TileWorkspace, init_labeler_worker, run_labeler_tile
+
+# Import the optional Numba kernels (they report NUMBA_AVAILABLE = False without Numba)
+try:
+    from .numba_kernels import NUMBA_AVAILABLE, MIN_SIDE as JIT_MIN_SIDE, change_terms, smooth_combined
+except ImportError:
+    from numba_kernels import NUMBA_AVAILABLE, MIN_SIDE as JIT_MIN_SIDE, change_terms, smooth_combined
+
+# Import cross-tile region stitching
+try:
+    from .region_stitching import RegionStitcher, measure_tile_regions
+except ImportError:
+    from region_stitching import RegionStitcher, measure_tile_regions
+
+# Import damage polygon extraction
+try:
+    from .damage_polygons import vectorize_damage_labels
+except ImportError:
+    from damage_polygons import vectorize_damage_labels
+
+# Import the streaming NDJSON field writer
+try:
+    from .field_output import FieldWriter
+except ImportError:
+    from field_output import FieldWriter
+
+# Import per-tile checkpoints for resumable runs
+try:
+    from .tile_checkpoint import TileCheckpoint
+except ImportError:
+    try:
+        from tile_checkpoint import TileCheckpoint
+    except ImportError:
+        print("Uyarı: TileCheckpoint mevcut değil")
+        TileCheckpoint = None
+
+# Import geopandas for the study-area boundary mask
+try:
+    import geopandas as gpd
+except ImportError:
+    print("Uyarı: geopandas mevcut değil")
+    gpd = None
+
+# Import pyproj for batched CRS -> WGS84 conversion (rasterio.warp is used without it)
+try:
+    from pyproj import Transformer
+except ImportError:
+    print("Uyarı: pyproj mevcut değil")
+    Transformer = None
+
+# Import COG cache for overview-backed reads (and the COG writer for scene outputs)
+try:
+    from .raster_cache import RasterCache, write_cog
+except ImportError:
+    try:
+        from raster_cache import RasterCache, write_cog
+    except ImportError:
+        print("Uyarı: RasterCache mevcut değil")
+        RasterCache = write_cog = None
+
 class DisasterLabeler:
+    # Damage classification thresholds
+    DEFAULT_DAMAGE_THRESHOLDS = {
+        'minimal': 0.1,     # < 10% change
+        'moderate': 0.3,    # 10-30% change
+        'severe': 0.6,      # 30-60% change
+        'catastrophic': 1.0  # > 60% change
+    }
+    
     def __init__(self, data_dir="1c__Hatay_Enkaz_Bina_Etiketleme"):
         """
         Afet etiketleme sistemini başlat
@@ -47,20 +126,79 @@ class DisasterLabeler:
         self.data_dir = data_dir
         self.img_2015_path = os.path.join(data_dir, "HATAY MERKEZ-2 2015.tif")
         self.img_2023_path = os.path.join(data_dir, "HATAY MERKEZ-2 2023.tif")
+        self.image_names = {'2015': "HATAY MERKEZ-2 2015.tif", '2023': "HATAY MERKEZ-2 2023.tif"}
+        self.boundary_path = os.path.join(data_dir, "HATAY MERKEZ-2 SINIR.shp")
         
         # Damage classification thresholds
-        self.damage_thresholds = {
-            'minimal': 0.1,     # < 10% change
-            'moderate': 0.3,    # 10-30% change
-            'severe': 0.6,      # 30-60% change
-            'catastrophic': 1.0  # > 60% change
-        }
+        self.damage_thresholds = dict(self.DEFAULT_DAMAGE_THRESHOLDS)
         
         # Performance optimization settings - will be adjusted based on available memory
         self.base_tile_size = 1024  # Base tile size, will be adjusted dynamically
         self.downsample_factor = 2  # Conservative default downsample factor
         self.num_threads = min(5, max(1, os.cpu_count() - 1))  # Adaptive thread count
         
+        # Tile compute backend: 'thread' shares the GIL, 'process' scales across all cores
+        self.tile_backend = 'thread'
+        self.num_processes = os.cpu_count() or 1
+        
+        # Neighbour pixels read around each tile so filters are not cut at tile seams
+        self.tile_halo = 32
+        
+        # Per-thread float32 scratch buffers reused by the change detection kernel across tiles
+        self.workspace = TileWorkspace()
+        
+        # Change detector: 'auto' (SSIM-based accurate method for tiled runs and for whole
+        # images up to accurate_max_pixels, NCC-based fast method above), 'accurate' or 'fast'
+        self.change_detector = 'auto'
+        self.accurate_max_pixels = 500000
+        
+        # Kernel backend of the fast detector and region stats: 'numpy' (NumPy/OpenCV chains)
+        # or 'numba' (fused JIT kernels, see numba_kernels; needs Numba)
+        self.kernel_backend = 'numpy'
+        
+        # Tiled runs binarize with one scene-wide threshold: mean + k * std of all change intensities
+        self.change_threshold_std = 1.5
+        
+        # Detector shared by every tile of the current tiled run (set in process_in_tiles)
+        self._tile_detector = None
+        
+        # Coarse-to-fine screening: tiles whose low-resolution change (halo included) stays
+        # below screening_level skip full-resolution change detection
+        self.coarse_screening = False
+        self.screening_level = 0.15
+        self.screening_max_pixels = 4_000_000
+        
+        # Confine the analysis to the SINIR boundary: it is rasterized once per run onto the
+        # analysis grid, tiles outside it are skipped and outside pixels never count as change
+        self.study_area_mask = True
+        self._study_area = None
+        self._study_area_raster = None
+        
+        # Streaming mode reads matched windows straight from the GeoTIFFs at native resolution
+        self.streaming = False
+        
+        # 2023 reference grid the 2015 image is warped onto (computed once, see get_alignment_grid)
+        self._alignment_grid = None
+        
+        # Read from overview-backed COG copies (cached by source size and mtime)
+        self.use_raster_cache = True
+        
+        # Scene-sized outputs are disk-backed memmaps under output/rasters
+        self.output_dir = "output"
+        self.raster_dir = os.path.join(self.output_dir, "rasters")
+        
+        # Damage levels are also written as simplified polygons (FlatGeobuf + GeoJSON)
+        self.export_polygons = True
+        self.polygon_simplify_tolerance = 1.0  # pixels
+        
+        # Change intensity and damage classes are also written as georeferenced COGs
+        self.export_cogs = True
+        
+        # Tiled runs checkpoint every finished tile under output/runs and resume from there
+        self.checkpoint_tiles = True
+        self.runs_dir = os.path.join(self.output_dir, "runs")
+        self._active_checkpoint = None
+        
         # Initialize coordinate extractor
         if CoordinateExtractor is not None:
             try:
@@ -76,6 +214,158 @@ class DisasterLabeler:
             self.coordinate_extractor = None
             self.coordinates_data = None
         
+    @classmethod
+    def validate_damage_thresholds(cls, thresholds, base=None):
+        """
+        Hasar eşiklerini doğrula ve mevcut eşiklerle birleştir
+        
+        Args:
+            thresholds: Seviye adından eşik değerine eşleme (bir kısmı verilebilir)
+            base: Birleştirilecek mevcut eşikler (varsayılan: sınıfın varsayılan eşikleri)
+            
+        Returns:
+            Tüm seviyeleri içeren yeni eşik sözlüğü
+            
+        Raises:
+            ValueError: Bilinmeyen seviye, sayı olmayan değer veya artan sırada olmayan eşikler
+        """
+        merged = dict(base or cls.DEFAULT_DAMAGE_THRESHOLDS)
+        for level, value in thresholds.items():
+            if level not in merged:
+                raise ValueError(f"Bilinmeyen hasar seviyesi: {level} (geçerli: {list(merged.keys())})")
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not 0 < value:
+                raise ValueError(f"Geçersiz eşik değeri: {level}={value}")
+            merged[level] = float(value)
+        
+        values = list(merged.values())
+        if any(a >= b for a, b in zip(values, values[1:])):
+            raise ValueError(f"Hasar eşikleri artan sırada olmalı: {merged}")
+        return merged
+    
+    def describe_damage_thresholds(self):
+        """Hasar eşiklerinin okunabilir açıklamalarını döndür (ör. '%10-30 değişiklik')"""
+        items = list(self.damage_thresholds.items())
+        descriptions = {}
+        for i, (level, threshold) in enumerate(items):
+            if i == 0:
+                descriptions[level] = f"< %{threshold * 100:g} değişiklik"
+            elif i == len(items) - 1:
+                descriptions[level] = f"> %{items[i - 1][1] * 100:g} değişiklik"
+            else:
+                descriptions[level] = f"%{items[i - 1][1] * 100:g}-{threshold * 100:g} değişiklik"
+        return descriptions
+    
+    # Choice option -> (name in error messages, allowed values), checked by validate_options
+    OPTION_CHOICES = {
+        'mode': ('mod', ('full', 'reclassify')),
+        'tile_backend': ('kutucuk arka ucu', ('thread', 'process')),
+        'change_detector': ('değişiklik dedektörü', ('auto', 'accurate', 'fast')),
+        'kernel_backend': ('çekirdek arka ucu', ('numpy', 'numba')),
+    }
+    # Non-negative numeric option -> name in error messages
+    NUMERIC_OPTIONS = {
+        'screening_level': 'tarama seviyesi',
+        'polygon_simplify_tolerance': 'poligon sadeleştirme toleransı',
+    }
+    
+    @classmethod
+    def validate_options(cls, options):
+        """
+        Analizör seçeneklerini analiz başlamadan doğrula
+        
+        apply_options ve API aynı kontrolü kullanır; böylece geçersiz bir seçenek istek
+        anında reddedilir, kuyruktaki analiz sonradan başarısız olmaz.
+        
+        Args:
+            options: Seçenek sözlüğü (bkz. apply_options)
+            
+        Raises:
+            ValueError: Geçersiz seçenek değeri
+        """
+        for option, (name, choices) in cls.OPTION_CHOICES.items():
+            if option in options and options[option] not in choices:
+                raise ValueError(f"Geçersiz {name}: {options[option]} (geçerli: {list(choices)})")
+        
+        for option, name in cls.NUMERIC_OPTIONS.items():
+            if option in options:
+                value = options[option]
+                if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+                    raise ValueError(f"Geçersiz {name}: {value}")
+        
+        if options.get('damage_thresholds'):
+            if not isinstance(options['damage_thresholds'], dict):
+                raise ValueError(f"Geçersiz hasar eşikleri: {options['damage_thresholds']}")
+            cls.validate_damage_thresholds(options['damage_thresholds'])
+    
+    def apply_options(self, options):
+        """
+        Analizör API seçeneklerini uygula
+        
+        Desteklenen seçenekler: damage_thresholds (seviye -> eşik), mode ('full' veya
+        'reclassify'), streaming (bool), tile_backend ('thread' veya 'process'),
+        change_detector ('auto', 'accurate' veya 'fast'), coarse_screening (bool),
+        screening_level (kaba değişiklik seviyesi), study_area_mask (bool),
+        kernel_backend ('numpy' veya 'numba'), damage_polygons (bool),
+        polygon_simplify_tolerance (piksel).
+        
+        Args:
+            options: Seçenek sözlüğü
+            
+        Returns:
+            run_analysis'e iletilecek anahtar kelime argümanları
+            
+        Raises:
+            ValueError: Geçersiz seçenek değeri (bkz. validate_options)
+        """
+        self.validate_options(options)
+        
+        if options.get('damage_thresholds'):
+            self.damage_thresholds = self.validate_damage_thresholds(options['damage_thresholds'], self.damage_thresholds)
+            print(f"Hasar eşikleri: {self.damage_thresholds}")
+        if 'tile_backend' in options:
+            self.tile_backend = options['tile_backend']
+        if 'change_detector' in options:
+            self.change_detector = options['change_detector']
+        if 'coarse_screening' in options:
+            self.coarse_screening = bool(options['coarse_screening'])
+        if 'screening_level' in options:
+            self.screening_level = float(options['screening_level'])
+        if 'study_area_mask' in options:
+            self.study_area_mask = bool(options['study_area_mask'])
+        if 'kernel_backend' in options:
+            self.kernel_backend = options['kernel_backend']
+            if self.kernel_backend == 'numba' and not NUMBA_AVAILABLE:
+                print("Uyarı: Numba mevcut değil - NumPy çekirdekleri kullanılacak")
+                self.kernel_backend = 'numpy'
+        if 'damage_polygons' in options:
+            self.export_polygons = bool(options['damage_polygons'])
+        if 'scene_cogs' in options:
+            self.export_cogs = bool(options['scene_cogs'])
+        if 'polygon_simplify_tolerance' in options:
+            self.polygon_simplify_tolerance = float(options['polygon_simplify_tolerance'])
+        
+        run_kwargs = {'reclassify': options.get('mode') == 'reclassify'}
+        if 'streaming' in options:
+            run_kwargs['streaming'] = bool(options['streaming'])
+        return run_kwargs
+    
+    def prepare_raster_cache(self):
+        """
+        Görüntülerin COG kopyalarını hazırla ve okuma yollarını bunlara yönlendir
+        
+        Kopyalar kaynak dosya boyutu ve değiştirilme zamanıyla önbelleğe alınır; yalnızca
+        ilk çalıştırma (veya kaynak değiştiğinde) dönüştürme maliyeti ödenir.
+        """
+        if not self.use_raster_cache or RasterCache is None:
+            return
+        
+        cache = RasterCache(self.data_dir)
+        self.img_2015_path = cache.ensure(os.path.join(self.data_dir, self.image_names['2015']))
+        self.img_2023_path = cache.ensure(os.path.join(self.data_dir, self.image_names['2023']))
+        
+        # Paths changed, recompute the alignment grid on next use
+        self._alignment_grid = None
+    
     def get_memory_efficient_dimensions(self, src):
         """
         Mevcut sistem belleğine göre bellek verimli boyutları hesapla
@@ -114,6 +404,70 @@ class DisasterLabeler:
             
             return new_width, new_height, downsample_factor
 
+    def get_alignment_grid(self):
+        """
+        2015 görüntüsünün yeniden örnekleneceği 2023 referans ızgarasını hesapla
+        
+        Izgara yalnızca bir kez hesaplanır ve sonraki tüm okumalar için önbellekte tutulur.
+        
+        Returns:
+            crs, transform, width, height ve identity (2015 zaten 2023 ızgarasında mı)
+            anahtarlarını içeren sözlük
+        """
+        if self._alignment_grid is None:
+            with rasterio.open(self.img_2015_path) as src_2015:
+                with rasterio.open(self.img_2023_path) as src_2023:
+                    identity = (
+                        src_2015.crs == src_2023.crs
+                        and src_2015.transform.almost_equals(src_2023.transform)
+                        and src_2015.width == src_2023.width
+                        and src_2015.height == src_2023.height
+                    )
+                    georeferenced = src_2015.crs is not None and src_2023.crs is not None
+                    
+                    if not identity and not georeferenced:
+                        print("Uyarı: CRS bilgisi eksik, 2015 görüntüsü yeniden projeksiyonsuz okunacak")
+                    
+                    self._alignment_grid = {
+                        'crs': src_2023.crs,
+                        'transform': src_2023.transform,
+                        'width': src_2023.width,
+                        'height': src_2023.height,
+                        'identity': identity or not georeferenced
+                    }
+                    
+                    if not self._alignment_grid['identity']:
+                        print(f"  2015 görüntüsü 2023 ızgarasına hizalanacak ({src_2015.crs} -> {src_2023.crs})")
+        
+        return self._alignment_grid
+    
+    @contextmanager
+    def open_aligned_2015(self):
+        """
+        2015 görüntüsünü 2023 ızgarasına georeferanslı olarak hizalanmış şekilde aç
+        
+        Izgaralar zaten aynıysa dosya doğrudan okunur, aksi halde her okuma bir
+        WarpedVRT üzerinden 2023 piksellerine yeniden örneklenir. Döndürülen veri
+        kümesi 2023 görüntüsüyle aynı pencere ve boyutları kabul eder.
+        """
+        grid = self.get_alignment_grid()
+        
+        with rasterio.open(self.img_2015_path) as src_2015:
+            if grid['identity']:
+                yield src_2015
+                return
+            
+            with WarpedVRT(
+                src_2015,
+                crs=grid['crs'],
+                transform=grid['transform'],
+                width=grid['width'],
+                height=grid['height'],
+                resampling=Resampling.bilinear,
+                nodata=0
+            ) as vrt_2015:
+                yield vrt_2015
+    
     def load_and_align_images(self):
         """
         Karşılaştırma için 2015 ve 2023 görüntülerini bellek optimizasyonuyla yükle ve hizala
@@ -121,7 +475,7 @@ class DisasterLabeler:
         """
         print("Uydu görüntüleri yükleniyor ve hizalanıyor...")
         
-        with rasterio.open(self.img_2015_path) as src_2015:
+        with self.open_aligned_2015() as src_2015:
             with rasterio.open(self.img_2023_path) as src_2023:
                 # Get memory-efficient dimensions using 2023 image as reference
                 opt_width, opt_height, downsample_factor = self.get_memory_efficient_dimensions(src_2023)
@@ -130,53 +484,32 @@ class DisasterLabeler:
                 original_transform = src_2023.transform
                 new_pixel_size = abs(original_transform[0]) * downsample_factor
                 
-                # Create new transform with adjusted pixel size
-                from rasterio.transform import Affine
-                target_transform = Affine(
-                    new_pixel_size, 0, original_transform[2],
-                    0, -new_pixel_size, original_transform[5]
+                # Scale the reference transform so it matches the resampled output exactly
+                target_transform = original_transform * Affine.scale(
+                    src_2023.width / opt_width,
+                    src_2023.height / opt_height
                 )
                 
                 print(f"  Optimize boyutlar: {opt_width} x {opt_height}")
                 print(f"  Etkili çözünürlük: {new_pixel_size:.3f} m/piksel")
                 
-                # Read images with windowing and resampling for memory efficiency
-                window_2015 = Window(0, 0, src_2015.width, src_2015.height)
-                window_2023 = Window(0, 0, src_2023.width, src_2023.height)
+                # Both datasets expose the 2023 grid, so the same full window applies
+                window = Window(0, 0, src_2023.width, src_2023.height)
                 
                 # Read with automatic resampling to target size
-                img_2015 = src_2015.read(
+                img_2015_aligned = src_2015.read(
                     [1, 2, 3], 
-                    window=window_2015,
+                    window=window,
                     out_shape=(3, opt_height, opt_width),
                     resampling=Resampling.bilinear
-                )
+                ).astype(np.uint8)
                 
-                img_2023 = src_2023.read(
+                img_2023_aligned = src_2023.read(
                     [1, 2, 3],
-                    window=window_2023, 
+                    window=window, 
                     out_shape=(3, opt_height, opt_width),
                     resampling=Resampling.bilinear
-                )
-                
-                # Align 2015 image to match 2023 coordinate system
-                img_2015_aligned = np.zeros_like(img_2023, dtype=np.uint8)
-                
-                # Use simpler alignment for memory efficiency
-                # Just ensure both images have the same dimensions
-                if img_2015.shape == img_2023.shape:
-                    img_2015_aligned = img_2015.astype(np.uint8)
-                    img_2023_aligned = img_2023.astype(np.uint8)
-                else:
-                    # Resize 2015 to match 2023 if needed
-                    from scipy.ndimage import zoom
-                    scale_factors = (
-                        1,  # Don't scale channels
-                        img_2023.shape[1] / img_2015.shape[1],  # height scaling
-                        img_2023.shape[2] / img_2015.shape[2]   # width scaling
-                    )
-                    img_2015_aligned = zoom(img_2015, scale_factors, order=1).astype(np.uint8)
-                    img_2023_aligned = img_2023.astype(np.uint8)
+                ).astype(np.uint8)
                 
                 # Get bounds for the downsampled image
                 bounds = src_2023.bounds
@@ -193,6 +526,199 @@ class DisasterLabeler:
                 
                 return img_2015_aligned, img_2023_aligned, metadata
     
+    def get_full_resolution_metadata(self):
+        """
+        Akış modu için 2023 referans ızgarasının tam çözünürlüklü meta verilerini al
+        
+        Returns:
+            load_and_align_images ile aynı anahtarlara sahip meta veri sözlüğü
+        """
+        with rasterio.open(self.img_2023_path) as src_2023:
+            return {
+                'width': src_2023.width,
+                'height': src_2023.height,
+                'transform': src_2023.transform,
+                'crs': src_2023.crs,
+                'bounds': src_2023.bounds,
+                'resolution': abs(src_2023.transform[0]),
+                'downsample_factor': 1
+            }
+    
+    def iter_window_pairs(self, tile_size, metadata, halo=0, skip=()):
+        """
+        Eşleşen 2015/2023 pencerelerini doğrudan GeoTIFF dosyalarından akış olarak oku
+        
+        Görüntülerin tamamı hiçbir zaman belleğe alınmaz; aynı anda yalnızca
+        tüketicinin istediği pencereler okunur.
+        
+        Args:
+            tile_size: Kutucuk kenar uzunluğu (piksel)
+            metadata: Tam çözünürlüklü görüntü meta verileri
+            halo: Kutucuğun her yanından ek okunacak komşu piksel sayısı (sahne kenarında kırpılır)
+            skip: Okunmayacak kutucukların (y_start, x_start) konumları
+            
+        Yields:
+            (y_start, y_end, x_start, x_end, tile_2015, tile_2023) tuple'ları; koordinatlar
+            halo hariç kutucuğu, diziler halo dahil pencereyi kapsar
+        """
+        height, width = metadata['height'], metadata['width']
+        
+        with self.open_aligned_2015() as src_2015:
+            with rasterio.open(self.img_2023_path) as src_2023:
+                # A WarpedVRT already spans the 2023 grid and does not support boundless reads
+                boundless = not isinstance(src_2015, WarpedVRT)
+                
+                for y_start, y_end, x_start, x_end, rows, cols in self._iter_tile_windows(height, width, tile_size, halo, skip):
+                    window = Window(cols.start, rows.start, cols.stop - cols.start, rows.stop - rows.start)
+                    
+                    tile_2023 = src_2023.read([1, 2, 3], window=window)
+                    # Unwarped 2015 may be smaller than the reference grid, pad with zeros
+                    tile_2015 = src_2015.read([1, 2, 3], window=window, boundless=boundless, fill_value=0)
+                    
+                    yield (y_start, y_end, x_start, x_end,
+                           tile_2015.astype(np.uint8), tile_2023.astype(np.uint8))
+    
+    @staticmethod
+    def _iter_tile_windows(height, width, tile_size, halo=0, skip=()):
+        """
+        Sahneyi satır satır kutucuklara böl
+        
+        Yields:
+            (y_start, y_end, x_start, x_end, rows, cols); rows/cols halo dahil okunacak dilimler
+        """
+        for y_start in range(0, height, tile_size):
+            y_end = min(y_start + tile_size, height)
+            rows = slice(max(0, y_start - halo), min(height, y_end + halo))
+            for x_start in range(0, width, tile_size):
+                if (y_start, x_start) in skip:
+                    continue
+                x_end = min(x_start + tile_size, width)
+                cols = slice(max(0, x_start - halo), min(width, x_end + halo))
+                yield y_start, y_end, x_start, x_end, rows, cols
+    
+    def _iter_array_tiles(self, img1, img2, tile_size, halo=0, skip=()):
+        """
+        Bellekteki görüntü dizilerinden iter_window_pairs ile aynı biçimde kutucuk üret
+        """
+        height, width = img1.shape[1], img1.shape[2]
+        for y_start, y_end, x_start, x_end, rows, cols in self._iter_tile_windows(height, width, tile_size, halo, skip):
+            yield (y_start, y_end, x_start, x_end, img1[:, rows, cols], img2[:, rows, cols])
+    
+    def read_coarse_pair(self, img1, img2, metadata):
+        """
+        2015/2023 görüntülerini sahnenin tamamı için düşük çözünürlükte oku
+        
+        Akış modunda okuma COG önizlemelerinden (overview) ortalama örneklemeyle yapılır;
+        bellekteki diziler cv2.INTER_AREA ile küçültülür.
+        
+        Args:
+            img1, img2: Bellekteki görüntüler veya akış modunda None
+            metadata: Tam çözünürlüklü görüntü meta verileri
+            
+        Returns:
+            (coarse_2015, coarse_2023) uint8 (3, yükseklik, genişlik) dizileri
+        """
+        height, width = metadata['height'], metadata['width']
+        factor = max(1, int(np.ceil(np.sqrt(height * width / self.screening_max_pixels))))
+        coarse_shape = ((height + factor - 1) // factor, (width + factor - 1) // factor)
+        
+        if img1 is not None:
+            size = (coarse_shape[1], coarse_shape[0])
+            return tuple(
+                np.stack([cv2.resize(band, size, interpolation=cv2.INTER_AREA) for band in img[:3]])
+                for img in (img1, img2)
+            )
+        
+        window = Window(0, 0, width, height)
+        with self.open_aligned_2015() as src_2015:
+            with rasterio.open(self.img_2023_path) as src_2023:
+                coarse_2023 = src_2023.read([1, 2, 3], window=window, out_shape=(3,) + coarse_shape,
+                                            resampling=Resampling.average)
+                # Unwarped 2015 may be smaller than the reference grid, pad with zeros
+                coarse_2015 = src_2015.read([1, 2, 3], window=window, out_shape=(3,) + coarse_shape,
+                                            boundless=not isinstance(src_2015, WarpedVRT), fill_value=0,
+                                            resampling=Resampling.average)
+        return coarse_2015.astype(np.uint8), coarse_2023.astype(np.uint8)
+    
+    def screen_tiles(self, img1, img2, metadata, tile_size):
+        """
+        Kaba değişiklik haritasıyla tam çözünürlükte işlenmesi gerekmeyen kutucukları bul
+        
+        Sahnenin düşük çözünürlüklü değişiklik haritası kutucuklarla aynı dedektörle
+        hesaplanır. Halo dahil penceresindeki en yüksek kaba değişiklik screening_level'ın
+        altında kalan kutucuklar atlanır. Atlanan kutucukların değişiklik haritası sıfır
+        kalır; sahne eşiğini bozmamak için histogramlarına kaba pikseller, tam çözünürlükteki
+        piksel sayısına ölçeklenerek eklenir.
+        
+        Args:
+            img1, img2: Bellekteki görüntüler veya akış modunda None
+            metadata: Tam çözünürlüklü görüntü meta verileri
+            tile_size: Kutucuk kenar uzunluğu (piksel)
+            
+        Returns:
+            (y_start, x_start) konumundan kutucuğun yaklaşık yoğunluk histogramına eşleme
+        """
+        height, width = metadata['height'], metadata['width']
+        coarse_2015, coarse_2023 = self.read_coarse_pair(img1, img2, metadata)
+        coarse_map = self.compute_change_map(coarse_2015, coarse_2023, self._tile_detector)
+        scale_y, scale_x = coarse_map.shape[0] / height, coarse_map.shape[1] / width
+        
+        def coarse_slices(rows, cols):
+            return (slice(int(rows.start * scale_y), max(int(rows.start * scale_y) + 1, int(np.ceil(rows.stop * scale_y)))),
+                    slice(int(cols.start * scale_x), max(int(cols.start * scale_x) + 1, int(np.ceil(cols.stop * scale_x)))))
+        
+        screened = {}
+        for y_start, y_end, x_start, x_end, rows, cols in self._iter_tile_windows(height, width, tile_size, self.tile_halo):
+            # Tiles too small to analyze are left to compute_change_tile
+            if y_end - y_start < 50 or x_end - x_start < 50:
+                continue
+            if coarse_map[coarse_slices(rows, cols)].max() >= self.screening_level:
+                continue
+            
+            core = coarse_slices(slice(y_start, y_end), slice(x_start, x_end))
+            histogram = np.zeros(self.CHANGE_HISTOGRAM_BINS, dtype=np.int64)
+            # Same rule as compute_change_tile: uniform (likely water/empty) tiles stay out of the histogram
+            if np.var(coarse_2015[(slice(None),) + core]) >= 100 or np.var(coarse_2023[(slice(None),) + core]) >= 100:
+                values = coarse_map[core]
+                inside = self.study_area_tile(y_start, y_end, x_start, x_end)
+                if inside is None:
+                    tile_pixels = (y_end - y_start) * (x_end - x_start)
+                else:
+                    # Sample the mask at the centers of the coarse pixels, as compute_change_tile
+                    # leaves pixels outside the study area out of the histogram
+                    rows = np.clip(((np.arange(core[0].start, core[0].start + values.shape[0]) + 0.5) / scale_y).astype(np.int64) - y_start,
+                                   0, inside.shape[0] - 1)
+                    cols = np.clip(((np.arange(core[1].start, core[1].start + values.shape[1]) + 0.5) / scale_x).astype(np.int64) - x_start,
+                                   0, inside.shape[1] - 1)
+                    values = values[inside[np.ix_(rows, cols)]]
+                    tile_pixels = int(np.count_nonzero(inside))
+                counts, _ = np.histogram(values, bins=self.CHANGE_HISTOGRAM_BINS, range=self.CHANGE_HISTOGRAM_RANGE)
+                histogram = np.round(counts * (tile_pixels / max(1, counts.sum()))).astype(np.int64)
+            screened[(y_start, x_start)] = histogram
+        
+        return screened
+    
+    def read_preview(self, path, max_pixels=4_000_000):
+        """
+        Görselleştirme için görüntünün küçültülmüş bir kopyasını oku
+        
+        Args:
+            path: GeoTIFF dosya yolu
+            max_pixels: Önizlemenin en fazla piksel sayısı
+            
+        Returns:
+            (önizleme dizisi, örnekleme faktörü)
+        """
+        with rasterio.open(path) as src:
+            factor = max(1, int(np.ceil(np.sqrt(src.width * src.height / max_pixels))))
+            # Match the shape of a [::factor, ::factor] slice of the label raster
+            preview = src.read(
+                [1, 2, 3],
+                out_shape=(3, (src.height + factor - 1) // factor, (src.width + factor - 1) // factor),
+                resampling=Resampling.bilinear
+            )
+        return preview.astype(np.uint8), factor
+    
     def initialize_coordinates(self, metadata):
         """
         Piksel-coğrafi koordinat dönüşümü için koordinat sistemini başlat
@@ -227,155 +753,770 @@ class DisasterLabeler:
         Returns:
             WGS84'te (boylam, enlem) tuple'ı veya dönüştürme başarısız olursa None
         """
-        if not hasattr(self, 'transform') or self.transform is None:
+        coords = self.pixels_to_geographic([pixel_x], [pixel_y])
+        if coords is None:
             return None
+        return float(coords[0][0]), float(coords[1][0])
+    
+    def geographic_transformer(self, crs):
+        """
+        Görüntü CRS'inden WGS84'e önbelleğe alınmış pyproj dönüştürücüsü
+        
+        Args:
+            crs: Görüntünün rasterio CRS'i
             
+        Returns:
+            Transformer veya pyproj yoksa None
+        """
+        # Build once per CRS; every field point of a run goes through the same transformer
+        cached = getattr(self, '_geo_transformer', None)
+        if cached is not None and cached[0] == crs:
+            return cached[1]
+        transformer = Transformer.from_crs(crs.to_wkt(), 'EPSG:4326', always_xy=True) if Transformer is not None else None
+        self._geo_transformer = (crs, transformer)
+        return transformer
+    
+    def pixels_to_geographic(self, pixel_x, pixel_y, offset='center'):
+        """
+        Piksel koordinat dizilerini tek vektörel çağrıda coğrafi koordinatlara (WGS84) dönüştür
+        
+        Pikseller afin dönüşümle harita koordinatlarına çevrilir; CRS zaten WGS84 ise
+        sonuç doğrudan kullanılır, değilse tüm noktalar birlikte dönüştürülür.
+        
+        Args:
+            pixel_x, pixel_y: Piksel koordinat dizileri
+            offset: 'center' piksel merkezini, 'ul' sol-üst köşesini kullanır (poligon köşeleri)
+            
+        Returns:
+            WGS84'te (boylam, enlem) dizileri veya dönüştürme başarısız olursa None
+        """
+        if not hasattr(self, 'transform') or self.transform is None:
+            return None
+        
         try:
-            import rasterio.transform
+            # Pixels to map coordinates (same as rasterio.transform.xy with the same offset)
+            shift = 0.5 if offset == 'center' else 0.0
+            cols = np.asarray(pixel_x, dtype=np.float64) + shift
+            rows = np.asarray(pixel_y, dtype=np.float64) + shift
+            a, b, c, d, e, f = tuple(self.transform)[:6]
+            map_x = a * cols + b * rows + c
+            map_y = d * cols + e * rows + f
             
-            # Convert pixel coordinates to map coordinates using the transform
-            map_x, map_y = rasterio.transform.xy(self.transform, pixel_y, pixel_x)
+            # Return map coordinates if no CRS conversion available
+            if not hasattr(self, 'crs') or self.crs is None or map_x.size == 0:
+                return map_x, map_y
             
-            # If we have CRS info, convert to WGS84
-            if hasattr(self, 'crs') and self.crs is not None:
-                import rasterio.warp
-                
-                # Transform from original CRS to WGS84
-                lon, lat = rasterio.warp.transform(
-                    self.crs, 'EPSG:4326', [map_x], [map_y]
-                )
-                
-                return float(lon[0]), float(lat[0])
+            # Already WGS84: the affine result is the answer
+            crs = CRS.from_user_input(self.crs)
+            if crs.is_geographic and crs.to_epsg() == 4326:
+                return map_x, map_y
+            
+            transformer = self.geographic_transformer(crs)
+            if transformer is not None:
+                lon, lat = transformer.transform(map_x, map_y)
             else:
-                # Return map coordinates if no CRS conversion available
-                return float(map_x), float(map_y)
-                
+                import rasterio.warp
+                lon, lat = rasterio.warp.transform(self.crs, 'EPSG:4326', map_x.tolist(), map_y.tolist())
+            return np.asarray(lon, dtype=np.float64), np.asarray(lat, dtype=np.float64)
+            
         except Exception as e:
-            print(f"Uyarı: Piksel ({pixel_x}, {pixel_y}) koordinatlara dönüştürülemedi: {e}")
+            print(f"Uyarı: {np.size(pixel_x)} piksel koordinatlara dönüştürülemedi: {e}")
             return None
     
-    def compute_change_detection_fast(self, img1, img2):
+    def geocode_field_table(self, table, include_bounds=True):
+        """
+        Alan tablosuna ağırlık merkezi (ve isteğe bağlı sınır köşesi) WGS84 sütunları ekle
+        
+        Tablodaki tüm noktalar tek pixels_to_geographic çağrısıyla dönüştürülür; sonuçlar
+        'longitude'/'latitude' ve 'west'/'south'/'east'/'north' dizileri olarak eklenir.
+        
+        Args:
+            table: Alan tablosu (centroid_x/y ve min/max_x/y dizileri)
+            include_bounds: Güneybatı/kuzeydoğu köşelerini de ekle
+        """
+        count = len(table['area'])
+        if count == 0:
+            return
+        
+        # Centroids first, then the southwest and northeast corner of every field
+        pixel_x, pixel_y = [table['centroid_x']], [table['centroid_y']]
+        if include_bounds:
+            pixel_x += [table['min_x'], table['max_x']]
+            pixel_y += [table['max_y'], table['min_y']]
+        
+        coords = self.pixels_to_geographic(np.concatenate(pixel_x), np.concatenate(pixel_y))
+        if coords is None:
+            return
+        lon, lat = coords
+        
+        table['longitude'], table['latitude'] = lon[:count], lat[:count]
+        if include_bounds:
+            table['west'], table['south'] = lon[count:2 * count], lat[count:2 * count]
+            table['east'], table['north'] = lon[2 * count:], lat[2 * count:]
+    
+    def build_field_records(self, table, start=0, stop=None):
+        """
+        Alan tablosunun bir aralığından ayrıntılı alan kayıtlarını oluştur
+        
+        Kayıtlar yalnızca serileştirme sırasında, parça parça oluşturulur. Çevre ve uzama
+        her iki yolda da dış konturdan ölçülmüştür (measure_region_shapes).
+        
+        Args:
+            table: Alan tablosu (field_id, level, perimeter, elongation ve bölge istatistikleri)
+            start, stop: Oluşturulacak alan aralığı (varsayılan: tümü)
+            
+        Returns:
+            Alan kayıtları listesi
+        """
+        level_names = list(self.damage_thresholds.keys())
+        stop = len(table['area']) if stop is None else min(stop, len(table['area']))
+        
+        # Plain Python values for the whole slice, one conversion per column
+        columns = {name: table[name][start:stop].tolist() for name in (
+            'field_id', 'level', 'min_x', 'max_x', 'min_y', 'max_y', 'centroid_x', 'centroid_y', 'area',
+            'perimeter', 'intensity_mean', 'intensity_max', 'intensity_min', 'histogram',
+            'elongation', 'longitude', 'latitude', 'west', 'south', 'east', 'north') if name in table}
+        fields = []
+        
+        for i in range(stop - start):
+            bounds = {name: columns[name][i] for name in ('min_x', 'max_x', 'min_y', 'max_y')}
+            if 'west' in columns:
+                bounds['geographic'] = {
+                    'southwest': {
+                        'longitude': columns['west'][i],
+                        'latitude': columns['south'][i]
+                    },
+                    'northeast': {
+                        'longitude': columns['east'][i],
+                        'latitude': columns['north'][i]
+                    }
+                }
+            centroid = {'x': columns['centroid_x'][i], 'y': columns['centroid_y'][i]}
+            if 'longitude' in columns:
+                centroid['longitude'] = columns['longitude'][i]
+                centroid['latitude'] = columns['latitude'][i]
+            
+            width = bounds['max_x'] - bounds['min_x']
+            height = bounds['max_y'] - bounds['min_y']
+            area = columns['area'][i]
+            perimeter = float(columns['perimeter'][i])
+            compactness = (perimeter * perimeter) / (4 * np.pi * area) if area > 0 else 0
+            level = columns['level'][i]
+            
+            fields.append({
+                'field_id': columns['field_id'][i],
+                'geometry': {
+                    'bounds': bounds,
+                    'centroid': centroid,
+                    'width_pixels': width,
+                    'height_pixels': height,
+                    'area_pixels': area,
+                    'perimeter_pixels': perimeter,
+                    'compactness': float(compactness)
+                },
+                'damage_assessment': {
+                    'level': level_names[level - 1],
+                    'level_index': level,
+                    'intensity': {
+                        'average': columns['intensity_mean'][i],
+                        'max': columns['intensity_max'][i],
+                        'min': columns['intensity_min'][i],
+                        'distribution': columns['histogram'][i]
+                    }
+                },
+                'shape_analysis': {
+                    'aspect_ratio': float(width / height) if height > 0 else 0,
+                    'regularity': float(4 * np.pi * area / (perimeter * perimeter)) if perimeter > 0 else 0,
+                    'elongation': columns['elongation'][i]
+                }
+            })
+        
+        return fields
+    
+    def build_summary_field_records(self, table, start=0, stop=None):
+        """
+        Alan tablosunun bir aralığından özet alan kayıtlarını oluştur (hızlı sınıflandırma)
+        
+        Args:
+            table: Alan tablosu
+            start, stop: Oluşturulacak alan aralığı (varsayılan: tümü)
+            
+        Returns:
+            Sınır kutusu, ağırlık merkezi, alan ve yoğunluk içeren alan kayıtları
+        """
+        level_names = list(self.damage_thresholds.keys())
+        stop = len(table['area']) if stop is None else min(stop, len(table['area']))
+        columns = {name: table[name][start:stop].tolist() for name in (
+            'field_id', 'level', 'min_x', 'max_x', 'min_y', 'max_y', 'centroid_x', 'centroid_y', 'area',
+            'intensity_mean', 'intensity_max', 'intensity_min', 'longitude', 'latitude') if name in table}
+        fields = []
+        
+        for i in range(stop - start):
+            centroid = {'x': columns['centroid_x'][i], 'y': columns['centroid_y'][i]}
+            if 'longitude' in columns:
+                centroid.update({
+                    'longitude': columns['longitude'][i],
+                    'latitude': columns['latitude'][i]
+                })
+            level = columns['level'][i]
+            
+            fields.append({
+                'field_id': columns['field_id'][i],
+                'geometry': {
+                    'bounds': {name: columns[name][i] for name in ('min_x', 'max_x', 'min_y', 'max_y')},
+                    'centroid': centroid,
+                    'area_pixels': columns['area'][i]
+                },
+                'damage_assessment': {
+                    'level': level_names[level - 1],
+                    'level_index': level,
+                    'intensity': {
+                        'mean': columns['intensity_mean'][i],
+                        'max': columns['intensity_max'][i],
+                        'min': columns['intensity_min'][i]
+                    }
+                }
+            })
+        
+        return fields
+    
+    def field_table_damage_stats(self, table):
+        """
+        Alan tablosundan hasar seviyesi istatistiklerini hesapla
+        
+        Args:
+            table: Alan tablosu
+            
+        Returns:
+            classify_damage_regions_* ile aynı yapıda hasar istatistikleri
+        """
+        level_names = list(self.damage_thresholds.keys())
+        bins = len(level_names) + 1
+        counts = np.bincount(table['level'], minlength=bins)
+        areas = np.bincount(table['level'], weights=table['area'], minlength=bins)
+        # bincount adds the weights in field order, the same sums as a running total
+        intensities = np.bincount(table['level'], weights=table['intensity_mean'], minlength=bins)
+        
+        damage_stats = {}
+        for index, level in enumerate(level_names, start=1):
+            count = int(counts[index])
+            damage_stats[level] = {
+                'count': count,
+                'total_area': int(areas[index]),
+                'avg_intensity': float(intensities[index]) / count if count > 0 else 0
+            }
+        return damage_stats
+    
+    def field_table_statistics(self, table):
+        """
+        Alan tablosundan boyut, seviye ve şekil özet istatistiklerini hesapla
+        
+        Args:
+            table: Alan tablosu (perimeter dahil)
+            
+        Returns:
+            Alan verisi meta verilerindeki field_statistics yapısı veya alan yoksa None
+        """
+        count = len(table['area'])
+        if count == 0:
+            return None
+        
+        area = table['area'].astype(np.float64)
+        perimeter = table['perimeter'].astype(np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            compactness = np.where(area > 0, (perimeter * perimeter) / (4 * np.pi * area), 0.0)
+            regularity = np.where(perimeter > 0, 4 * np.pi * area / (perimeter * perimeter), 0.0)
+        levels = np.bincount(table['level'], minlength=len(self.damage_thresholds) + 1)
+        
+        return {
+            'size_distribution': {
+                'min_area': int(table['area'].min()),
+                'max_area': int(table['area'].max()),
+                'avg_area': int(table['area'].sum()) / count
+            },
+            'damage_distribution': {
+                level: int(levels[index]) for index, level in enumerate(self.damage_thresholds.keys(), start=1)
+            },
+            # Running sums in field order, like summing the records one by one
+            'shape_metrics': {
+                'avg_compactness': sum(compactness.tolist()) / count,
+                'avg_regularity': sum(regularity.tolist()) / count
+            }
+        }
+    
+    def compute_change_detection_fast(self, img1, img2, study_area=None):
         """
         Optimize edilmiş algoritmalar kullanarak hızlı değişiklik tespiti
         
+        Maske görüntünün kendi istatistikleriyle (ortalama + 1.5 std) eşiklenir; kutucuklu
+        çalıştırmalar bunun yerine sahne geneli eşiği kullanır (bkz. process_in_tiles).
+        
         Args:
             img1, img2: Giriş görüntüleri (3D diziler: kanallar, yükseklik, genişlik)
+            study_area: Verilirse eşik istatistikleri yalnızca bu bool maskenin içinden hesaplanır
             
         Returns:
             change_map: Değişiklik yoğunluğu haritası
             change_binary: İkili değişiklik maskesi
         """
-        print("Optimize edilmiş değişiklik tespiti başlatılıyor...")
-        
-        # Convert to HWC format for processing
-        img1_hwc = np.transpose(img1, (1, 2, 0))
-        img2_hwc = np.transpose(img2, (1, 2, 0))
+        change_map = self.compute_change_map_fast(img1, img2)
         
-        # Fast grayscale conversion using optimized weights
-        gray1 = np.dot(img1_hwc[...,:3], [0.299, 0.587, 0.114]).astype(np.uint8)
-        gray2 = np.dot(img2_hwc[...,:3], [0.299, 0.587, 0.114]).astype(np.uint8)
+        # Simple thresholding instead of adaptive (much faster)
+        mean, std = cv2.meanStdDev(change_map, mask=None if study_area is None else study_area.view(np.uint8))
+        threshold = float(mean[0, 0]) + 1.5 * float(std[0, 0])
+        change_binary = (change_map > threshold).view(np.uint8)
         
-        # Method 1: Fast normalized cross-correlation instead of full SSIM
-        # Much faster than SSIM with similar results for large-scale changes
-        mean1 = cv2.blur(gray1.astype(np.float32), (11, 11))
-        mean2 = cv2.blur(gray2.astype(np.float32), (11, 11))
+        return change_map, change_binary
+    
+    def compute_change_map_fast(self, img1, img2):
+        """
+        NCC, renk farkı ve Sobel kenar farkından hızlı değişiklik yoğunluğu haritası hesapla
         
-        # Compute local standard deviations efficiently
-        sqr1 = cv2.blur((gray1.astype(np.float32))**2, (11, 11))
-        sqr2 = cv2.blur((gray2.astype(np.float32))**2, (11, 11))
+        Tüm ara sonuçlar float32'dir ve iş parçacığına özel ara belleklere (self.workspace)
+        out=/dst= ile yazılır; ardışık kutucuklar aynı bellekleri kullandığından kutucuk
+        başına yalnızca döndürülen harita ayrılır.
         
-        std1 = np.sqrt(np.maximum(sqr1 - mean1**2, 0)) + 1e-10
-        std2 = np.sqrt(np.maximum(sqr2 - mean2**2, 0)) + 1e-10
+        Args:
+            img1, img2: Giriş görüntüleri (3D diziler: kanallar, yükseklik, genişlik)
+            
+        Returns:
+            float32 değişiklik yoğunluğu haritası
+        """
+        print("Optimize edilmiş değişiklik tespiti başlatılıyor...")
         
-        # Fast correlation-based similarity
-        corr = cv2.blur(gray1.astype(np.float32) * gray2.astype(np.float32), (11, 11))
-        ncc = (corr - mean1 * mean2) / (std1 * std2)
-        change_structural = 1 - np.clip(ncc, -1, 1)
+        if self.use_jit_kernels() and min(img1.shape[1:]) >= JIT_MIN_SIDE:
+            return self.compute_change_map_jit(img1, img2)
+        
+        shape = img1.shape[1:]
+        ws = self.workspace
+        gray1, gray2 = ws.get('gray1', shape), ws.get('gray2', shape)
+        mean1, mean2 = ws.get('mean1', shape), ws.get('mean2', shape)
+        std1, std2 = ws.get('std1', shape), ws.get('std2', shape)
+        corr, tmp = ws.get('corr', shape), ws.get('tmp', shape)
+        combined = ws.get('combined', shape)
+        
+        # Fast grayscale conversion straight from the band planes, truncated like a uint8 cast
+        # (integer weights in thousandths make the truncation exact)
+        acc, part = ws.get('gray_acc', shape, np.uint32), ws.get('gray_part', shape, np.uint32)
+        for img, gray in ((img1, gray1), (img2, gray2)):
+            np.multiply(img[0], 299, out=acc, dtype=np.uint32)
+            np.multiply(img[1], 587, out=part, dtype=np.uint32)
+            np.add(acc, part, out=acc)
+            np.multiply(img[2], 114, out=part, dtype=np.uint32)
+            np.add(acc, part, out=acc)
+            np.floor_divide(acc, 1000, out=acc)
+            gray[...] = acc
         
-        # Method 2: Vectorized color difference (much faster than loop)
-        diff_color = np.linalg.norm(img1_hwc.astype(np.float32) - img2_hwc.astype(np.float32), axis=2)
-        diff_color_norm = diff_color / (np.sqrt(3) * 255)
+        # Method 1: Fast normalized cross-correlation instead of full SSIM
+        # Much faster than SSIM with similar results for large-scale changes
+        cv2.blur(gray1, (11, 11), dst=mean1)
+        cv2.blur(gray2, (11, 11), dst=mean2)
+        
+        # Local standard deviations: sqrt(max(E[x^2] - E[x]^2, 0))
+        for gray, mean, std in ((gray1, mean1, std1), (gray2, mean2, std2)):
+            np.multiply(gray, gray, out=tmp)
+            cv2.blur(tmp, (11, 11), dst=std)
+            np.multiply(mean, mean, out=tmp)
+            np.subtract(std, tmp, out=std)
+            np.maximum(std, 0, out=std)
+            np.sqrt(std, out=std)
+            np.add(std, np.float32(1e-10), out=std)
+        
+        # Fast correlation-based similarity, accumulated as 0.5 * (1 - ncc)
+        np.multiply(gray1, gray2, out=tmp)
+        cv2.blur(tmp, (11, 11), dst=corr)
+        np.multiply(mean1, mean2, out=tmp)
+        np.subtract(corr, tmp, out=corr)
+        np.multiply(std1, std2, out=tmp)
+        np.divide(corr, tmp, out=corr)
+        np.clip(corr, -1, 1, out=corr)
+        np.multiply(corr, np.float32(-0.5), out=combined)
+        np.add(combined, np.float32(0.5), out=combined)
+        
+        # Method 2: Color difference norm over all bands, weighted 0.3 after normalization
+        color_sq = mean1  # Means are no longer needed
+        color_sq.fill(0)
+        for band in range(img1.shape[0]):
+            np.subtract(img1[band], img2[band], out=tmp, dtype=np.float32)
+            np.multiply(tmp, tmp, out=tmp)
+            np.add(color_sq, tmp, out=color_sq)
+        np.sqrt(color_sq, out=color_sq)
+        np.multiply(color_sq, np.float32(0.3 / (np.sqrt(3) * 255)), out=color_sq)
+        np.add(combined, color_sq, out=combined)
         
         # Method 3: Fast edge detection using Sobel instead of Canny
-        sobelx1 = cv2.Sobel(gray1, cv2.CV_64F, 1, 0, ksize=3)
-        sobely1 = cv2.Sobel(gray1, cv2.CV_64F, 0, 1, ksize=3)
-        edges1 = np.sqrt(sobelx1**2 + sobely1**2)
-        
-        sobelx2 = cv2.Sobel(gray2, cv2.CV_64F, 1, 0, ksize=3)
-        sobely2 = cv2.Sobel(gray2, cv2.CV_64F, 0, 1, ksize=3)
-        edges2 = np.sqrt(sobelx2**2 + sobely2**2)
+        edges1, edges2 = std1, std2  # Standard deviations are no longer needed
+        for gray, edges in ((gray1, edges1), (gray2, edges2)):
+            cv2.Sobel(gray, cv2.CV_32F, 1, 0, dst=tmp, ksize=3)
+            cv2.Sobel(gray, cv2.CV_32F, 0, 1, dst=corr, ksize=3)
+            cv2.magnitude(tmp, corr, edges)
         
         # Normalize edge differences
-        max_edge = max(np.max(edges1), np.max(edges2), 1e-10)
-        edge_diff = np.abs(edges1 - edges2) / max_edge
+        max_edge = max(float(edges1.max()), float(edges2.max()), 1e-10)
+        np.subtract(edges1, edges2, out=edges1)
+        np.abs(edges1, out=edges1)
+        np.multiply(edges1, np.float32(0.2 / max_edge), out=edges1)
+        np.add(combined, edges1, out=combined)
+        
+        # Fast smoothing with smaller kernel (the only full-size allocation)
+        return cv2.GaussianBlur(combined, (3, 3), 0.8)
+    
+    def use_jit_kernels(self):
+        """Numba çekirdekleri seçili ve kullanılabilir mi"""
+        return self.kernel_backend == 'numba' and NUMBA_AVAILABLE
+    
+    def compute_change_map_jit(self, img1, img2):
+        """
+        compute_change_map_fast ile aynı haritayı Numba çekirdekleriyle hesapla
         
-        # Combine methods with weights - vectorized operation
-        change_map = 0.5 * change_structural + 0.3 * diff_color_norm + 0.2 * edge_diff
+        Gri ton, yerel NCC, renk farkı ve Sobel kenar farkı tek geçişte, kenar
+        normalizasyonu ve Gauss yumuşatması ikinci geçişte hesaplanır; NumPy/OpenCV
+        yolundaki ara diziler ve tam boyutlu ara geçişler oluşmaz.
         
-        # Fast smoothing with smaller kernel
-        change_map = cv2.GaussianBlur(change_map.astype(np.float32), (3, 3), 0.8)
+        Args:
+            img1, img2: Giriş görüntüleri (3D diziler: kanallar, yükseklik, genişlik)
+            
+        Returns:
+            float32 değişiklik yoğunluğu haritası
+        """
+        shape = img1.shape[1:]
+        base, edge_diff = self.workspace.get('combined', shape), self.workspace.get('tmp', shape)
+        max1, max2 = change_terms(img1, img2, base, edge_diff)
+        
+        # Normalize edge differences by the strongest edge of either image, then smooth
+        max_edge = max(float(max1), float(max2), 1e-10)
+        change_map = np.empty(shape, dtype=np.float32)
+        kernel = cv2.getGaussianKernel(3, 0.8, ktype=cv2.CV_32F).ravel()
+        smooth_combined(base, edge_diff, np.float32(0.2 / max_edge), kernel, change_map)
+        return change_map
+
+    # Field metadata 'analysis_method' per change detector
+    ANALYSIS_METHODS = {
+        'fast': 'Optimize çoklu algoritma değişiklik tespiti',
+        'accurate': 'Çoklu algoritma değişiklik tespiti (SSIM + Renk + Kenar)'
+    }
+    
+    def select_change_detector(self, total_pixels, tiled=False):
+        """
+        Verilen piksel sayısındaki görüntü için dedektörü seç ('fast' veya 'accurate')
         
-        # Simple thresholding instead of adaptive (much faster)
-        threshold = np.mean(change_map) + 1.5 * np.std(change_map)
-        change_binary = (change_map > threshold).astype(np.uint8)
+        change_detector 'auto' ise kutucuklu çalıştırmalarda her zaman hassas yöntem
+        kullanılır: kutucuklar sahne geneli histogram eşiğiyle ikilenir, hassas yöntemin
+        uyarlamalı eşiği devreye girmez. Görüntü tek parça işlenirken accurate_max_pixels
+        pikseli aşmadıkça hassas, aşarsa hızlı yöntem seçilir. 'accurate' ve 'fast'
+        boyuttan bağımsızdır.
         
-        return change_map, change_binary
-
-    def compute_change_detection(self, img1, img2):
+        Args:
+            total_pixels: Görüntünün piksel sayısı
+            tiled: Kutucuklu (sahne geneli eşikli) çalıştırma
         """
-        Görüntü boyutuna göre otomatik yöntem seçimi ile değişiklik tespiti hesapla
+        if self.change_detector != 'auto':
+            return self.change_detector
+        if tiled:
+            return 'accurate'
+        return 'fast' if total_pixels > self.accurate_max_pixels else 'accurate'
+    
+    def compute_change_detection(self, img1, img2, study_area=None):
         """
-        total_pixels = img1.shape[1] * img1.shape[2]
+        Seçili dedektörle değişiklik haritası ve görüntüye özgü eşikle ikili maske hesapla
         
-        if total_pixels > 500000:  # Use fast method for large images
-            return self.compute_change_detection_fast(img1, img2)
+        Args:
+            img1, img2: Giriş görüntüleri (3D diziler: kanallar, yükseklik, genişlik)
+            study_area: Çalışma alanı bool maskesi; dışındaki pikseller değişiklik sayılmaz
+        """
+        if self.select_change_detector(img1.shape[1] * img1.shape[2]) == 'fast':
+            change_map, change_binary = self.compute_change_detection_fast(img1, img2, study_area)
         else:
-            # Use original accurate method for smaller images
-            return self.compute_change_detection_accurate(img1, img2)
+            change_map, change_binary = self.compute_change_detection_accurate(img1, img2)
+        
+        if study_area is not None:
+            change_map[~study_area] = 0
+            change_binary[~study_area] = 0
+        return change_map, change_binary
+    
+    def compute_change_map(self, img1, img2, detector=None):
+        """
+        Yalnızca değişiklik yoğunluğu haritasını hesapla (eşikleme yok)
+        
+        Args:
+            img1, img2: Giriş görüntüleri (3D diziler: kanallar, yükseklik, genişlik)
+            detector: 'fast' veya 'accurate' (varsayılan: görüntü boyutuna göre seçilir)
+        """
+        detector = detector or self.select_change_detector(img1.shape[1] * img1.shape[2])
+        if detector == 'fast':
+            return self.compute_change_map_fast(img1, img2)
+        return self.compute_change_map_accurate(img1, img2)
+    
+    def compute_ssim_map(self, gray1, gray2, win_size=7, data_range=255.0, k1=0.01, k2=0.03):
+        """
+        skimage.metrics.structural_similarity(full=True) ile aynı SSIM haritasını OpenCV ile hesapla
+        
+        skimage varsayılanlarını izler: win_size x win_size kutu filtresi, yansıtmalı kenar
+        (scipy 'reflect' = cv2.BORDER_REFLECT) ve örneklem kovaryansı. Hesap float32'dir;
+        E[x^2] - E[x]^2 farkındaki hassasiyet kaybını azaltmak için gri değerler filtrelemeden
+        önce veri aralığının ortasına kaydırılır (varyanslar kaydırmadan etkilenmez).
+        
+        Args:
+            gray1, gray2: Gri tonlamalı görüntüler (2D)
+            win_size: Pencere boyutu (tek sayı)
+            data_range: Piksel değer aralığı
+            k1, k2: SSIM kararlılık sabitleri
+            
+        Returns:
+            float32 SSIM haritası (çalışma alanı ara belleği; sonraki çağrıda üzerine yazılır)
+        """
+        shape = gray1.shape
+        ws = self.workspace
+        x, y = ws.get('ssim_x', shape), ws.get('ssim_y', shape)
+        ux, uy = ws.get('ssim_ux', shape), ws.get('ssim_uy', shape)
+        vx, vy, vxy = ws.get('ssim_vx', shape), ws.get('ssim_vy', shape), ws.get('ssim_vxy', shape)
+        tmp = ws.get('ssim_tmp', shape)
+        
+        offset = np.float32(data_range / 2)
+        np.subtract(gray1, offset, out=x, dtype=np.float32)
+        np.subtract(gray2, offset, out=y, dtype=np.float32)
+        
+        ksize = (win_size, win_size)
+        border = cv2.BORDER_REFLECT
+        cv2.blur(x, ksize, dst=ux, borderType=border)
+        cv2.blur(y, ksize, dst=uy, borderType=border)
+        
+        # Sample (co)variances: n / (n - 1) * (E[ab] - E[a]E[b])
+        cov_norm = np.float32(win_size ** 2 / (win_size ** 2 - 1))
+        for a, b, mean_a, mean_b, var in ((x, x, ux, ux, vx), (y, y, uy, uy, vy), (x, y, ux, uy, vxy)):
+            np.multiply(a, b, out=tmp)
+            cv2.blur(tmp, ksize, dst=var, borderType=border)
+            np.multiply(mean_a, mean_b, out=tmp)
+            np.subtract(var, tmp, out=var)
+            np.multiply(var, cov_norm, out=var)
+        
+        np.add(ux, offset, out=ux)
+        np.add(uy, offset, out=uy)
+        c1 = np.float32((k1 * data_range) ** 2)
+        c2 = np.float32((k2 * data_range) ** 2)
+        
+        # Numerator (2 ux uy + C1)(2 vxy + C2) into x
+        np.multiply(ux, uy, out=x)
+        np.multiply(x, np.float32(2), out=x)
+        np.add(x, c1, out=x)
+        np.multiply(vxy, np.float32(2), out=vxy)
+        np.add(vxy, c2, out=vxy)
+        np.multiply(x, vxy, out=x)
+        
+        # Denominator (ux^2 + uy^2 + C1)(vx + vy + C2) into y
+        np.multiply(ux, ux, out=y)
+        np.multiply(uy, uy, out=tmp)
+        np.add(y, tmp, out=y)
+        np.add(y, c1, out=y)
+        np.add(vx, vy, out=vx)
+        np.add(vx, c2, out=vx)
+        np.multiply(y, vx, out=y)
+        
+        np.divide(x, y, out=x)
+        return x
     
     def compute_change_detection_accurate(self, img1, img2):
         """
-        Orijinal hassas değişiklik tespit yöntemi (küçük görüntüler için saklandı)
+        SSIM tabanlı hassas değişiklik tespiti (uyarlamalı eşikli maske ile)
+        
+        Args:
+            img1, img2: Giriş görüntüleri (3D diziler: kanallar, yükseklik, genişlik)
+            
+        Returns:
+            change_map: Değişiklik yoğunluğu haritası
+            change_binary: İkili değişiklik maskesi
         """
-        print("Hassas değişiklik tespiti başlatılıyor...")
+        change_map = self.compute_change_map_accurate(img1, img2)
         
-        # Convert to HWC format for OpenCV
-        img1_hwc = np.transpose(img1, (1, 2, 0))
-        img2_hwc = np.transpose(img2, (1, 2, 0))
+        # Create binary change mask using adaptive thresholding
+        # (the 0-255 scaled map saturates instead of wrapping where the change exceeds 1.0)
+        shape = change_map.shape
+        tmp, scaled = self.workspace.get('accurate_tmp', shape), self.workspace.get('accurate_scaled', shape, np.uint8)
+        np.multiply(change_map, np.float32(255), out=tmp)
+        np.clip(tmp, 0, 255, out=tmp)
+        np.copyto(scaled, tmp, casting='unsafe')
+        change_binary = cv2.adaptiveThreshold(
+            scaled, 1, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
+        )
         
-        # Method 1: Structural Similarity Index (SSIM) - most accurate
-        from skimage.metrics import structural_similarity as ssim
+        return change_map, change_binary
+    
+    def compute_change_map_accurate(self, img1, img2):
+        """
+        SSIM, renk farkı ve Canny kenar farkından değişiklik yoğunluğu haritası hesapla
         
-        # Convert to grayscale for SSIM
-        gray1 = cv2.cvtColor(img1_hwc, cv2.COLOR_RGB2GRAY)
-        gray2 = cv2.cvtColor(img2_hwc, cv2.COLOR_RGB2GRAY)
+        SSIM haritası OpenCV kutu filtreleriyle hesaplanır (compute_ssim_map); ara sonuçlar
+        compute_change_map_fast gibi iş parçacığına özel float32 ara belleklerde tutulur,
+        böylece yöntem tam çözünürlüklü kutucuklarda da kullanılabilir.
         
-        # Compute SSIM map
-        ssim_map = ssim(gray1, gray2, full=True)[1]
-        change_ssim = 1 - ssim_map  # Invert so high values = high change
+        Args:
+            img1, img2: Giriş görüntüleri (3D diziler: kanallar, yükseklik, genişlik)
+            
+        Returns:
+            float32 değişiklik yoğunluğu haritası
+        """
+        print("Hassas değişiklik tespiti başlatılıyor...")
         
-        # Method 2: Color-based change detection
-        diff_color = np.sqrt(np.sum((img1_hwc.astype(float) - img2_hwc.astype(float))**2, axis=2))
-        diff_color_norm = diff_color / np.sqrt(3 * 255**2)  # Normalize to 0-1
+        shape = img1.shape[1:]
+        ws = self.workspace
+        hwc = ws.get('accurate_hwc', shape + (3,), img1.dtype)
+        gray1, gray2 = ws.get('accurate_gray1', shape, np.uint8), ws.get('accurate_gray2', shape, np.uint8)
+        combined, tmp = ws.get('accurate_combined', shape), ws.get('accurate_tmp', shape)
+        
+        # Convert to grayscale through a reused HWC buffer (OpenCV needs interleaved channels)
+        for img, gray in ((img1, gray1), (img2, gray2)):
+            np.copyto(hwc, np.transpose(img[:3], (1, 2, 0)))
+            cv2.cvtColor(hwc, cv2.COLOR_RGB2GRAY, dst=gray)
+        
+        # Method 1: Structural Similarity Index (SSIM), accumulated as 0.5 * (1 - ssim)
+        ssim_map = self.compute_ssim_map(gray1, gray2)
+        np.multiply(ssim_map, np.float32(-0.5), out=combined)
+        np.add(combined, np.float32(0.5), out=combined)
+        
+        # Method 2: Color difference norm over all bands, weighted 0.3 after normalization
+        color_sq = ws.get('accurate_color', shape)
+        color_sq.fill(0)
+        for band in range(img1.shape[0]):
+            np.subtract(img1[band], img2[band], out=tmp, dtype=np.float32)
+            np.multiply(tmp, tmp, out=tmp)
+            np.add(color_sq, tmp, out=color_sq)
+        np.sqrt(color_sq, out=color_sq)
+        np.multiply(color_sq, np.float32(0.3 / (np.sqrt(3) * 255)), out=color_sq)
+        np.add(combined, color_sq, out=combined)
         
         # Method 3: Edge-based change detection
-        edges1 = cv2.Canny(gray1, 50, 150)
-        edges2 = cv2.Canny(gray2, 50, 150)
-        edge_diff = np.abs(edges1.astype(float) - edges2.astype(float)) / 255
-        
-        # Combine methods with weights
-        change_map = (0.5 * change_ssim + 0.3 * diff_color_norm + 0.2 * edge_diff)
+        edges1, edges2 = ws.get('accurate_edges1', shape, np.uint8), ws.get('accurate_edges2', shape, np.uint8)
+        cv2.Canny(gray1, 50, 150, edges=edges1)
+        cv2.Canny(gray2, 50, 150, edges=edges2)
+        cv2.absdiff(edges1, edges2, dst=edges1)
+        np.multiply(edges1, np.float32(0.2 / 255), out=tmp)
+        np.add(combined, tmp, out=combined)
         
         # Apply Gaussian smoothing to reduce noise
-        change_map = cv2.GaussianBlur(change_map, (5, 5), 1.0)
+        return cv2.GaussianBlur(combined, (5, 5), 1.0)
+    
+    def measure_regions(self, change_binary, change_map, min_size=10):
+        """
+        Bağlı bileşenleri etiketle ve tüm bölgelerin istatistiklerini tek seferde hesapla
         
-        # Create binary change mask using adaptive thresholding
-        change_binary = cv2.adaptiveThreshold(
-            (change_map * 255).astype(np.uint8),
-            255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
-        ) / 255
+        Alan, sınır kutusu ve ağırlık merkezi cv2.connectedComponentsWithStats'tan gelir.
+        Yoğunluk ortalaması etiket başına float64 ağırlıklı bincount toplamının alana
+        bölümüdür (kutucuk birleştirmeyle aynı hesap, bkz. measure_tile_regions); min/max
+        için pikseller etikete göre kararlı sıralanır ve her bölgenin bitişik dilimi
+        reduceat ile indirgenir. 10 kutulu histogram da tüm bölgeler için birlikte
+        hesaplanır. Etiket başına maske veya Python döngüsü yoktur.
         
-        return change_map, change_binary
+        Args:
+            change_binary: İkili değişiklik maskesi
+            change_map: Değişiklik yoğunluğu haritası
+            min_size: Tutulacak en küçük bölge (piksel)
+            
+        Returns:
+            (labels, num_labels, regions); regions tutulan etiketlerin ('ids', artan sırada)
+            alan başına dizilerini içerir
+        """
+        num_labels, labels, stats, centroids = cv2.connectedComponentsWithStats(
+            change_binary.astype(np.uint8), connectivity=8)
+        area = stats[:, cv2.CC_STAT_AREA]
+        ids = np.nonzero(area >= min_size)[0]
+        ids = ids[ids > 0]
+        
+        # Float64 sums in scan order, the same sums the tiled path accumulates per region
+        flat_labels = labels.ravel()
+        flat_change = change_map.ravel()
+        intensity_sum = np.bincount(flat_labels, weights=flat_change, minlength=num_labels)
+        intensity_mean = intensity_sum[ids] / area[ids]
+        
+        # Stable sort groups each region's pixels into one slice; reduce over every label's
+        # slice (each is non-empty) so skipped small regions stay out
+        order = np.argsort(flat_labels, kind='stable')
+        starts = np.concatenate([[0], np.cumsum(area)])
+        sorted_change = flat_change[order]
+        intensity_min = np.minimum.reduceat(sorted_change, starts[:-1])[ids]
+        intensity_max = np.maximum.reduceat(sorted_change, starts[:-1])[ids]
+        
+        # Same bins as np.histogram(bins=10, range=(0, 1)): right-open except the last bin
+        edges = np.linspace(0, 1, 11)
+        in_range = (flat_change >= 0) & (flat_change <= 1)
+        bins = np.minimum(np.searchsorted(edges, flat_change[in_range], side='right') - 1, 9)
+        histogram = np.bincount(flat_labels[in_range].astype(np.int64) * 10 + bins,
+                                minlength=num_labels * 10).reshape(num_labels, 10)
+        
+        left, top = stats[ids, cv2.CC_STAT_LEFT], stats[ids, cv2.CC_STAT_TOP]
+        regions = {
+            'ids': ids,
+            'area': area[ids],
+            'min_x': left,
+            'max_x': left + stats[ids, cv2.CC_STAT_WIDTH] - 1,
+            'min_y': top,
+            'max_y': top + stats[ids, cv2.CC_STAT_HEIGHT] - 1,
+            'centroid_x': centroids[ids, 0],
+            'centroid_y': centroids[ids, 1],
+            'intensity_mean': intensity_mean,
+            'intensity_min': intensity_min,
+            'intensity_max': intensity_max,
+            'histogram': histogram[ids],
+        }
+        return labels, num_labels, regions
+    
+    # Rows of a bounding box crop compared against the label at a time (memmap labels)
+    SHAPE_BLOCK_ROWS = 1024
+    
+    def measure_region_shape(self, labels, label_id, bounds):
+        """
+        Bölgenin dış konturunu sınır kutusu kesitinde bularak çevre ve uzama hesapla
+        
+        Kesit satır blokları halinde okunur; etiketler diskteki bölge rasterı (memmap)
+        olduğunda büyük alanlar için bile yalnızca kutunun ikili maskesi bellekte tutulur.
+        
+        Args:
+            labels: Bağlı bileşen etiketleri veya alan kimliği rasterı
+            label_id: Bölge etiketi
+            bounds: min_x, max_x, min_y, max_y piksel sınırları
+            
+        Returns:
+            (perimeter, elongation); uzama en küçük döndürülmüş dikdörtgenin kısa/uzun kenar oranıdır
+        """
+        # One pixel of padding so regions touching the crop edge still get a closed contour
+        min_x, max_x, min_y, max_y = bounds['min_x'], bounds['max_x'], bounds['min_y'], bounds['max_y']
+        crop = np.zeros((max_y - min_y + 3, max_x - min_x + 3), dtype=np.uint8)
+        for row in range(min_y, max_y + 1, self.SHAPE_BLOCK_ROWS):
+            stop = min(row + self.SHAPE_BLOCK_ROWS, max_y + 1)
+            np.equal(labels[row:stop, min_x:max_x + 1], label_id,
+                     out=crop[row - min_y + 1:stop - min_y + 1, 1:-1].view(bool))
+        contours, _ = cv2.findContours(crop, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        if not contours:
+            return 0.0, 0.0
+        contour = max(contours, key=len)
+        perimeter = float(cv2.arcLength(contour, True))
+        
+        # Rotation-independent elongation from the minimum-area rectangle around the contour
+        rect_width, rect_height = cv2.minAreaRect(contour)[1]
+        elongation = min(rect_width, rect_height) / max(rect_width, rect_height) if max(rect_width, rect_height) > 0 else 0.0
+        return perimeter, float(elongation)
+    
+    def measure_region_shapes(self, labels, regions, label_ids):
+        """
+        Tüm bölgelerin çevre ve uzamasını dış konturlarından hesapla
+        
+        Küçük sahnelerin bağlı bileşenleri ve kutucuklu çalıştırmaların birleştirilmiş
+        alanları aynı tanımla ölçülür (bkz. measure_region_shape).
+        
+        Args:
+            labels: Etiket rasterı
+            regions: min_x/max_x/min_y/max_y dizilerini içeren bölge tablosu
+            label_ids: Bölgelerin rasterdaki etiketleri (tablo sırasıyla)
+            
+        Returns:
+            (perimeter, elongation) float64 dizileri
+        """
+        count = len(label_ids)
+        perimeter, elongation = np.zeros(count), np.zeros(count)
+        bounds_columns = {name: regions[name].tolist() for name in ('min_x', 'max_x', 'min_y', 'max_y')}
+        for i, label_id in enumerate(np.asarray(label_ids).tolist()):
+            bounds = {name: column[i] for name, column in bounds_columns.items()}
+            perimeter[i], elongation[i] = self.measure_region_shape(labels, label_id, bounds)
+        return perimeter, elongation
     
     def classify_damage_regions_fast(self, change_map, change_binary):
         """
@@ -383,121 +1524,40 @@ class DisasterLabeler:
         """
         print("Optimize algoritmaları ile hasar şiddeti sınıflandırılıyor...")
         
-        # Find connected components
-        num_labels, labels = cv2.connectedComponents(change_binary.astype(np.uint8))
+        # Find connected components and measure every region at once
+        labels, num_labels, regions = self.measure_regions(change_binary, change_map)
         
-        if num_labels <= 1:  # Only background
-            return np.zeros_like(labels), {level: {'count': 0, 'total_area': 0, 'avg_intensity': 0} 
-                                          for level in self.damage_thresholds.keys()}, {'fields': [], 'metadata': {}}
+        # Damage levels for all regions at once, painted through a label lookup table
+        levels = self.classify_intensity_levels(regions['intensity_mean'])
+        level_lut = np.zeros(num_labels, dtype=np.uint8)
+        level_lut[regions['ids']] = levels
+        damage_labels = level_lut[labels]
         
-        # Vectorized region analysis
-        damage_labels = np.zeros_like(labels, dtype=np.uint8)
-        damage_stats = {level: {'count': 0, 'total_area': 0, 'avg_intensity': 0} 
-                       for level in self.damage_thresholds.keys()}
+        # Field table: one array per attribute, records are built only when written
+        table = dict(regions, field_id=regions['ids'], level=levels.astype(np.int64))
         
-        # Pre-compute all region properties vectorized
-        region_props = {}
-        for label_id in range(1, num_labels):
-            mask = (labels == label_id)
-            region_size = np.sum(mask)
-            
-            if region_size < 10:  # Skip tiny regions
-                continue
-                
-            # Vectorized computations
-            coords = np.where(mask)
-            y_coords, x_coords = coords
-            
-            # Batch calculate properties
-            region_props[label_id] = {
-                'mask': mask,
-                'size': region_size,
-                'bounds': {
-                    'min_x': int(x_coords.min()),
-                    'max_x': int(x_coords.max()),
-                    'min_y': int(y_coords.min()),
-                    'max_y': int(y_coords.max())
-                },
-                'centroid': (float(x_coords.mean()), float(y_coords.mean())),
-                'intensity_stats': {
-                    'mean': float(change_map[mask].mean()),
-                    'max': float(change_map[mask].max()),
-                    'min': float(change_map[mask].min())
-                }
-            }
+        if num_labels <= 1:  # Only background
+            return damage_labels, self.field_table_damage_stats(table), \
+                {'metadata': {}, 'table': table, 'record_layout': 'summary', 'field_ids': labels}
         
-        # Build field data efficiently
         field_data = {
             'metadata': {
-                'total_fields': len(region_props),
+                'total_fields': len(regions['ids']),
                 'analysis_timestamp': datetime.now().isoformat(),
-                'analysis_method': 'Optimize çoklu algoritma değişiklik tespiti',
+                'analysis_method': self.ANALYSIS_METHODS['fast'],
                 'coordinate_system': {
                     'has_geographic_coords': hasattr(self, 'transform') and self.transform is not None
                 }
             },
-            'fields': []
+            'table': table,
+            'record_layout': 'summary',
+            'field_ids': labels
         }
         
-        # Batch process all regions
-        threshold_keys = list(self.damage_thresholds.keys())
-        threshold_values = list(self.damage_thresholds.values())
-        
-        for label_id, props in region_props.items():
-            avg_intensity = props['intensity_stats']['mean']
-            
-            # Fast threshold lookup
-            damage_level = 1  # minimal by default
-            for i, threshold in enumerate(threshold_values):
-                if avg_intensity <= threshold:
-                    damage_level = i + 1
-                    level_name = threshold_keys[i]
-                    break
-            else:
-                damage_level = len(threshold_keys)
-                level_name = threshold_keys[-1]
-            
-            # Update arrays and stats
-            damage_labels[props['mask']] = damage_level
-            damage_stats[level_name]['count'] += 1
-            damage_stats[level_name]['total_area'] += props['size']
-            damage_stats[level_name]['avg_intensity'] += avg_intensity
-            
-            # Create simplified field entry (skip expensive coordinate transforms for speed)
-            bounds = props['bounds']
-            centroid_x, centroid_y = props['centroid']
-            
-            field_entry = {
-                'field_id': int(label_id),
-                'geometry': {
-                    'bounds': bounds,
-                    'centroid': {'x': centroid_x, 'y': centroid_y},
-                    'area_pixels': int(props['size'])
-                },
-                'damage_assessment': {
-                    'level': level_name,
-                    'level_index': int(damage_level),
-                    'intensity': props['intensity_stats']
-                }
-            }
-            
-            # Add geographic coordinates only if requested (expensive operation)
-            if hasattr(self, 'transform') and self.transform is not None:
-                centroid_coords = self.pixel_to_geographic(centroid_x, centroid_y)
-                if centroid_coords:
-                    field_entry['geometry']['centroid'].update({
-                        'longitude': centroid_coords[0],
-                        'latitude': centroid_coords[1]
-                    })
-            
-            field_data['fields'].append(field_entry)
-        
-        # Calculate average intensities
-        for level, stats in damage_stats.items():
-            if stats['count'] > 0:
-                stats['avg_intensity'] /= stats['count']
+        # Centroid coordinates for all fields in one batch
+        self.geocode_field_table(table, include_bounds=False)
         
-        return damage_labels, damage_stats, field_data
+        return damage_labels, self.field_table_damage_stats(table), field_data
 
     def classify_damage_regions(self, change_map, change_binary):
         """
@@ -516,25 +1576,16 @@ class DisasterLabeler:
         """
         print("Tam doğrulukla hasar şiddeti sınıflandırılıyor...")
         
-        # Find connected components in the binary change mask
-        num_labels, labels = cv2.connectedComponents(change_binary.astype(np.uint8))
-        
-        damage_labels = np.zeros_like(labels, dtype=np.uint8)
-        damage_stats = {level: {'count': 0, 'total_area': 0, 'avg_intensity': 0} 
-                       for level in self.damage_thresholds.keys()}
+        # Find connected components in the binary change mask and measure them all at once
+        labels, num_labels, regions = self.measure_regions(change_binary, change_map)
         
         # Initialize field-level data structure
         field_data = {
             'metadata': {
                 'total_fields': num_labels - 1,  # Subtract background
                 'analysis_timestamp': datetime.now().isoformat(),
-                'analysis_method': 'Çoklu algoritma değişiklik tespiti (SSIM + Renk + Kenar)',
-                'damage_thresholds': {
-                    'minimal': '< %10 değişiklik',
-                    'moderate': '%10-30 değişiklik',
-                    'severe': '%30-60 değişiklik',
-                    'catastrophic': '> %60 değişiklik'
-                },
+                'analysis_method': self.ANALYSIS_METHODS['accurate'],
+                'damage_thresholds': self.describe_damage_thresholds(),
                 'coordinate_system': {
                     'pixel_coordinates': 'Görüntü piksel koordinatları (başlangıç: sol-üst)',
                     'geographic_coordinates': 'WGS84 (EPSG:4326) boylam, enlem',
@@ -542,156 +1593,376 @@ class DisasterLabeler:
                     'has_geographic_coords': hasattr(self, 'transform') and self.transform is not None
                 }
             },
-            'fields': []
+            'record_layout': 'full',
+            'field_ids': labels
         }
         
-        for label_id in range(1, num_labels):  # Skip background (0)
-            mask = (labels == label_id)
-            region_size = np.sum(mask)
-            
-            # Skip very small regions (likely noise)
-            if region_size < 10:
-                continue
-            
-            # Calculate field properties
-            # Get field bounds
-            y_indices, x_indices = np.where(mask)
-            bounds = {
-                'min_x': int(np.min(x_indices)),
-                'max_x': int(np.max(x_indices)),
-                'min_y': int(np.min(y_indices)),
-                'max_y': int(np.max(y_indices))
-            }
-            
-            # Add geographic bounds
-            sw_coords = self.pixel_to_geographic(bounds['min_x'], bounds['max_y'])  # Southwest corner
-            ne_coords = self.pixel_to_geographic(bounds['max_x'], bounds['min_y'])  # Northeast corner
-            
-            if sw_coords and ne_coords:
-                bounds['geographic'] = {
-                    'southwest': {
-                        'longitude': sw_coords[0],
-                        'latitude': sw_coords[1]
-                    },
-                    'northeast': {
-                        'longitude': ne_coords[0],
-                        'latitude': ne_coords[1]
-                    }
-                }
-            
-            # Calculate centroid
-            centroid_x = float(np.mean(x_indices))
-            centroid_y = float(np.mean(y_indices))
-            
-            centroid = {
-                'x': centroid_x,
-                'y': centroid_y
-            }
-            
-            # Add geographic coordinates for centroid
-            centroid_coords = self.pixel_to_geographic(centroid_x, centroid_y)
-            if centroid_coords:
-                centroid['longitude'] = centroid_coords[0]
-                centroid['latitude'] = centroid_coords[1]
-            
-            # Calculate shape properties
-            width = bounds['max_x'] - bounds['min_x']
-            height = bounds['max_y'] - bounds['min_y']
-            perimeter = cv2.arcLength(np.float32(np.column_stack((x_indices, y_indices))), True)
-            area = region_size
-            compactness = (perimeter * perimeter) / (4 * np.pi * area) if area > 0 else 0
+        # Damage levels for all regions at once, painted through a label lookup table
+        levels = self.classify_intensity_levels(regions['intensity_mean'])
+        level_lut = np.zeros(num_labels, dtype=np.uint8)
+        level_lut[regions['ids']] = levels
+        damage_labels = level_lut[labels]
+        
+        # Perimeter and elongation from each region's outer contour in its bounding box crop
+        perimeter, elongation = self.measure_region_shapes(labels, regions, regions['ids'])
+        
+        table = dict(regions, field_id=regions['ids'], level=levels.astype(np.int64),
+                     perimeter=perimeter, elongation=elongation)
+        field_data['table'] = table
+        
+        # Centroid and corner coordinates for all fields in one batch
+        self.geocode_field_table(table)
+        
+        # Add field statistics to metadata
+        field_statistics = self.field_table_statistics(table)
+        if field_statistics is not None:
+            field_data['metadata']['field_statistics'] = field_statistics
+        
+        return damage_labels, self.field_table_damage_stats(table), field_data
+    
+    # File names of the disk-backed scene rasters (see create_scene_rasters)
+    SCENE_RASTERS = {
+        'change_map': ('hatay_change_map.dat', np.float32),
+        'damage_labels': ('hatay_damage_labels.dat', np.uint8)
+    }
+    SCENE_RASTER_METADATA = 'hatay_rasters.json'
+    
+    def create_scene_rasters(self, metadata, work_dir=None):
+        """
+        Değişiklik haritası ve hasar etiketleri için diskte np.memmap dizileri oluştur
+        
+        Diziler önce geçici dosyalara yazılır; finalize_scene_rasters çağrılana kadar
+        önceki çalıştırmanın dosyaları okunabilir kalır.
+        
+        Args:
+            metadata: Görüntü meta verileri
+            work_dir: Kontrol noktalı çalıştırmanın dizini; verilirse diziler burada tutulur
+                ve mevcut dosyalar (yarıda kalan çalıştırmanın kutucukları) korunur
             
-            # Calculate average change intensity in this region
-            avg_intensity = float(np.mean(change_map[mask]))
-            max_intensity = float(np.max(change_map[mask]))
-            min_intensity = float(np.min(change_map[mask]))
-            
-            # Calculate intensity distribution
-            intensity_hist, _ = np.histogram(change_map[mask], bins=10, range=(0, 1))
-            intensity_distribution = intensity_hist.tolist()
-            
-            # Classify damage level based on intensity
-            damage_level = 0  # Default: minimal
-            for i, (level, threshold) in enumerate(self.damage_thresholds.items()):
-                if avg_intensity <= threshold:
-                    damage_level = i + 1
-                    level_name = level
-                    break
+        Returns:
+            (change_map, damage_labels) memmap dizileri
+        """
+        os.makedirs(self.raster_dir, exist_ok=True)
+        shape = (metadata['height'], metadata['width'])
+        
+        rasters = []
+        for name, (filename, dtype) in self.SCENE_RASTERS.items():
+            if work_dir:
+                path = os.path.join(work_dir, filename)
+                mode = 'r+' if os.path.exists(path) else 'w+'
             else:
-                damage_level = len(self.damage_thresholds)
-                level_name = 'catastrophic'
+                # Mode w+ creates a zero-filled sparse file of the final size
+                path, mode = os.path.join(self.raster_dir, filename + '.tmp'), 'w+'
+            rasters.append(np.memmap(path, dtype=dtype, mode=mode, shape=shape))
+        
+        return tuple(rasters)
+    
+    # Study-area mask on the analysis grid (1 = inside the SINIR boundary)
+    STUDY_AREA_RASTER = ('hatay_study_area.dat', np.uint8)
+    
+    def rasterize_study_area(self, metadata, work_dir=None):
+        """
+        SINIR sınır poligonunu analiz ızgarasına bir kez rasterlaştır
+        
+        Maske diskte np.memmap olarak tutulur; kutucuklar study_area_tile ile kendi
+        pencerelerini okur. Sınır yoksa, okunamıyorsa veya sahneyle kesişmiyorsa maske
+        uygulanmaz ve sahnenin tamamı analiz edilir.
+        
+        Args:
+            metadata: Görüntü meta verileri (alan içi piksel sayısı 'study_area' olarak eklenir)
+            work_dir: Kontrol noktalı çalıştırmanın dizini (verilmezse raster_dir'de geçici dosya)
             
-            # Create field data entry
-            field_entry = {
-                'field_id': int(label_id),
-                'geometry': {
-                    'bounds': bounds,
-                    'centroid': centroid,
-                    'width_pixels': int(width),
-                    'height_pixels': int(height),
-                    'area_pixels': int(area),
-                    'perimeter_pixels': float(perimeter),
-                    'compactness': float(compactness)
-                },
-                'damage_assessment': {
-                    'level': level_name,
-                    'level_index': int(damage_level),
-                    'intensity': {
-                        'average': float(avg_intensity),
-                        'max': float(max_intensity),
-                        'min': float(min_intensity),
-                        'distribution': intensity_distribution
-                    }
-                },
-                'shape_analysis': {
-                    'aspect_ratio': float(width / height) if height > 0 else 0,
-                    'regularity': float(4 * np.pi * area / (perimeter * perimeter)) if perimeter > 0 else 0,
-                    'elongation': float(min(width, height) / max(width, height)) if max(width, height) > 0 else 0
-                }
+        Returns:
+            Alan içi pikselleri 1 olan uint8 memmap veya maske uygulanmıyorsa None
+        """
+        self._study_area = self._study_area_raster = None
+        metadata.pop('study_area', None)
+        if not self.study_area_mask:
+            return None
+        if gpd is None:
+            print("Uyarı: geopandas mevcut değil - çalışma alanı maskesi uygulanmayacak")
+            return None
+        if not os.path.exists(self.boundary_path):
+            print(f"Uyarı: Çalışma alanı sınırı bulunamadı: {self.boundary_path}")
+            return None
+        
+        try:
+            boundary = gpd.read_file(self.boundary_path)
+            if boundary.crs is not None and metadata.get('crs') is not None:
+                boundary = boundary.to_crs(metadata['crs'])
+        except Exception as e:
+            print(f"Uyarı: Çalışma alanı sınırı okunamadı: {e}")
+            return None
+        geometries = [geometry for geometry in boundary.geometry if geometry is not None and not geometry.is_empty]
+        if not geometries:
+            print("Uyarı: Çalışma alanı sınırında geometri yok - maske uygulanmayacak")
+            return None
+        
+        os.makedirs(self.raster_dir, exist_ok=True)
+        filename, dtype = self.STUDY_AREA_RASTER
+        path = os.path.join(work_dir, filename) if work_dir else os.path.join(self.raster_dir, filename + '.tmp')
+        shape = (metadata['height'], metadata['width'])
+        study_area = np.memmap(path, dtype=dtype, mode='w+', shape=shape)
+        features.rasterize(geometries, out=study_area, transform=metadata['transform'], fill=0, default_value=1)
+        study_area.flush()
+        
+        inside = int(np.count_nonzero(study_area))
+        if inside == 0:
+            print("Uyarı: Çalışma alanı sınırı sahneyle kesişmiyor - maske uygulanmayacak")
+            del study_area
+            os.remove(path)
+            return None
+        
+        metadata['study_area'] = {
+            'source': os.path.basename(self.boundary_path),
+            'pixels': inside,
+            'fraction': round(inside / (shape[0] * shape[1]), 4)
+        }
+        print(f"Çalışma alanı maskesi: piksellerin %{100 * inside / (shape[0] * shape[1]):.1f}'i sınır içinde")
+        
+        self._study_area = study_area
+        self._study_area_raster = (path, shape)
+        return study_area
+    
+    def study_area_tile(self, y_start, y_end, x_start, x_end):
+        """
+        Kutucuğun çalışma alanı maskesini oku
+        
+        Süreç çalışanları maske dizisini değil dosya yolunu alır; dosya ilk kullanımda açılır.
+        
+        Returns:
+            Alan içi pikseller True olan bool dizi veya maske uygulanmıyorsa None
+        """
+        if self._study_area_raster is None:
+            return None
+        if getattr(self, '_study_area', None) is None:
+            path, shape = self._study_area_raster
+            self._study_area = np.memmap(path, dtype=self.STUDY_AREA_RASTER[1], mode='r', shape=tuple(shape))
+        return np.array(self._study_area[y_start:y_end, x_start:x_end]).view(bool)
+    
+    def finalize_scene_rasters(self, change_map, damage_labels, metadata):
+        """
+        Memmap dizilerini diske yaz, geçici dosyaları yerine taşı ve meta verileri kaydet
+        
+        Args:
+            change_map, damage_labels: create_scene_rasters ile oluşturulan diziler
+            metadata: Görüntü meta verileri
+            
+        Returns:
+            Kalıcı dosyalara bağlı salt okunur (change_map, damage_labels, raster_metadata)
+        """
+        for array, (filename, dtype) in zip((change_map, damage_labels), self.SCENE_RASTERS.values()):
+            array.flush()
+            os.replace(array.filename, os.path.join(self.raster_dir, filename))
+        
+        # The mask of this run replaces (or, without a mask, removes) the previous one
+        study_area_path = os.path.join(self.raster_dir, self.STUDY_AREA_RASTER[0])
+        if self._study_area_raster is not None:
+            os.replace(self._study_area_raster[0], study_area_path)
+            self._study_area_raster = (study_area_path, self._study_area_raster[1])
+        elif os.path.exists(study_area_path):
+            os.remove(study_area_path)
+        
+        raster_metadata = {
+            'created': datetime.now().isoformat(),
+            'width': metadata['width'],
+            'height': metadata['height'],
+            'transform': list(metadata['transform'])[:6],
+            'crs': metadata['crs'].to_wkt() if metadata.get('crs') is not None else None,
+            'resolution': metadata['resolution'],
+            'downsample_factor': metadata.get('downsample_factor', 1),
+            'signature': self.get_run_signature(metadata),
+            'change_threshold': metadata.get('change_threshold'),
+            'screening': metadata.get('screening'),
+            'study_area': metadata.get('study_area'),
+            # Damage label value -> level name (0 = no damage)
+            'damage_levels': ['none'] + list(self.damage_thresholds.keys()),
+            'rasters': {
+                name: {'file': filename, 'dtype': np.dtype(dtype).name}
+                for name, (filename, dtype) in self.SCENE_RASTERS.items()
             }
+        }
+        if self._study_area_raster is not None:
+            filename, dtype = self.STUDY_AREA_RASTER
+            raster_metadata['rasters']['study_area'] = {'file': filename, 'dtype': np.dtype(dtype).name}
+        metadata_path = os.path.join(self.raster_dir, self.SCENE_RASTER_METADATA)
+        with open(metadata_path + '.tmp', 'w') as f:
+            json.dump(raster_metadata, f, indent=2)
+        os.replace(metadata_path + '.tmp', metadata_path)
+        
+        print(f"Sahne rasterları kaydedildi: {self.raster_dir}")
+        return self.load_scene_rasters(self.raster_dir)
+    
+    @classmethod
+    def load_scene_rasters(cls, raster_dir=os.path.join("output", "rasters")):
+        """
+        Kaydedilmiş değişiklik haritası ve hasar etiketlerini yeniden hesaplamadan aç
+        
+        Args:
+            raster_dir: Sahne rasterlarının bulunduğu dizin
             
-            # Add field to the collection
-            field_data['fields'].append(field_entry)
+        Returns:
+            (change_map, damage_labels, raster_metadata) veya dosyalar yoksa None
+        """
+        metadata_path = os.path.join(raster_dir, cls.SCENE_RASTER_METADATA)
+        if not os.path.exists(metadata_path):
+            return None
+        
+        with open(metadata_path, 'r') as f:
+            raster_metadata = json.load(f)
+        
+        shape = (raster_metadata['height'], raster_metadata['width'])
+        rasters = []
+        for name, (filename, dtype) in cls.SCENE_RASTERS.items():
+            rasters.append(np.memmap(os.path.join(raster_dir, filename), dtype=dtype, mode='r', shape=shape))
+        
+        return rasters[0], rasters[1], raster_metadata
+    
+    # Threshold-independent stats of the stitched regions (see save_region_cache)
+    REGION_CACHE = 'hatay_regions.npz'
+    
+    def save_region_cache(self, stitched, metadata):
+        """
+        Birleştirilmiş bölge istatistiklerini sahne rasterlarının yanına kaydet
+        
+        Bölge istatistikleri hasar eşiklerinden bağımsızdır; reclassify bu dosya, bölge
+        rasterı ve değişiklik haritasıyla değişiklik tespitini yeniden çalıştırmadan
+        yeni eşikleri uygular. Dosya girdi imzasıyla birlikte saklanır.
+        
+        Args:
+            stitched: RegionStitcher.resolve çıktısı ve kontur ölçütleri (perimeter, elongation)
+            metadata: Görüntü meta verileri
+        """
+        path = os.path.join(self.raster_dir, self.REGION_CACHE)
+        signature = json.dumps(self.get_run_signature(metadata), sort_keys=True, default=str)
+        np.savez(path[:-len('.npz')] + '.tmp.npz', signature=np.array(signature), **stitched)
+        os.replace(path[:-len('.npz')] + '.tmp.npz', path)
+    
+    def load_region_cache(self):
+        """
+        Önceki analizin değişiklik haritasını, bölge rasterını ve bölge istatistiklerini aç
+        
+        Returns:
+            (change_map, region_ids, stitched, metadata) veya önbellek yoksa ya da
+            girdiler/ayarlar değiştiyse None
+        """
+        rasters = self.load_scene_rasters(self.raster_dir)
+        region_path = os.path.join(self.raster_dir, RegionStitcher.REGION_RASTER[0])
+        cache_path = os.path.join(self.raster_dir, self.REGION_CACHE)
+        if rasters is None or not os.path.exists(region_path) or not os.path.exists(cache_path):
+            print("Önbellekte değişiklik haritası/bölge verisi bulunamadı")
+            return None
+        
+        change_map, _, raster_metadata = rasters
+        metadata = {
+            'width': raster_metadata['width'],
+            'height': raster_metadata['height'],
+            'transform': Affine(*raster_metadata['transform']),
+            'crs': CRS.from_wkt(raster_metadata['crs']) if raster_metadata.get('crs') else None,
+            'resolution': raster_metadata['resolution'],
+            'downsample_factor': raster_metadata.get('downsample_factor', 1),
+            'change_threshold': raster_metadata.get('change_threshold'),
+            'screening': raster_metadata.get('screening'),
+            'study_area': raster_metadata.get('study_area')
+        }
+        
+        with np.load(cache_path) as data:
+            signature = json.loads(str(data['signature']))
+            stitched = {name: data[name] for name in data.files if name != 'signature'}
+        
+        # Caches written before contour shapes hold pixel-count perimeters and no elongation
+        if 'elongation' not in stitched:
+            print("Önbellekteki bölge verisi eski biçimde (kontur şekil ölçütleri yok)")
+            return None
+        
+        current = json.loads(json.dumps(self.get_run_signature(metadata), sort_keys=True, default=str))
+        if signature != current:
+            print("Önbellekteki değişiklik haritası güncel değil (girdiler veya ayarlar değişmiş)")
+            return None
+        
+        _, dtype = RegionStitcher.REGION_RASTER
+        region_ids = np.memmap(region_path, dtype=dtype, mode='r', shape=(metadata['height'], metadata['width']))
+        return change_map, region_ids, stitched, metadata
+    
+    def repaint_damage_labels(self, region_ids, field_levels, block_rows=1024):
+        """
+        Hasar etiketi rasterını bölge rasterından yeni seviyelerle satır blokları halinde yeniden yaz
+        
+        Args:
+            region_ids: Alan kimliği rasterı
+            field_levels: Alan kimliğinden (dizin 0 = arka plan) hasar seviyesine eşleme
+            block_rows: Bir seferde işlenecek satır sayısı
             
-            # Update damage labels and statistics
-            damage_labels[mask] = damage_level
-            damage_stats[level_name]['count'] += 1
-            damage_stats[level_name]['total_area'] += region_size
-            damage_stats[level_name]['avg_intensity'] += avg_intensity
+        Returns:
+            Kalıcı dosyaya bağlı salt okunur hasar etiketleri
+        """
+        filename, dtype = self.SCENE_RASTERS['damage_labels']
+        path = os.path.join(self.raster_dir, filename)
+        damage_labels = np.memmap(path + '.tmp', dtype=dtype, mode='w+', shape=region_ids.shape)
         
-        # Calculate average intensities
-        for level, stats in damage_stats.items():
-            if stats['count'] > 0:
-                stats['avg_intensity'] /= stats['count']
+        for row in range(0, region_ids.shape[0], block_rows):
+            damage_labels[row:row + block_rows] = field_levels[region_ids[row:row + block_rows]]
         
-        # Add field statistics to metadata
-        field_data['metadata'].update({
-            'field_statistics': {
-                'size_distribution': {
-                    'min_area': min(f['geometry']['area_pixels'] for f in field_data['fields']),
-                    'max_area': max(f['geometry']['area_pixels'] for f in field_data['fields']),
-                    'avg_area': sum(f['geometry']['area_pixels'] for f in field_data['fields']) / len(field_data['fields'])
-                },
-                'damage_distribution': {
-                    level: len([f for f in field_data['fields'] if f['damage_assessment']['level'] == level])
-                    for level in self.damage_thresholds.keys()
-                },
-                'shape_metrics': {
-                    'avg_compactness': sum(f['geometry']['compactness'] for f in field_data['fields']) / len(field_data['fields']),
-                    'avg_regularity': sum(f['shape_analysis']['regularity'] for f in field_data['fields']) / len(field_data['fields'])
-                }
-            }
-        })
+        damage_labels.flush()
+        os.replace(path + '.tmp', path)
+        return np.memmap(path, dtype=dtype, mode='r', shape=region_ids.shape)
+    
+    def reclassify(self):
+        """
+        Önbellekteki değişiklik haritasıyla yalnızca hasar sınıflandırmasını yeniden yap
         
-        # Save field data to separate JSON file
-        output_dir = "output"
-        os.makedirs(output_dir, exist_ok=True)
-        field_data_path = os.path.join(output_dir, "hatay_field_analysis.json")
-        with open(field_data_path, 'w') as f:
-            json.dump(field_data, f, indent=2)
-        print(f"Alan seviyesi analiz kaydedildi: {field_data_path}")
+        Görüntüler okunmaz ve değişiklik tespiti çalışmaz: hasar seviyeleri kayıtlı bölge
+        istatistiklerinden mevcut damage_thresholds ile yeniden atanır, hasar etiketi rasterı
+        yeniden boyanır, rapor ve alan verileri yeniden yazılır.
         
-        return damage_labels, damage_stats, field_data
+        Returns:
+            run_analysis ile aynı (damage_labels, damage_stats, metadata) veya önbellek
+            kullanılamıyorsa None
+        """
+        print("Önbellekteki değişiklik haritasıyla yeniden sınıflandırılıyor...")
+        
+        cached = self.load_region_cache()
+        if cached is None:
+            return None
+        change_map, region_ids, stitched, metadata = cached
+        
+        self.initialize_coordinates(metadata)
+        
+        # The cache signature matched, so the cached map came from the currently selected detector
+        self._tile_detector = self.select_change_detector(None, tiled=True)
+        
+        levels = self.classify_intensity_levels(stitched['intensity_mean'])
+        field_levels = np.concatenate([[0], levels]).astype(np.uint8)
+        damage_labels = self.repaint_damage_labels(region_ids, field_levels)
+        
+        field_data, damage_stats = self.stream_stitched_fields(stitched, levels, metadata)
+        field_data['field_ids'] = region_ids
+        
+        # The change map is unchanged; its COG is only rewritten if it is missing
+        change_cog = os.path.join(self.output_dir, self.SCENE_COGS['change_map'])
+        self.write_analysis_outputs(damage_labels, damage_stats, field_data, metadata,
+                                    change_map=None if os.path.exists(change_cog) else change_map)
+        return damage_labels, damage_stats, metadata
+    
+    def align_tile_size_to_blocks(self, tile_size):
+        """
+        Kutucuk boyutunu 2023 GeoTIFF'inin iç blok boyutunun katına yuvarla
+        
+        Kutucuklar satır sırasıyla okunduğunda her pencere tam blokları kapsar ve
+        okumalar dosyadaki blok sırasını izler.
+        """
+        with rasterio.open(self.img_2023_path) as src_2023:
+            block_height, block_width = src_2023.block_shapes[0]
+            width = src_2023.width
+        
+        # Striped files (blocks spanning the full width) are already read in row order
+        if block_width >= width:
+            return tile_size
+        
+        aligned = max(block_width, (tile_size // block_width) * block_width)
+        if aligned != tile_size:
+            print(f"  Kutucuk boyutu blok boyutuna hizalandı: {tile_size} -> {aligned} (blok {block_width}x{block_height})")
+        return aligned
     
     def calculate_optimal_tile_size(self, img_shape):
         """
@@ -716,188 +1987,484 @@ class DisasterLabeler:
         print(f"  Hesaplanan optimal kutucuk boyutu: {optimal_tile_size}x{optimal_tile_size}")
         return optimal_tile_size
 
-    def process_in_tiles(self, img1, img2, metadata):
+    # Scene-wide change intensity histogram: the detectors' weighted sum stays within [0, 1.5]
+    CHANGE_HISTOGRAM_BINS = 4096
+    CHANGE_HISTOGRAM_RANGE = (0.0, 2.0)
+    
+    def compute_change_tile(self, y_start, y_end, x_start, x_end, tile1, tile2):
         """
-        Bellek verimliliği için büyük görüntüleri kutucuklarda işle
+        Tek bir kutucuğun değişiklik haritasını ve yoğunluk histogramını hesapla (1. geçiş)
+        
+        İş parçacığı ve süreç havuzu arka uçları tarafından ortak kullanılır. Kutucuk burada
+        eşiklenmez; eşik tüm kutucukların histogramından sahne geneli belirlenir.
         
         Args:
-            img1, img2: Giriş görüntüleri
-            metadata: Görüntü meta verileri
+            y_start, y_end, x_start, x_end: Kutucuğun sahnedeki piksel sınırları (halo hariç)
+            tile1, tile2: tile_halo kadar komşu piksel dahil 2015 ve 2023 kutucukları
             
         Returns:
-            Tam değişiklik haritası ve hasar etiketleri
+            (y_start, y_end, x_start, x_end, change_map, histogram) veya kutucuk çok küçükse None
         """
-        # Calculate optimal tile size for current memory conditions
-        tile_size = self.calculate_optimal_tile_size(img1.shape)
-        
-        print(f"{tile_size}x{tile_size} kutucuklarla işleniyor...")
+        height, width = y_end - y_start, x_end - x_start
         
-        height, width = img1.shape[1], img1.shape[2]
-        full_change_map = np.zeros((height, width), dtype=np.float32)
-        full_damage_labels = np.zeros((height, width), dtype=np.uint8)
-        
-        # Calculate number of tiles
-        tiles_y = (height + tile_size - 1) // tile_size
-        tiles_x = (width + tile_size - 1) // tile_size
+        # Skip tiles that are too small or have insufficient data
+        if height < 50 or width < 50:
+            return None
         
-        print(f"  {tiles_x * tiles_y} kutucuk işleniyor...")
+        # Early termination: Skip tiles with very little variation (likely water/empty areas)
+        tile1_var = np.var(tile1)
+        tile2_var = np.var(tile2)
+        
+        if tile1_var < 100 and tile2_var < 100:  # Very uniform tiles, likely water/empty
+            # Empty tiles stay out of the histogram so they do not pull the scene threshold down
+            change_map = np.zeros((height, width), dtype=np.float32)
+            return (y_start, y_end, x_start, x_end, change_map,
+                    np.zeros(self.CHANGE_HISTOGRAM_BINS, dtype=np.int64))
+        
+        # Halo is clipped at scene edges, so only the top/left offsets are needed to crop
+        top, left = min(self.tile_halo, y_start), min(self.tile_halo, x_start)
+        change_map = self.compute_change_map(tile1, tile2, self._tile_detector)[top:top + height, left:left + width]
+        change_map = np.ascontiguousarray(change_map, dtype=np.float32)
+        
+        # Pixels outside the study area are neither change nor threshold samples
+        inside = self.study_area_tile(y_start, y_end, x_start, x_end)
+        if inside is not None:
+            change_map[~inside] = 0
+            histogram, _ = np.histogram(change_map[inside], bins=self.CHANGE_HISTOGRAM_BINS, range=self.CHANGE_HISTOGRAM_RANGE)
+        else:
+            histogram, _ = np.histogram(change_map, bins=self.CHANGE_HISTOGRAM_BINS, range=self.CHANGE_HISTOGRAM_RANGE)
+        return (y_start, y_end, x_start, x_end, change_map, histogram.astype(np.int64))
+    
+    def compute_change_threshold(self, histogram):
+        """
+        Sahne geneli histogramdan ikili maske eşiğini hesapla (ortalama + k * std)
         
-        def process_tile(args):
-            i, j = args
-            y_start = i * tile_size
-            y_end = min((i + 1) * tile_size, height)
-            x_start = j * tile_size
-            x_end = min((j + 1) * tile_size, width)
-            
-            tile1 = img1[:, y_start:y_end, x_start:x_end]
-            tile2 = img2[:, y_start:y_end, x_start:x_end]
-            
-            # Skip tiles that are too small or have insufficient data
-            if tile1.shape[1] < 50 or tile1.shape[2] < 50:
-                return None
-            
-            # Early termination: Skip tiles with very little variation (likely water/empty areas)
-            tile1_var = np.var(tile1)
-            tile2_var = np.var(tile2)
+        Args:
+            histogram: CHANGE_HISTOGRAM_BINS kutulu, tüm kutucukların toplam histogramı
             
-            if tile1_var < 100 and tile2_var < 100:  # Very uniform tiles, likely water/empty
-                # Return empty result to skip processing
-                empty_change_map = np.zeros((tile1.shape[1], tile1.shape[2]), dtype=np.float32)
-                empty_damage_labels = np.zeros((tile1.shape[1], tile1.shape[2]), dtype=np.uint8)
-                empty_field_data = {'fields': [], 'metadata': {}}
-                return (y_start, y_end, x_start, x_end, empty_change_map, empty_damage_labels, empty_field_data)
+        Returns:
+            Eşik değeri (histogram boşsa hiçbir pikseli seçmeyen +inf)
+        """
+        total = histogram.sum()
+        if total == 0:
+            return float('inf')
+        
+        low, high = self.CHANGE_HISTOGRAM_RANGE
+        bin_width = (high - low) / len(histogram)
+        centers = low + (np.arange(len(histogram)) + 0.5) * bin_width
+        mean = float(np.dot(histogram, centers) / total)
+        std = float(np.sqrt(np.dot(histogram, (centers - mean) ** 2) / total))
+        return mean + self.change_threshold_std * std
+    
+    def compute_region_tile(self, y_start, y_end, x_start, x_end, change_map, threshold):
+        """
+        Kutucuğu sahne geneli eşikle ikili maskeye çevir ve bağlı bölgeleri ölç (2. geçiş)
+        
+        Args:
+            y_start, y_end, x_start, x_end: Kutucuğun sahnedeki piksel sınırları
+            change_map: Kutucuğun değişiklik haritası (halo hariç)
+            threshold: compute_change_threshold ile bulunan eşik
             
-            change_map, change_binary = self.compute_change_detection(tile1, tile2)
+        Returns:
+            (y_start, y_end, x_start, x_end, region_labels, regions) veya kutucuk çok küçükse None
+        """
+        if y_end - y_start < 50 or x_end - x_start < 50:
+            return None
+        
+        change_binary = (change_map > threshold).view(np.uint8)
+        num_labels, region_labels, stats, centroids = cv2.connectedComponentsWithStats(change_binary, connectivity=8)
+        regions = measure_tile_regions(region_labels, num_labels, stats, centroids, change_map, (y_start, x_start),
+                                       jit=self.use_jit_kernels())
+        
+        return (y_start, y_end, x_start, x_end, region_labels, regions)
+    
+    def classify_intensity_levels(self, intensities):
+        """
+        Ortalama değişiklik yoğunluklarını hasar seviyesi dizinlerine çevir (1 = minimal)
+        
+        Args:
+            intensities: Alan başına ortalama değişiklik yoğunlukları
             
-            # Early termination: Skip further processing if no significant changes detected
-            if np.sum(change_binary) < 10:  # Less than 10 changed pixels
-                empty_damage_labels = np.zeros_like(change_binary, dtype=np.uint8)
-                empty_field_data = {'fields': [], 'metadata': {}}
-                return (y_start, y_end, x_start, x_end, change_map, empty_damage_labels, empty_field_data)
+        Returns:
+            Hasar seviyesi dizinleri
+        """
+        threshold_values = np.array(list(self.damage_thresholds.values()))
+        # First threshold the intensity does not exceed, catastrophic above all of them
+        levels = np.searchsorted(threshold_values, intensities, side='left') + 1
+        return np.minimum(levels, len(threshold_values))
+    
+    def get_worker_state(self):
+        """
+        Süreç çalışanlarına aktarılacak etiketleyici yapılandırmasını döndür
+        
+        Returns:
+            Pickle edilebilir öznitelik sözlüğü (koordinat çıkarıcı hariç)
+        """
+        excluded = {'coordinate_extractor', 'coordinates_data'}
+        return {key: value for key, value in self.__dict__.items()
+                if key not in excluded and not isinstance(value, np.ndarray)}
+    
+    def run_process_pipeline(self, tile_source, write_result, slot_bytes, scene_rasters, progress=None):
+        """
+        Kutucukları süreç havuzunda, paylaşımlı bellek yuvaları üzerinden işle
+        
+        Girdi kutucukları pickle edilmek yerine paylaşımlı belleğe kopyalanır; çalışanlar
+        sonuç dizilerini doğrudan sahne memmap dosyalarına yazar ve ana sürece yalnızca
+        alan verilerini döndürür. Python düzeyindeki sınıflandırma döngüleri GIL'e
+        takılmadan num_processes çekirdeğe yayılır.
+        
+        Args:
+            tile_source: (y_start, y_end, x_start, x_end, tile1, tile2) üreten yinelenebilir
+            write_result: Sonuçları yazan fonksiyon (dizileri None olan sonuçları kabul etmeli)
+            slot_bytes: Bir kutucuk çifti için gereken bayt sayısı
+            scene_rasters: Çalışanların yazacağı ad -> memmap eşlemesi (change_map)
+            progress: TilePipeline.run'a iletilen ilerleme fonksiyonu
             
-            damage_labels, _, field_data = self.classify_damage_regions(change_map, change_binary)
+        Returns:
+            Yazılan sonuç sayısı
+        """
+        num_workers = max(1, self.num_processes)
+        prefetch = 2 * num_workers
+        
+        # Make sure workers see the zero-initialised files before they map them
+        for raster in scene_rasters.values():
+            raster.flush()
+        output_rasters = {
+            name: (raster.filename, raster.dtype.str, raster.shape)
+            for name, raster in scene_rasters.items()
+        }
+        
+        # Every tile in flight holds a slot until the writer has handled its result
+        slots = SharedTileSlots(num_workers + prefetch, slot_bytes)
+        
+        def shared_tiles():
+            try:
+                for y_start, y_end, x_start, x_end, tile1, tile2 in tile_source:
+                    yield slots.put([tile1, tile2], window=(y_start, y_end, x_start, x_end))
+            finally:
+                if hasattr(tile_source, 'close'):
+                    tile_source.close()
+        
+        def write_shared_result(item):
+            slots.release(item)
+            write_result(item['result'])
+        
+        # Spawned workers avoid forking a process that already runs reader threads
+        def executor_factory(n):
+            return ProcessPoolExecutor(
+                max_workers=n,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=init_labeler_worker,
+                initargs=(os.path.abspath(__file__), type(self).__name__,
+                          self.get_worker_state(), output_rasters)
+            )
+        
+        print(f"  Süreç havuzu: {num_workers} çalışan, paylaşımlı bellek yuvaları")
+        try:
+            pipeline = TilePipeline(shared_tiles(), run_labeler_tile, write_shared_result,
+                                    num_workers=num_workers, prefetch=prefetch,
+                                    executor_factory=executor_factory, on_stop=slots.cancel)
+            return pipeline.run(progress=progress)
+        finally:
+            slots.close()
+    
+    def get_run_signature(self, metadata):
+        """
+        Kontrol noktalı çalıştırmayı tanımlayan imzayı oluştur
+        
+        Kaynak görüntüler, sahne ızgarası veya kutucuk sonucunu etkileyen ayarlar
+        değişirse imza da değişir ve yarıda kalan çalıştırma kullanılmaz.
+        
+        Args:
+            metadata: Görüntü meta verileri
             
-            return (y_start, y_end, x_start, x_end, change_map, damage_labels, field_data)
+        Returns:
+            JSON uyumlu imza sözlüğü
+        """
+        sources = {}
+        for year, name in self.image_names.items():
+            path = os.path.join(self.data_dir, name)
+            if os.path.exists(path):
+                stat = os.stat(path)
+                sources[year] = {'path': os.path.abspath(path), 'size': stat.st_size, 'mtime': stat.st_mtime}
+        
+        study_area = None
+        if self.study_area_mask and os.path.exists(self.boundary_path):
+            stat = os.stat(self.boundary_path)
+            study_area = {'path': os.path.abspath(self.boundary_path), 'size': stat.st_size, 'mtime': stat.st_mtime}
+        
+        return {
+            'sources': sources,
+            'width': metadata['width'],
+            'height': metadata['height'],
+            'transform': list(metadata['transform'])[:6],
+            'downsample_factor': metadata.get('downsample_factor', 1),
+            'tile_halo': self.tile_halo,
+            'change_detector': self.select_change_detector(None, tiled=True),
+            'change_threshold_std': self.change_threshold_std,
+            'kernel_backend': 'numba' if self.use_jit_kernels() else 'numpy',
+            'coarse_screening': self.coarse_screening,
+            'screening_level': self.screening_level if self.coarse_screening else None,
+            'screening_max_pixels': self.screening_max_pixels if self.coarse_screening else None,
+            'study_area': study_area
+        }
+    
+    # Stitched fields are built, geocoded and written this many at a time
+    FIELD_CHUNK_SIZE = 4096
+    
+    def stream_stitched_fields(self, stitched, levels, metadata):
+        """
+        Birleştirilmiş alan kayıtlarını parça parça oluşturup NDJSON alan dosyasına yaz
         
-        # Process tiles in parallel with progress tracking
-        tile_coords = [(i, j) for i in range(tiles_y) for j in range(tiles_x)]
+        Birleştirilmiş diziler alan tablosu olarak kullanılır; coğrafi koordinatlar tüm
+        tablo için tek çağrıda eklenir. Kayıtlar FIELD_CHUNK_SIZE'lık parçalar halinde
+        oluşturulup hemen diske yazılır; özet ve hasar istatistikleri küçük sahnelerde
+        olduğu gibi doğrudan tablo dizilerinden hesaplanır. Bellekte hiçbir zaman tüm alan
+        listesi tutulmaz.
         
-        # Use optimized thread pool with batch processing
-        batch_size = max(1, len(tile_coords) // (self.num_threads * 2))
-        results = []
+        Args:
+            stitched: RegionStitcher.resolve çıktısı ve kontur ölçütleri (perimeter, elongation)
+            levels: Alan başına hasar seviyesi dizinleri
+            metadata: Görüntü meta verileri (sütunlu tablonun m² alanları için)
+            
+        Returns:
+            (field_data, damage_stats); field_data alan listesi olmadan meta verileri içerir
+        """
+        table = dict(stitched, field_id=np.arange(1, len(stitched['area']) + 1),
+                     level=np.asarray(levels, dtype=np.int64))
+        self.geocode_field_table(table)
         
-        with ThreadPoolExecutor(max_workers=self.num_threads) as executor:
-            # Process in batches for better memory management
-            for i in range(0, len(tile_coords), batch_size):
-                batch = tile_coords[i:i + batch_size]
-                batch_results = list(executor.map(process_tile, batch))
-                results.extend(batch_results)
-                
-                # Progress indicator
-                processed = min(i + batch_size, len(tile_coords))
-                print(f"  İlerleme: {processed}/{len(tile_coords)} kutucuk işlendi ({processed/len(tile_coords)*100:.1f}%)")
+        writer = self.write_field_table(table, self.build_field_records, self.output_dir, metadata)
+        print(f"Alan kayıtları akışla yazıldı: {writer.count} alan -> {writer.path}")
         
-        # Combine results
-        for result in results:
-            if result is not None:
-                y_start, y_end, x_start, x_end, change_map, damage_labels, field_data = result
-                full_change_map[y_start:y_end, x_start:x_end] = change_map
-                full_damage_labels[y_start:y_end, x_start:x_end] = damage_labels
-                
-                # Merge field data
-                if 'fields' in field_data:
-                    for field in field_data['fields']:
-                        # Adjust field coordinates to global space
-                        field['geometry']['bounds']['min_x'] += x_start
-                        field['geometry']['bounds']['max_x'] += x_start
-                        field['geometry']['bounds']['min_y'] += y_start
-                        field['geometry']['bounds']['max_y'] += y_start
-                        field['geometry']['centroid']['x'] += x_start
-                        field['geometry']['centroid']['y'] += y_start
-        
-        # Combine field data from all tiles
-        combined_field_data = {
+        field_data = {
             'metadata': {
-                'total_fields': 0,
+                'total_fields': writer.count,
                 'analysis_timestamp': datetime.now().isoformat(),
-                'analysis_method': 'Çoklu algoritma değişiklik tespiti (SSIM + Renk + Kenar)',
-                'damage_thresholds': {
-                    'minimal': '< %10 değişiklik',
-                    'moderate': '%10-30 değişiklik',
-                    'severe': '%30-60 değişiklik',
-                    'catastrophic': '> %60 değişiklik'
-                },
+                'analysis_method': self.ANALYSIS_METHODS[self._tile_detector],
+                'damage_thresholds': self.describe_damage_thresholds(),
                 'coordinate_system': {
                     'pixel_coordinates': 'Görüntü piksel koordinatları (başlangıç: sol-üst)',
                     'geographic_coordinates': 'WGS84 (EPSG:4326) boylam, enlem',
                     'crs_original': str(getattr(self, 'crs', 'Bilinmiyor')) if hasattr(self, 'crs') else 'Bilinmiyor',
                     'has_geographic_coords': hasattr(self, 'transform') and self.transform is not None
                 }
-            },
-            'fields': []
+            }
         }
         
-        # Merge field data from all tiles
-        for result in results:
-            if result is not None:
-                _, _, _, _, _, _, field_data = result
-                if 'fields' in field_data:
-                    # Recalculate geographic coordinates for combined fields
-                    for field in field_data['fields']:
-                        if 'geometry' in field and 'centroid' in field['geometry']:
-                            # Update centroid coordinates
-                            centroid_x = field['geometry']['centroid']['x']
-                            centroid_y = field['geometry']['centroid']['y']
-                            centroid_coords = self.pixel_to_geographic(centroid_x, centroid_y)
-                            
-                            if centroid_coords:
-                                field['geometry']['centroid']['longitude'] = centroid_coords[0]
-                                field['geometry']['centroid']['latitude'] = centroid_coords[1]
-                            
-                            # Update bounds coordinates
-                            if 'bounds' in field['geometry']:
-                                bounds = field['geometry']['bounds']
-                                sw_coords = self.pixel_to_geographic(bounds['min_x'], bounds['max_y'])
-                                ne_coords = self.pixel_to_geographic(bounds['max_x'], bounds['min_y'])
-                                
-                                if sw_coords and ne_coords:
-                                    bounds['geographic'] = {
-                                        'southwest': {
-                                            'longitude': sw_coords[0],
-                                            'latitude': sw_coords[1]
-                                        },
-                                        'northeast': {
-                                            'longitude': ne_coords[0],
-                                            'latitude': ne_coords[1]
-                                        }
-                                    }
-                    
-                    combined_field_data['fields'].extend(field_data['fields'])
+        # Add field statistics
+        field_statistics = self.field_table_statistics(table)
+        if field_statistics is not None:
+            field_data['metadata']['field_statistics'] = field_statistics
+        
+        return field_data, self.field_table_damage_stats(table)
+    
+    def process_in_tiles(self, img1, img2, metadata):
+        """
+        Bellek verimliliği için büyük görüntüleri kutucuklarda iki geçişte işle
         
-        # Update total fields count
-        combined_field_data['metadata']['total_fields'] = len(combined_field_data['fields'])
+        1. geçiş: kutucuklar tile_halo kadar komşu pikselle okunur (filtreler kenarlarda
+        kesilmez), değişiklik haritaları diskteki sahne dizisine yazılır ve sabit aralıklı
+        bir yoğunluk histogramı biriktirilir. Histogramdan sahne geneli tek bir eşik
+        hesaplanır; aynı hasar hangi kutucukta olursa olsun aynı şekilde sınıflanır.
         
-        # Add field statistics
-        if combined_field_data['fields']:
-            combined_field_data['metadata'].update({
-                'field_statistics': {
-                    'size_distribution': {
-                        'min_area': min(f['geometry']['area_pixels'] for f in combined_field_data['fields']),
-                        'max_area': max(f['geometry']['area_pixels'] for f in combined_field_data['fields']),
-                        'avg_area': sum(f['geometry']['area_pixels'] for f in combined_field_data['fields']) / len(combined_field_data['fields'])
-                    },
-                    'damage_distribution': {
-                        level: len([f for f in combined_field_data['fields'] if f['damage_assessment']['level'] == level])
-                        for level in self.damage_thresholds.keys()
-                    },
-                    'shape_metrics': {
-                        'avg_compactness': sum(f['geometry']['compactness'] for f in combined_field_data['fields']) / len(combined_field_data['fields']),
-                        'avg_regularity': sum(f['shape_analysis']['regularity'] for f in combined_field_data['fields']) / len(combined_field_data['fields'])
-                    }
-                }
-            })
+        2. geçiş: değişiklik haritası kutucuk kutucuk diskten okunup bu eşikle ikili maskeye
+        çevrilir. Her kutucuğun bağlı bileşenleri ayrı etiketlenir; kutucuk kenarlarına
+        bölünen bölgeler RegionStitcher ile union-find kullanılarak birleştirilir ve alan
+        kimlikleri sahne genelinde tekil olur. Bu geçiş görüntüleri yeniden okumaz ve
+        bağlı bileşen etiketleme GIL'i bıraktığı için iş parçacıklarıyla çalışır.
+        
+        Args:
+            img1, img2: Giriş görüntüleri (akış modunda None; pencereler dosyadan okunur)
+            metadata: Görüntü meta verileri (sahne eşiği 'change_threshold' olarak eklenir)
+            
+        Returns:
+            (değişiklik haritası, hasar etiketleri, field_data, damage_stats); alan kayıtları
+            NDJSON alan dosyasına akıtılmıştır, field_data yalnızca meta verileri içerir
+        """
+        height, width = metadata['height'], metadata['width']
+        
+        # Calculate optimal tile size for current memory conditions
+        tile_size = self.calculate_optimal_tile_size((3, height, width))
+        if img1 is None:
+            tile_size = self.align_tile_size_to_blocks(tile_size)
+        
+        # Resume an interrupted run of the same inputs (its tile grid wins over the new tile size)
+        checkpoint = None
+        completed_change, completed = {}, {}
+        if self.checkpoint_tiles and TileCheckpoint is not None:
+            checkpoint = TileCheckpoint(self.runs_dir, self.get_run_signature(metadata))
+            required_files = [filename for filename, _ in self.SCENE_RASTERS.values()] + [RegionStitcher.TILE_LABELS]
+            tile_size, resuming = checkpoint.open(tile_size, required_files)
+            if resuming:
+                completed_change = checkpoint.completed_change_tiles()
+                completed = checkpoint.completed_tiles()
+        self._active_checkpoint = checkpoint
+        work_dir = checkpoint.run_dir if checkpoint else None
+        
+        print(f"{tile_size}x{tile_size} kutucuklarla işleniyor (halo: {self.tile_halo} piksel)...")
+        
+        # Tiles entirely outside the study area are neither read nor labeled
+        study_area = self.rasterize_study_area(metadata, work_dir)
+        outside = set()
+        if study_area is not None:
+            for y_start, y_end, x_start, x_end, _, _ in self._iter_tile_windows(height, width, tile_size):
+                if not study_area[y_start:y_end, x_start:x_end].any():
+                    outside.add((y_start, x_start))
+        
+        # Scene arrays live on disk, only the tiles in flight are in memory
+        full_change_map, full_damage_labels = self.create_scene_rasters(metadata, work_dir)
+        stitcher = RegionStitcher(self.raster_dir, (height, width), tile_size, work_dir=work_dir)
         
-        return full_change_map, full_damage_labels, combined_field_data
+        # Calculate number of tiles
+        tiles_y = (height + tile_size - 1) // tile_size
+        tiles_x = (width + tile_size - 1) // tile_size
+        total_tiles = tiles_x * tiles_y
+        progress_step = max(1, total_tiles // 20)
+        if outside:
+            print(f"  Çalışma alanı dışında kalan {len(outside)}/{total_tiles} kutucuk atlanıyor")
+        
+        def make_progress(label, already_done):
+            def report_progress(processed):
+                # Progress indicator
+                processed += already_done
+                if processed % progress_step == 0 or processed == total_tiles:
+                    print(f"  {label}: {processed}/{total_tiles} kutucuk işlendi ({processed/total_tiles*100:.1f}%)")
+            return report_progress
+        
+        # Pass 1: change maps and the scene-wide change intensity histogram
+        # (every tile uses the same detector, so all maps share one scale)
+        self._tile_detector = self.select_change_detector((tile_size + 2 * self.tile_halo) ** 2, tiled=True)
+        histogram = np.zeros(self.CHANGE_HISTOGRAM_BINS, dtype=np.int64)
+        for tile_histogram in completed_change.values():
+            histogram += tile_histogram
+        
+        if completed_change:
+            print(f"  Yarıda kalan çalıştırmaya devam ediliyor: {len(completed_change)}/{total_tiles} "
+                  f"kutucuğun değişiklik haritası zaten hesaplanmış")
+        
+        # Coarse-to-fine: tiles without change at low resolution are never read at full resolution
+        screened = {}
+        if self.coarse_screening:
+            screened = {key: tile_histogram for key, tile_histogram in self.screen_tiles(img1, img2, metadata, tile_size).items()
+                        if key not in outside}
+            skipped_pixels = sum((min(y + tile_size, height) - y) * (min(x + tile_size, width) - x) for y, x in screened)
+            metadata['screening'] = {
+                'level': self.screening_level,
+                'skipped_tiles': len(screened),
+                'total_tiles': total_tiles,
+                'skipped_pixel_fraction': round(skipped_pixels / (height * width), 4)
+            }
+            print(f"  Kaba tarama: {len(screened)}/{total_tiles} kutucuk atlandı, "
+                  f"piksellerin %{100 * skipped_pixels / (height * width):.1f}'i tam çözünürlükte işlenmeyecek")
+            for (y_start, x_start), tile_histogram in screened.items():
+                if (y_start, x_start) in completed_change:
+                    continue
+                np.add(histogram, tile_histogram, out=histogram)
+                if checkpoint:
+                    checkpoint.save_change_tile(y_start, x_start, tile_histogram)
+        done_change = set(completed_change) | set(screened) | outside
+        print(f"  Geçiş 1/2: {total_tiles - len(done_change)} kutucukta değişiklik haritası hesaplanıyor...")
+        
+        # Tiles come either from in-memory arrays or straight from the files
+        if img1 is None:
+            print("  Akış modu: pencereler doğrudan GeoTIFF dosyalarından okunuyor")
+            tile_source = self.iter_window_pairs(tile_size, metadata, halo=self.tile_halo, skip=done_change)
+        else:
+            tile_source = self._iter_array_tiles(img1, img2, tile_size, halo=self.tile_halo, skip=done_change)
+        
+        def write_change_result(result):
+            if result is None:
+                return
+            
+            # Stream change maps into the disk-backed scene array and keep only the histogram
+            y_start, y_end, x_start, x_end, change_map, tile_histogram = result
+            if change_map is not None:
+                # Process workers have already written their maps into the memmap
+                full_change_map[y_start:y_end, x_start:x_end] = change_map
+            np.add(histogram, tile_histogram, out=histogram)
+            
+            if checkpoint:
+                # The map must reach the disk before the tile is marked complete
+                full_change_map.flush()
+                checkpoint.save_change_tile(y_start, x_start, tile_histogram)
+        
+        # Reader prefetches tiles, the pool computes them, this thread writes results as they finish
+        if self.tile_backend == 'process':
+            # Tile bytes: two images, one slot holds both
+            bands, itemsize = (img1.shape[0], img1.dtype.itemsize) if img1 is not None else (3, 1)
+            slot_bytes = 2 * bands * itemsize * (tile_size + 2 * self.tile_halo) ** 2
+            self.run_process_pipeline(tile_source, write_change_result, slot_bytes,
+                                      {'change_map': full_change_map},
+                                      make_progress("Geçiş 1/2", len(done_change)))
+        else:
+            pipeline = TilePipeline(tile_source, lambda tile: self.compute_change_tile(*tile), write_change_result,
+                                    num_workers=self.num_threads)
+            pipeline.run(progress=make_progress("Geçiş 1/2", len(done_change)))
+        full_change_map.flush()
+        
+        threshold = self.compute_change_threshold(histogram)
+        metadata['change_threshold'] = threshold
+        print(f"  Sahne geneli değişiklik eşiği: {threshold:.4f} ({int(histogram.sum())} piksel üzerinden)")
+        
+        # Pass 2: binarize with the scene-wide threshold and label regions tile by tile
+        if completed:
+            print(f"  Yarıda kalan çalıştırmaya devam ediliyor: {len(completed)}/{total_tiles} kutucuğun bölgeleri zaten etiketlenmiş")
+            for (y_start, x_start), regions in sorted(completed.items()):
+                stitcher.add_tile(y_start, x_start, regions)
+        done_regions = set(completed) | outside
+        print(f"  Geçiş 2/2: {total_tiles - len(done_regions)} kutucukta bölgeler etiketleniyor...")
+        
+        def change_tiles():
+            for y_start, y_end, x_start, x_end, _, _ in self._iter_tile_windows(height, width, tile_size, skip=done_regions):
+                yield y_start, y_end, x_start, x_end, np.array(full_change_map[y_start:y_end, x_start:x_end])
+        
+        def write_region_result(result):
+            if result is None:
+                return
+            
+            # Local labels go to disk, only the region stats stay in memory
+            y_start, y_end, x_start, x_end, region_labels, regions = result
+            stitcher.tile_labels[y_start:y_end, x_start:x_end] = region_labels
+            stitcher.add_tile(y_start, x_start, regions)
+            
+            if checkpoint:
+                # Labels must reach the disk before the tile is marked complete
+                stitcher.tile_labels.flush()
+                checkpoint.save_tile(y_start, x_start, regions)
+        
+        pipeline = TilePipeline(change_tiles(), lambda tile: self.compute_region_tile(*tile, threshold),
+                                write_region_result, num_workers=self.num_threads)
+        pipeline.run(progress=make_progress("Geçiş 2/2", len(done_regions)))
+        
+        # Join regions split by tile seams, then paint damage levels tile by tile
+        stitched = stitcher.resolve()
+        field_levels = np.concatenate([[0], self.classify_intensity_levels(stitched['intensity_mean'])]).astype(np.uint8)
+        region_ids = stitcher.paint(full_damage_labels, field_levels)
+        
+        # Field shapes from each field's outer contour, the same definition as small scenes
+        perimeter, elongation = self.measure_region_shapes(region_ids, stitched, np.arange(1, len(stitched['area']) + 1))
+        stitched = dict(stitched, perimeter=perimeter, elongation=elongation)
+        del region_ids
+        region_path = stitcher.finalize()
+        
+        # Threshold-independent region stats let a reclassify run skip change detection
+        self.save_region_cache(stitched, metadata)
+        
+        field_data, damage_stats = self.stream_stitched_fields(stitched, field_levels[1:], metadata)
+        field_data['field_ids'] = np.memmap(region_path, dtype=RegionStitcher.REGION_RASTER[1], mode='r',
+                                            shape=(metadata['height'], metadata['width']))
+        return full_change_map, full_damage_labels, field_data, damage_stats
+    
+    
+    # RGBA per damage level, shared by the visualization and the damage class COG
+    DAMAGE_COLORS = {
+        0: [0, 0, 0, 0],           # No damage (transparent)
+        1: [0, 255, 0, 100],       # Minimal (green)
+        2: [255, 255, 0, 150],     # Moderate (yellow)
+        3: [255, 165, 0, 200],     # Severe (orange)
+        4: [255, 0, 0, 250]        # Catastrophic (red)
+    }
     
     def create_damage_visualization(self, img_2023, damage_labels, metadata, output_path):
         """
@@ -915,13 +2482,7 @@ class DisasterLabeler:
         img_display = np.transpose(img_2023, (1, 2, 0))
         
         # Create color map for damage levels
-        colors = {
-            0: [0, 0, 0, 0],           # No damage (transparent)
-            1: [0, 255, 0, 100],       # Minimal (green)
-            2: [255, 255, 0, 150],     # Moderate (yellow)
-            3: [255, 165, 0, 200],     # Severe (orange)
-            4: [255, 0, 0, 250]        # Catastrophic (red)
-        }
+        colors = self.DAMAGE_COLORS
         
         # Create damage overlay
         overlay = np.zeros((*damage_labels.shape, 4), dtype=np.uint8)
@@ -982,8 +2543,8 @@ class DisasterLabeler:
         """
         print("Hasar değerlendirme raporu oluşturuluyor...")
         
-        # Calculate total areas and percentages
-        total_pixels = metadata['width'] * metadata['height']
+        # Calculate total areas and percentages (within the study area when it is masked)
+        total_pixels = (metadata.get('study_area') or {}).get('pixels') or metadata['width'] * metadata['height']
         pixel_area_m2 = metadata['resolution'] ** 2
         total_area_m2 = total_pixels * pixel_area_m2
         
@@ -997,6 +2558,12 @@ class DisasterLabeler:
             },
             'damage_assessment': {}
         }
+        if metadata.get('change_threshold') is not None:
+            report['analysis_metadata']['change_threshold'] = float(round(metadata['change_threshold'], 4))
+        if metadata.get('screening'):
+            report['analysis_metadata']['coarse_screening'] = metadata['screening']
+        if metadata.get('study_area'):
+            report['analysis_metadata']['study_area'] = metadata['study_area']
         
         total_damaged_pixels = sum(stats['total_area'] for stats in damage_stats.values())
         
@@ -1047,24 +2614,125 @@ class DisasterLabeler:
                 print(f"  {level.title():12}: {data['region_count']:3} bölge, "
                       f"{data['total_area_km2']:.6f} km² ({data['percentage_of_total_area']:.2f}%)")
     
-    def run_analysis(self, force_downsample=False):
+    # Field records, one JSON object per line, next to the metadata file
+    FIELDS_FILE = 'hatay_fields.ndjson'
+    
+    # Memory-mappable .npy column per field attribute, with NDJSON offsets for record lookup
+    FIELD_COLUMNS_DIR = 'hatay_field_columns'
+    
+    def create_field_writer(self, output_dir, metadata):
+        """
+        Çıktı dizini için NDJSON alan dosyası ve sütunlu alan tablosu yazıcısı oluştur
+        
+        Args:
+            output_dir: Çıktı dizini
+            metadata: Görüntü meta verileri (piksel alanı için 'resolution')
+            
+        Returns:
+            FieldWriter
+        """
+        return FieldWriter(os.path.join(output_dir, self.FIELDS_FILE), self.damage_thresholds.keys(),
+                           columns_dir=os.path.join(output_dir, self.FIELD_COLUMNS_DIR),
+                           pixel_area_m2=float(metadata['resolution']) ** 2)
+    
+    def write_field_table(self, table, build_records, output_dir, metadata):
+        """
+        Alan tablosunu FIELD_CHUNK_SIZE'lık parçalar halinde NDJSON ve sütunlu tabloya yaz
+        
+        Kayıtlar yalnızca NDJSON satırları için oluşturulur; sütunlar parçanın dizilerinden
+        doğrudan yazılır.
+        
+        Args:
+            table: Alan tablosu
+            build_records: build_field_records veya build_summary_field_records
+            output_dir: Çıktı dizini
+            metadata: Görüntü meta verileri
+            
+        Returns:
+            Kapatılmış FieldWriter
+        """
+        writer = self.create_field_writer(output_dir, metadata)
+        try:
+            for start in range(0, len(table['area']), self.FIELD_CHUNK_SIZE):
+                stop = start + self.FIELD_CHUNK_SIZE
+                chunk = {name: column[start:stop] for name, column in table.items()}
+                writer.write_table(chunk, build_records(table, start, stop))
+        except BaseException:
+            writer.discard()
+            raise
+        writer.close()
+        return writer
+    
+    def save_field_data(self, field_data, output_path, metadata):
+        """
+        Alan seviyesi analiz meta verilerini JSON dosyasına kaydet
+        
+        Alan kayıtları FIELDS_FILE NDJSON dosyasında ve FIELD_COLUMNS_DIR sütunlu
+        tablosunda tutulur; meta veri dosyası bunları 'fields_file' ve 'columns_dir' ile
+        gösterir. Kutucuklu çalıştırmalar kayıtları zaten akışla yazmıştır; field_data
+        bir alan tablosu ('table') içeriyorsa (küçük sahneler) kayıtlar burada
+        FIELD_CHUNK_SIZE'lık parçalar halinde oluşturulup yazılır.
+        
+        Args:
+            field_data: Meta verileri (ve isteğe bağlı olarak alan tablosunu ve 'record_layout'
+                kayıt yapısını: 'full' veya 'summary') içeren sözlük
+            output_path: Çıktı JSON dosya yolu
+            metadata: Görüntü meta verileri
+        """
+        output_dir = os.path.dirname(output_path)
+        field_metadata = dict(field_data.get('metadata', {}))
+        
+        if 'table' in field_data:
+            table = field_data['table']
+            build_records = (self.build_summary_field_records if field_data.get('record_layout') == 'summary'
+                             else self.build_field_records)
+            writer = self.write_field_table(table, build_records, output_dir, metadata)
+            field_metadata.setdefault('total_fields', writer.count)
+        
+        with open(output_path, 'w') as f:
+            json.dump({'metadata': field_metadata, 'fields_file': self.FIELDS_FILE,
+                       'columns_dir': self.FIELD_COLUMNS_DIR}, f, indent=2)
+        print(f"Alan seviyesi analiz kaydedildi: {output_path} (+ {self.FIELDS_FILE}, {self.FIELD_COLUMNS_DIR}/)")
+    
+    def run_analysis(self, force_downsample=False, streaming=None, reclassify=False):
         """
         Otomatik bellek optimizasyonu ile tam afet etiketleme analizi çalıştır
         
         Args:
             force_downsample (bool): Ek örnekleme zorlanıp zorlanmayacağı
+            streaming (bool): Tam çözünürlüklü akış modunun kullanılıp kullanılmayacağı
+                (None ise self.streaming kullanılır)
+            reclassify (bool): Önbellekteki değişiklik haritasıyla yalnızca sınıflandırmayı
+                yenile; önbellek kullanılamıyorsa tam analiz çalışır
         """
         print("Afet Boyutu Etiketleme Analizi Başlatılıyor")
         print("="*60)
         
-        # Load and align images with automatic memory optimization
-        img_2015, img_2023, metadata = self.load_and_align_images()
+        if reclassify:
+            result = self.reclassify()
+            if result is not None:
+                return result
+            print("Yeniden sınıflandırma yapılamadı, tam analiz çalıştırılıyor...")
+        
+        streaming = self.streaming if streaming is None else streaming
+        
+        # Downsampled reads below become overview reads on the cached COGs
+        self.prepare_raster_cache()
+        
+        if streaming:
+            # Native resolution: tiles are streamed from disk, nothing is loaded up front
+            print("Tam çözünürlüklü akış modu etkin")
+            img_2015 = img_2023 = None
+            metadata = self.get_full_resolution_metadata()
+        else:
+            # Load and align images with automatic memory optimization
+            img_2015, img_2023, metadata = self.load_and_align_images()
         
         # Initialize coordinate system
         self.initialize_coordinates(metadata)
         
         # Optional additional downsampling for faster processing
-        if force_downsample and 'downsample_factor' in metadata and metadata['downsample_factor'] == 1:
+        if not streaming and force_downsample and 'downsample_factor' in metadata and metadata['downsample_factor'] == 1:
             print(f"{self.downsample_factor} faktörüyle ek örnekleme uygulanıyor...")
             img_2015 = img_2015[:, ::self.downsample_factor, ::self.downsample_factor]
             img_2023 = img_2023[:, ::self.downsample_factor, ::self.downsample_factor]
@@ -1072,70 +2740,258 @@ class DisasterLabeler:
             metadata['height'] = img_2015.shape[1]
             metadata['resolution'] *= self.downsample_factor
             metadata['downsample_factor'] *= self.downsample_factor
+            # Strided rows/columns keep the top-left origin, only the pixel size grows
+            metadata['transform'] = metadata['transform'] * Affine.scale(self.downsample_factor)
         
         # Process change detection
-        if img_2015.shape[1] * img_2015.shape[2] > 1000000:  # > 1M pixels
-            change_map, damage_labels, field_data = self.process_in_tiles(img_2015, img_2023, metadata)
+        tiled = streaming or metadata['width'] * metadata['height'] > 1000000  # > 1M pixels
+        if tiled:
+            change_map, damage_labels, field_data, damage_stats = self.process_in_tiles(img_2015, img_2023, metadata)
         else:
-            change_map, change_binary = self.compute_change_detection(img_2015, img_2023)
+            study_area = self.rasterize_study_area(metadata)
+            change_map, change_binary = self.compute_change_detection(
+                img_2015, img_2023, None if study_area is None else np.asarray(study_area).view(bool))
             damage_labels, damage_stats, field_data = self.classify_damage_regions(change_map, change_binary)
+            
+            # Persist small scenes the same way so API readers find a single format
+            scene_change_map, scene_damage_labels = self.create_scene_rasters(metadata)
+            scene_change_map[:] = change_map
+            scene_damage_labels[:] = damage_labels
+            change_map, damage_labels = scene_change_map, scene_damage_labels
+            
+            # Region cache of an earlier tiled run no longer matches these rasters
+            for filename in (self.REGION_CACHE, RegionStitcher.REGION_RASTER[0]):
+                stale_path = os.path.join(self.raster_dir, filename)
+                if os.path.exists(stale_path):
+                    os.remove(stale_path)
+        
+        change_map, damage_labels, _ = self.finalize_scene_rasters(change_map, damage_labels, metadata)
+        
+        # Rasters are in place, the checkpointed run is no longer needed
+        if tiled and self._active_checkpoint is not None:
+            self._active_checkpoint.clear()
+            self._active_checkpoint = None
+        
+        if streaming:
+            # Draw on a reduced preview, the full-resolution scene is never in memory
+            img_2023 = None
+        
+        self.write_analysis_outputs(damage_labels, damage_stats, field_data, metadata, img_2023, change_map)
+        return damage_labels, damage_stats, metadata
+    
+    # Damage polygon outputs (see export_damage_polygons)
+    POLYGON_FILES = ('hatay_damage_polygons.fgb', 'hatay_damage_polygons.geojson')
+    
+    def export_damage_polygons(self, damage_labels, field_ids, metadata, output_dir):
+        """
+        Hasarlı alanların ayak izlerini FlatGeobuf ve GeoJSON'a yaz
+        
+        Her poligon bir alandır ve alan tablosuyla field_id üzerinden birleştirilir.
+        FlatGeobuf dosyası uzamsal dizinlidir; haritalar bir sınır kutusundaki ayak
+        izlerini tüm dosyayı okumadan alabilir.
+        
+        Args:
+            damage_labels: Sahne hasar etiketleri
+            field_ids: Alan kimliği rasterı (hasarlı piksellerde field_id)
+            metadata: Görüntü meta verileri
+            output_dir: Çıktı dizini
+            
+        Returns:
+            Yazılan dosya yolları (poligonlar yazılamadıysa boş liste)
+        """
+        # Polygons of an earlier run must not outlive it, even if none are written now
+        self.remove_damage_polygons(output_dir)
+        if gpd is None:
+            print("Uyarı: geopandas mevcut değil - hasar poligonları yazılmadı")
+            return []
+        if self.pixels_to_geographic([0], [0]) is None:
+            print("Uyarı: Koordinat dönüşümü yok - hasar poligonları yazılmadı")
+            return []
+        
+        # Polygon vertices are pixel corners; all of them go to WGS84 in one batch
+        def to_geographic(coords):
+            lon, lat = self.pixels_to_geographic(coords[:, 0], coords[:, 1], offset='ul')
+            return np.column_stack((lon, lat))
+        
+        print("Hasar bölgeleri poligonlara dönüştürülüyor...")
+        geometries, fields, levels, areas = vectorize_damage_labels(
+            damage_labels, field_ids, simplify_tolerance=self.polygon_simplify_tolerance, transform_coords=to_geographic)
+        
+        level_names = list(self.damage_thresholds.keys())
+        area_pixels = np.rint(areas).astype(np.int64)
+        polygons = gpd.GeoDataFrame({
+            'field_id': fields,
+            'level': [level_names[level - 1] for level in levels],
+            'level_index': levels.astype(np.int32),
+            'area_pixels': area_pixels,
+            'area_m2': area_pixels * float(metadata['resolution']) ** 2
+        }, geometry=geometries, crs='EPSG:4326' if getattr(self, 'crs', None) is not None else None)
+        
+        output_fgb, output_geojson = (os.path.join(output_dir, filename) for filename in self.POLYGON_FILES)
+        polygons.to_file(output_fgb, driver='FlatGeobuf', SPATIAL_INDEX='YES')
+        polygons.to_file(output_geojson, driver='GeoJSON')
+        print(f"Hasar poligonları kaydedildi: {len(polygons)} poligon")
+        return [output_fgb, output_geojson]
+    
+    def remove_damage_polygons(self, output_dir):
+        """Önceki çalıştırmanın poligon dosyalarını sil (alan kimlikleri bu çalıştırmayla eşleşmez)"""
+        for filename in self.POLYGON_FILES:
+            path = os.path.join(output_dir, filename)
+            if os.path.exists(path):
+                os.remove(path)
+    
+    # Scene COG outputs (see export_scene_cogs)
+    SCENE_COGS = {
+        'change_map': 'hatay_change_intensity.tif',
+        'damage_labels': 'hatay_damage_classes.tif'
+    }
+    
+    def export_scene_cogs(self, change_map, damage_labels, metadata, output_dir):
+        """
+        Değişiklik yoğunluğunu ve hasar sınıflarını overview piramitli COG olarak yaz
         
-        # If processed in tiles, compute final statistics
-        if img_2015.shape[1] * img_2015.shape[2] > 1000000:
-            damage_stats = {level: {'count': 0, 'total_area': 0, 'avg_intensity': 0} 
-                           for level in self.damage_thresholds.keys()}
+        Değişiklik yoğunluğu CHANGE_HISTOGRAM_RANGE aralığında uint8'e ölçeklenir (bant
+        ölçeği fiziksel değeri verir, overview'lar ortalamayla); hasar sınıfları uint8
+        olarak DAMAGE_COLORS renk tablosuyla yazılır (overview'lar en sık değerle).
+        GIS araçları ve karo servisleri istedikleri pencereyi ucuzca okuyabilir.
+        
+        Args:
+            change_map: Sahne değişiklik haritası (None ise yalnızca hasar sınıfları yazılır)
+            damage_labels: Sahne hasar etiketleri
+            metadata: Görüntü meta verileri (transform, crs)
+            output_dir: Çıktı dizini
             
-            for damage_level, level_name in enumerate(['minimal', 'moderate', 'severe', 'catastrophic'], 1):
-                mask = (damage_labels == damage_level)
-                if np.any(mask):
-                    damage_stats[level_name]['total_area'] = np.sum(mask)
-                    damage_stats[level_name]['count'] = 1  # Simplified for tiled processing
-                    damage_stats[level_name]['avg_intensity'] = np.mean(change_map[mask])
-        
-                    # Create visualizations and reports
-            output_dir = "output"
-            os.makedirs(output_dir, exist_ok=True)
-            output_viz = os.path.join(output_dir, "hatay_damage_assessment.png")
-            output_report = os.path.join(output_dir, "hatay_damage_report.json")
-            output_fields = os.path.join(output_dir, "hatay_field_analysis.json")
-            
-            self.create_damage_visualization(img_2023, damage_labels, metadata, output_viz)
-            self.generate_damage_report(damage_stats, metadata, output_report)
-            
-            print("\nAnaliz Tamamlandı!")
-            print(f"Oluşturulan dosyalar:")
-            print(f"  • {output_viz} - Hasar görselleştirmesi")
-            print(f"  • {output_report} - Detaylı değerlendirme raporu")
-            print(f"  • {output_fields} - Alan seviyesi analiz verileri")
-            
-            # Print field analysis summary
-            print("\nALAN ANALİZ ÖZETİ")
-            print("=" * 60)
-            print(f"Toplam analiz edilen alan: {len(field_data['fields'])}")
+        Returns:
+            Yazılan dosya yolları (COG yazılamadıysa boş liste)
+        """
+        if write_cog is None:
+            print("Uyarı: COG yazıcı mevcut değil - sahne rasterları COG olarak yazılmadı")
+            return []
+        
+        transform, crs = metadata['transform'], metadata.get('crs')
+        written = []
+        print("Sahne rasterları COG olarak yazılıyor...")
+        
+        if change_map is not None:
+            high = self.CHANGE_HISTOGRAM_RANGE[1]
+            
+            def encode_change(block):
+                return np.rint(np.clip(block, 0, high) * (255 / high))
+            
+            written.append(write_cog(
+                os.path.join(output_dir, self.SCENE_COGS['change_map']), change_map, transform, crs,
+                encode=encode_change, scale=high / 255, description='change_intensity', resampling='AVERAGE'))
+        
+        colormap = {level: tuple(color) for level, color in self.DAMAGE_COLORS.items()}
+        written.append(write_cog(
+            os.path.join(output_dir, self.SCENE_COGS['damage_labels']), damage_labels, transform, crs,
+            colormap=colormap, description='damage_level', resampling='MODE'))
+        return written
+    
+    def write_analysis_outputs(self, damage_labels, damage_stats, field_data, metadata, img_2023=None, change_map=None):
+        """
+        Görselleştirme, hasar raporu, alan verileri ve COG'ları yaz ve özeti yazdır
+        
+        Args:
+            damage_labels: Sahne hasar etiketleri
+            damage_stats: Hasar seviyesi istatistikleri
+            field_data: Alan seviyesi analiz verileri ('field_ids' alan kimliği rasterını taşır)
+            metadata: Görüntü meta verileri
+            img_2023: Bellekteki 2023 görüntüsü (None ise küçültülmüş önizleme okunur)
+            change_map: Sahne değişiklik haritası (None ise değişiklik COG'u yeniden yazılmaz)
+        """
+        # Create visualizations and reports
+        output_dir = self.output_dir
+        os.makedirs(output_dir, exist_ok=True)
+        output_viz = os.path.join(output_dir, "hatay_damage_assessment.png")
+        output_report = os.path.join(output_dir, "hatay_damage_report.json")
+        output_fields = os.path.join(output_dir, "hatay_field_analysis.json")
+        
+        if img_2023 is None:
+            img_2023, preview_factor = self.read_preview(self.img_2023_path)
+            viz_labels = damage_labels[::preview_factor, ::preview_factor]
+        else:
+            viz_labels = damage_labels
+        
+        self.create_damage_visualization(img_2023, viz_labels, metadata, output_viz)
+        self.generate_damage_report(damage_stats, metadata, output_report)
+        self.save_field_data(field_data, output_fields, metadata)
+        if self.export_polygons:
+            output_polygons = self.export_damage_polygons(damage_labels, field_data['field_ids'], metadata, output_dir)
+        else:
+            output_polygons = []
+            self.remove_damage_polygons(output_dir)
+        output_cogs = self.export_scene_cogs(change_map, damage_labels, metadata, output_dir) if self.export_cogs else []
+        
+        print("\nAnaliz Tamamlandı!")
+        print(f"Oluşturulan dosyalar:")
+        print(f"  • {output_viz} - Hasar görselleştirmesi")
+        print(f"  • {output_report} - Detaylı değerlendirme raporu")
+        print(f"  • {output_fields} - Alan seviyesi analiz verileri")
+        for path in output_polygons:
+            print(f"  • {path} - Hasar bölgesi poligonları")
+        for path in output_cogs:
+            print(f"  • {path} - Bulut optimize GeoTIFF (COG)")
+        
+        # Print field analysis summary
+        print("\nALAN ANALİZ ÖZETİ")
+        print("=" * 60)
+        total_fields = len(field_data['table']['area']) if 'table' in field_data else field_data['metadata']['total_fields']
+        print(f"Toplam analiz edilen alan: {total_fields}")
+        
+        field_statistics = field_data['metadata'].get('field_statistics')
+        if field_statistics:
             print("\nHasar dağılımı:")
-            for level, count in field_data['metadata']['field_statistics']['damage_distribution'].items():
+            for level, count in field_statistics['damage_distribution'].items():
                 print(f"  {level.title():12}: {count:3} alan")
             
             print("\nAlan boyut ölçütleri:")
-            size_stats = field_data['metadata']['field_statistics']['size_distribution']
+            size_stats = field_statistics['size_distribution']
             print(f"  Ortalama alan: {size_stats['avg_area']:.1f} piksel")
             print(f"  Boyut aralığı: {size_stats['min_area']} ile {size_stats['max_area']} piksel")
             
             print("\nŞekil analizi:")
-            shape_stats = field_data['metadata']['field_statistics']['shape_metrics']
+            shape_stats = field_statistics['shape_metrics']
             print(f"  Ortalama sıkılık: {shape_stats['avg_compactness']:.3f}")
             print(f"  Ortalama düzenlilik: {shape_stats['avg_regularity']:.3f}")
-            
-            return damage_labels, damage_stats, metadata
+
+def parse_cli_options(argv):
+    """
+    Komut satırı argümanlarını apply_options seçeneklerine çevir
+    
+    --options '<json>' analizör API'sinin seçeneklerini olduğu gibi aktarır;
+    --streaming, --processes, --screening ve --reclassify kısayollardır.
+    """
+    options = {}
+    for i, arg in enumerate(argv):
+        if arg == '--options' and i + 1 < len(argv):
+            options.update(json.loads(argv[i + 1]))
+        elif arg.startswith('--options='):
+            options.update(json.loads(arg[len('--options='):]))
+    
+    if '--streaming' in argv:
+        options['streaming'] = True
+    # --processes runs tiles in a process pool across all cores
+    if '--processes' in argv:
+        options['tile_backend'] = 'process'
+    # --screening skips full-resolution detection where a coarse pass finds no change
+    if '--screening' in argv:
+        options['coarse_screening'] = True
+    # --reclassify only re-buckets the cached change map with the current thresholds
+    if '--reclassify' in argv:
+        options['mode'] = 'reclassify'
+    return options
 
 def main():
     """Afet etiketleme analizi çalıştırmak için ana fonksiyon"""
     try:
         # Create labeler instance
         labeler = DisasterLabeler()
+        run_kwargs = labeler.apply_options(parse_cli_options(sys.argv[1:]))
         
         # Run analysis with automatic memory optimization
-        damage_labels, damage_stats, metadata = labeler.run_analysis(force_downsample=False)
+        # (--streaming analyzes at native resolution, reading windows from disk)
+        damage_labels, damage_stats, metadata = labeler.run_analysis(force_downsample=False, **run_kwargs)
         
         print("\nAfet etiketleme analizi başarıyla tamamlandı!")
         
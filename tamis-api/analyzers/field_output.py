@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Hatay Hasar Analizi için Akışlı Alan Çıktısı
+Alan kayıtlarını oluşturuldukça satır başına bir JSON nesnesi olarak (NDJSON) yazar;
+böylece alan sayısı ne kadar büyürse büyüsün bellekte alan listesi tutulmaz. Alan tablosunun dizileri isteğe bağlı
+olarak bellek eşlemeli .npy sütunlarına da yazılır (vektörel filtreleme için).
+"""
+
+import os
+import json
+import shutil
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from .region_stitching import HISTOGRAM_BINS
+except ImportError:
+    from region_stitching import HISTOGRAM_BINS
+
+# Field table columns: name -> (dtype, per-field shape). Missing values are NaN (floats) or -1
+# (histogram of a run that did not measure one, distinguishable from an empty histogram).
+FIELD_COLUMNS = {
+    'field_id': (np.int64, ()),
+    'ndjson_offset': (np.int64, ()),
+    'min_x': (np.int32, ()),
+    'max_x': (np.int32, ()),
+    'min_y': (np.int32, ()),
+    'max_y': (np.int32, ()),
+    'centroid_x': (np.float64, ()),
+    'centroid_y': (np.float64, ()),
+    'longitude': (np.float64, ()),
+    'latitude': (np.float64, ()),
+    'west': (np.float64, ()),
+    'south': (np.float64, ()),
+    'east': (np.float64, ()),
+    'north': (np.float64, ()),
+    'area_pixels': (np.int64, ()),
+    'area_m2': (np.float64, ()),
+    'level_index': (np.uint8, ()),
+    'intensity_mean': (np.float64, ()),
+    'intensity_min': (np.float64, ()),
+    'intensity_max': (np.float64, ()),
+    'histogram': (np.int32, (HISTOGRAM_BINS,))
+}
+
+
+class FieldColumns:
+    """
+    Alan tablosunu sütun başına bir .npy dosyasına yazan tablo
+
+    Alan tablosunun parçaları sütun başına ham dosyalara doğrudan eklenir; close() bunları
+    .npy dosyalarına çevirir ve dizini columns.json manifestiyle birlikte yerine taşır.
+    """
+
+    MANIFEST = 'columns.json'
+
+    # Field table keys of the columns whose names differ
+    TABLE_KEYS = {'area_pixels': 'area', 'level_index': 'level'}
+
+    def __init__(self, columns_dir: str, level_names: List[str], pixel_area_m2: Optional[float] = None):
+        """
+        Tabloyu başlat
+
+        Args:
+            columns_dir: Sütun dizini
+            level_names: Hasar seviyesi adları (level_index - 1 sırasıyla)
+            pixel_area_m2: Piksel alanı (m²); None ise area_m2 NaN olur
+        """
+        self.columns_dir = columns_dir
+        self.tmp_dir = columns_dir + '.tmp'
+        self.level_names = level_names
+        self.pixel_area_m2 = pixel_area_m2
+        self.count = 0
+
+        if os.path.exists(self.tmp_dir):
+            shutil.rmtree(self.tmp_dir)
+        os.makedirs(self.tmp_dir)
+        self._raw = {name: open(os.path.join(self.tmp_dir, name + '.raw'), 'wb') for name in FIELD_COLUMNS}
+
+    def append_table(self, table: Dict[str, np.ndarray], offsets: np.ndarray):
+        """
+        Alan tablosunun bir parçasını sütunlara ekle
+
+        Args:
+            table: Parçanın alan tablosu dizileri (classify_damage_regions_* / stream_stitched_fields)
+            offsets: Parçadaki kayıtların NDJSON bayt konumları
+        """
+        count = len(offsets)
+        for name, (dtype, tail) in FIELD_COLUMNS.items():
+            key = self.TABLE_KEYS.get(name, name)
+            if name == 'ndjson_offset':
+                values = offsets
+            elif name == 'area_m2' and self.pixel_area_m2 is not None:
+                values = table['area'] * self.pixel_area_m2
+            elif key in table:
+                values = table[key]
+            else:
+                values = np.full((count,) + tail, np.nan if np.issubdtype(dtype, np.floating) else -1)
+            np.asarray(values, dtype=dtype).reshape((count,) + tail).tofile(self._raw[name])
+        self.count += count
+
+    def close(self):
+        """Ham sütunları .npy dosyalarına çevir ve dizini yerine taşı"""
+        for name, (dtype, tail) in FIELD_COLUMNS.items():
+            self._raw[name].close()
+            raw_path = os.path.join(self.tmp_dir, name + '.raw')
+            shape = (self.count,) + tail
+            if self.count:
+                # Copied through memmaps, so no column is ever loaded whole
+                column = np.lib.format.open_memmap(os.path.join(self.tmp_dir, name + '.npy'),
+                                                   mode='w+', dtype=dtype, shape=shape)
+                column[:] = np.memmap(raw_path, dtype=dtype, mode='r', shape=shape)
+                column.flush()
+                del column
+            else:
+                np.save(os.path.join(self.tmp_dir, name + '.npy'), np.zeros(shape, dtype=dtype))
+            os.remove(raw_path)
+
+        manifest = {
+            'count': self.count,
+            'levels': self.level_names,
+            'pixel_area_m2': self.pixel_area_m2,
+            'columns': {name: {'dtype': np.dtype(dtype).name, 'shape': list(tail)}
+                        for name, (dtype, tail) in FIELD_COLUMNS.items()}
+        }
+        with open(os.path.join(self.tmp_dir, self.MANIFEST), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+
+        if os.path.exists(self.columns_dir):
+            shutil.rmtree(self.columns_dir)
+        os.replace(self.tmp_dir, self.columns_dir)
+
+    def discard(self):
+        """Yarıda kalan tabloyu sil (önceki dizin olduğu gibi kalır)"""
+        for raw in self._raw.values():
+            raw.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+
+class FieldWriter:
+    """
+    Alan kayıtlarını NDJSON dosyasına akıtan yazıcı
+
+    Kayıtlar önce <yol>.tmp dosyasına yazılır ve close() ile yerine taşınır; yarıda
+    kalan bir çalıştırma önceki çıktıyı bozmaz. Yazıcı yalnızca serileştirir; özet
+    istatistikler alan tablosundan hesaplanır (DisasterLabeler.field_table_statistics).
+    """
+
+    def __init__(self, path: str, level_names: Iterable[str], columns_dir: Optional[str] = None,
+                 pixel_area_m2: Optional[float] = None):
+        """
+        Yazıcıyı başlat
+
+        Args:
+            path: NDJSON çıktı dosyası
+            level_names: Hasar seviyesi adları (sıralı)
+            columns_dir: Sütunlu alan tablosunun dizini (None ise yazılmaz)
+            pixel_area_m2: Piksel alanı (m², sütunlu tablonun area_m2 sütunu için)
+        """
+        self.path = path
+        self.level_names = list(level_names)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path + '.tmp', 'wb')
+        self._offset = 0
+        self.columns = FieldColumns(columns_dir, self.level_names, pixel_area_m2) if columns_dir else None
+        self.count = 0
+
+    def write(self, field: Dict[str, Any]) -> int:
+        """
+        Bir alan kaydını tek satır olarak yaz
+
+        Returns:
+            Satırın dosyadaki bayt konumu
+        """
+        line = (json.dumps(field, separators=(',', ':')) + '\n').encode('utf-8')
+        self._file.write(line)
+        offset = self._offset
+        self._offset += len(line)
+        self.count += 1
+        return offset
+
+    def write_table(self, table: Dict[str, np.ndarray], fields: List[Dict[str, Any]]):
+        """
+        Alan tablosunun bir parçasını yaz: kayıtlar NDJSON'a, dizileri doğrudan sütunlara
+
+        Args:
+            table: Parçanın alan tablosu dizileri
+            fields: Aynı parçadan oluşturulmuş kayıtlar (tablo sırasıyla)
+        """
+        offsets = np.array([self.write(field) for field in fields], dtype=np.int64)
+        if self.columns is not None:
+            self.columns.append_table(table, offsets)
+
+    def close(self):
+        """Dosyayı diske yaz ve geçici dosyayı yerine taşı"""
+        self._file.close()
+        if self.columns is not None:
+            self.columns.close()
+        os.replace(self.path + '.tmp', self.path)
+
+    def discard(self):
+        """Yarıda kalan çıktıyı sil (önceki dosya olduğu gibi kalır)"""
+        self._file.close()
+        if self.columns is not None:
+            self.columns.discard()
+        if os.path.exists(self.path + '.tmp'):
+            os.remove(self.path + '.tmp')
+
+
+def iter_fields(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    NDJSON alan dosyasındaki kayıtları sırayla oku
+
+    Args:
+        path: FieldWriter ile yazılmış dosya
+
+    Yields:
+        Alan kayıtları
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def read_fields_at(path: str, offsets: Iterable[int]) -> List[Dict[str, Any]]:
+    """
+    NDJSON alan dosyasından yalnızca verilen bayt konumlarındaki kayıtları oku
+
+    Args:
+        path: FieldWriter ile yazılmış dosya
+        offsets: Sütunlu tablonun ndjson_offset değerleri
+
+    Returns:
+        Alan kayıtları (offsets sırasıyla)
+    """
+    fields = []
+    with open(path, 'rb') as f:
+        for offset in offsets:
+            f.seek(int(offset))
+            fields.append(json.loads(f.readline()))
+    return fields
+
+
+def load_field_columns(columns_dir: str) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    """
+    Sütunlu alan tablosunu bellek eşlemeli olarak aç
+
+    Args:
+        columns_dir: FieldColumns dizini
+
+    Returns:
+        (sütun adı -> salt okunur memmap, manifest)
+    """
+    with open(os.path.join(columns_dir, FieldColumns.MANIFEST), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    columns = {name: np.load(os.path.join(columns_dir, name + '.npy'), mmap_mode='r')
+               for name in manifest['columns']}
+    return columns, manifest
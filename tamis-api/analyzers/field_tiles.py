@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Hatay Hasar Analizi için Alan Vektör Karoları (Mapbox Vector Tile)
+Sütunlu alan tablosundan ve hasar poligonlarından bir STRtree uzamsal dizini kurar
+ve XYZ karolarını istek anında MVT olarak kodlar. Uzak yakınlaştırmalarda yalnızca
+ekranda çok küçük kalan düşük seviyeli alanlar atlanır, geometriler karo
+çözünürlüğünde sadeleştirilir. Karolar analiz çalıştırmasına göre önbelleğe alınır.
+"""
+
+import os
+import struct
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import shapely
+except ImportError:
+    print("Uyarı: shapely mevcut değil")
+    shapely = None
+
+try:
+    import geopandas as gpd
+    import pandas as pd
+except ImportError:
+    print("Uyarı: geopandas mevcut değil")
+    gpd = pd = None
+
+try:
+    from .field_output import FieldColumns, load_field_columns
+    from .raster_tiles import TileCache, WEB_MERCATOR_EXTENT, tile_bounds
+except ImportError:
+    from field_output import FieldColumns, load_field_columns
+    from raster_tiles import TileCache, WEB_MERCATOR_EXTENT, tile_bounds
+
+# Tile coordinate space and the margin kept around it so polygons do not show seams
+MVT_EXTENT = 4096
+MVT_BUFFER = 64
+
+# Earth radius of the Web Mercator projection (metres)
+WEB_MERCATOR_RADIUS = 6378137.0
+
+
+def lonlat_to_web_mercator(lon: np.ndarray, lat: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """WGS84 boylam/enlem dizilerini EPSG:3857 metre koordinatlarına çevir"""
+    x = np.radians(lon) * WEB_MERCATOR_RADIUS
+    y = np.log(np.tan(np.pi / 4 + np.radians(lat) / 2)) * WEB_MERCATOR_RADIUS
+    return x, y
+
+
+# Protocol buffer encoding of the vector tile schema (mapbox/vector-tile-spec 2.1)
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while value > 0x7f:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _key(number: int, wire_type: int) -> bytes:
+    return _varint(number << 3 | wire_type)
+
+
+def _message(number: int, payload: bytes) -> bytes:
+    return _key(number, 2) + _varint(len(payload)) + payload
+
+
+def _packed(number: int, values) -> bytes:
+    return _message(number, b''.join(_varint(int(value)) for value in values))
+
+
+def _encode_value(value) -> bytes:
+    """Özellik değerini MVT Value mesajına çevir (string, double veya uint)"""
+    if isinstance(value, str):
+        return _message(1, value.encode('utf-8'))
+    if isinstance(value, float):
+        return _key(3, 1) + struct.pack('<d', value)
+    return _key(5, 0) + _varint(int(value))
+
+
+def encode_polygon_geometry(polygons: List) -> List[int]:
+    """
+    Karo koordinatlarındaki poligonları MVT geometri komutlarına çevir
+
+    Dış halkalar pozitif, iç halkalar negatif alanlı olmalıdır (y aşağı doğru).
+    Her halka MoveTo, LineTo ve ClosePath komutlarıyla, zigzag kodlu göreli
+    koordinatlarla yazılır.
+    """
+    commands = []
+    cursor = np.zeros(2, dtype=np.int64)
+    for polygon in polygons:
+        for ring in (polygon.exterior, *polygon.interiors):
+            coords = np.asarray(ring.coords, dtype=np.int64)[:-1]
+            if len(coords) < 3:
+                continue
+            deltas = np.diff(coords, axis=0, prepend=cursor[None, :])
+            cursor = coords[-1]
+            zigzag = ((deltas << 1) ^ (deltas >> 63)).ravel().tolist()
+            commands += [1 | 1 << 3, *zigzag[:2], 2 | (len(coords) - 1) << 3, *zigzag[2:], 7 | 1 << 3]
+    return commands
+
+
+def encode_layer(name: str, features: List[Tuple[int, Dict, List[int]]], extent: int = MVT_EXTENT) -> bytes:
+    """
+    Poligon özelliklerini tek katmanlı bir MVT karosuna kodla
+
+    Args:
+        name: Katman adı
+        features: (kimlik, özellikler, geometri komutları) listesi
+        extent: Karo koordinat aralığı
+
+    Returns:
+        Tile mesajı baytları (özellik yoksa boş)
+    """
+    if not features:
+        return b''
+
+    keys, values = {}, {}
+    encoded = []
+    for feature_id, properties, geometry in features:
+        tags = []
+        for key, value in properties.items():
+            tags.append(keys.setdefault(key, len(keys)))
+            tags.append(values.setdefault((type(value), value), len(values)))
+        encoded.append(_message(2, _key(1, 0) + _varint(feature_id) + _packed(2, tags)
+                                + _key(3, 0) + _varint(3) + _packed(4, geometry)))
+
+    layer = (_key(15, 0) + _varint(2) + _message(1, name.encode('utf-8')) + b''.join(encoded)
+             + b''.join(_message(3, key.encode('utf-8')) for key in keys)
+             + b''.join(_message(4, _encode_value(value)) for _, value in values)
+             + _key(5, 0) + _varint(extent))
+    return _message(3, layer)
+
+
+class FieldTileRenderer:
+    """
+    Alan tablosundan XYZ Mapbox Vector Tile karoları oluşturur
+
+    Alan geometrisi, hasar poligonları dosyasındaki ayak izidir; poligonlar alan
+    tablosuna field_id ile birleştirilir (poligonlar yazılmamışsa alanın sınır kutusu
+    kullanılır).
+    Dizin çalıştırma başına bir kez kurulur; karolar TileCache'te tutulur.
+    """
+
+    LAYER_NAME = 'fields'
+
+    # Analysis outputs the index is built from (DisasterLabeler.FIELD_COLUMNS_DIR and polygons)
+    FIELD_COLUMNS_DIR = 'hatay_field_columns'
+    POLYGONS_FILE = 'hatay_damage_polygons.fgb'
+
+    # Douglas-Peucker tolerance in screen pixels at the tile's zoom
+    SIMPLIFY_PIXELS = 1.0
+
+    # Fields up to MINOR_LEVEL smaller than this many screen pixels are dropped
+    MIN_FEATURE_PIXELS = 4.0
+    MINOR_LEVEL = 2
+
+    def __init__(self, output_dir: str = "output", cache_dir: Optional[str] = os.path.join("cache", "tiles"),
+                 memory_bytes: int = 32 * 1024 * 1024):
+        """
+        Vektör karo oluşturucuyu başlat
+
+        Args:
+            output_dir: Analiz çıktılarının bulunduğu dizin
+            cache_dir: Disk karo önbelleği dizini (None ise disk önbelleği kullanılmaz)
+            memory_bytes: Bellek içi LRU önbelleğinin bayt sınırı
+        """
+        self.output_dir = output_dir
+        self.cache = TileCache(cache_dir, memory_bytes, suffix='mvt')
+        self._index = None
+        self._lock = threading.Lock()
+
+    def run_version(self) -> Optional[str]:
+        """
+        Geçerli analiz çalıştırmasının sürüm anahtarını döndür
+
+        Returns:
+            Alan tablosu ve poligon dosyasının boyut/değiştirilme zamanından oluşan anahtar
+            veya alan tablosu yoksa None
+        """
+        manifest_path = os.path.join(self.output_dir, self.FIELD_COLUMNS_DIR, FieldColumns.MANIFEST)
+        if not os.path.exists(manifest_path):
+            return None
+        parts = []
+        for path in (manifest_path, os.path.join(self.output_dir, self.POLYGONS_FILE)):
+            if os.path.exists(path):
+                stat = os.stat(path)
+                parts.append(f"{stat.st_size:x}-{stat.st_mtime_ns:x}")
+        return '-'.join(parts)
+
+    def load_index(self, version: str) -> Optional[Dict]:
+        """
+        Çalıştırmanın alan dizinini döndür, gerekirse kur
+
+        Returns:
+            geometries (EPSG:3857), tree, mercator_area, minor ve özellik dizilerini içeren sözlük
+            veya alanların coğrafi koordinatı yoksa None
+        """
+        with self._lock:
+            if self._index is not None and self._index[0] == version:
+                return self._index[1]
+            index = self.build_index()
+            self._index = (version, index)
+            return index
+
+    def build_index(self) -> Optional[Dict]:
+        """
+        Alan tablosu ve hasar poligonlarından STRtree dizinini kur
+        """
+        columns, manifest = load_field_columns(os.path.join(self.output_dir, self.FIELD_COLUMNS_DIR))
+        count = manifest['count']
+        if count == 0 or np.isnan(columns['longitude']).any():
+            return None
+
+        # Mercator scale grows with 1/cos(latitude)
+        centroid_x, centroid_y = lonlat_to_web_mercator(np.asarray(columns['longitude']),
+                                                        np.asarray(columns['latitude']))
+        cos_lat = np.cos(np.radians(np.asarray(columns['latitude'])))
+
+        level_index = np.asarray(columns['level_index'])
+        field_ids = np.asarray(columns['field_id'])
+        geometries = self.load_polygons(field_ids)
+        if geometries is None:
+            # No polygon export: the pixel bounding box, placed relative to the centroid (north-up grid)
+            pixel_size = np.sqrt(manifest.get('pixel_area_m2') or 0.0) / cos_lat
+            min_x, max_x = np.asarray(columns['min_x']), np.asarray(columns['max_x']) + 1
+            min_y, max_y = np.asarray(columns['min_y']), np.asarray(columns['max_y']) + 1
+            pixel_cx, pixel_cy = np.asarray(columns['centroid_x']) + 0.5, np.asarray(columns['centroid_y']) + 0.5
+            geometries = shapely.box(centroid_x + (min_x - pixel_cx) * pixel_size, centroid_y - (max_y - pixel_cy) * pixel_size,
+                                     centroid_x + (max_x - pixel_cx) * pixel_size, centroid_y - (min_y - pixel_cy) * pixel_size)
+
+        # Screen area at zoom z is area_m2 / (ground resolution)^2, i.e. the Mercator area in pixels
+        return {
+            'geometries': geometries,
+            'tree': shapely.STRtree(geometries),
+            'mercator_area': np.asarray(columns['area_m2']) / (cos_lat * cos_lat),
+            'minor': level_index <= self.MINOR_LEVEL,
+            'field_id': field_ids,
+            'level_index': level_index,
+            'area_m2': np.asarray(columns['area_m2']),
+            'intensity': np.asarray(columns['intensity_mean']),
+            'level_names': manifest['levels']
+        }
+
+    def load_polygons(self, field_ids: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Alanların hasar poligonlarını field_id ile birleştirerek oku
+
+        Args:
+            field_ids: Alan tablosunun field_id sütunu
+
+        Returns:
+            Alan sırasıyla EPSG:3857 poligonları veya poligon dosyası yoksa None
+        """
+        path = os.path.join(self.output_dir, self.POLYGONS_FILE)
+        if gpd is None or not os.path.exists(path):
+            return None
+        polygons = gpd.read_file(path)
+        if 'field_id' not in polygons.columns:
+            return None
+
+        def to_web_mercator(coords):
+            return np.column_stack(lonlat_to_web_mercator(coords[:, 0], coords[:, 1]))
+
+        # Every field has exactly one footprint; a missing one means the file is from another run
+        rows = pd.Index(polygons['field_id'].to_numpy(np.int64)).get_indexer(field_ids.astype(np.int64))
+        if (rows < 0).any():
+            print(f"Uyarı: {int((rows < 0).sum())} alanın poligonu yok - sınır kutuları kullanılacak")
+            return None
+        return shapely.transform(np.asarray(polygons.geometry.values)[rows], to_web_mercator)
+
+    def render(self, z: int, x: int, y: int) -> Optional[bytes]:
+        """
+        Alan karosunu önbellekten al veya oluştur
+
+        Returns:
+            MVT baytları (karoda alan yoksa boş) veya alan tablosu yoksa None
+        """
+        version = self.run_version()
+        if version is None:
+            return None
+
+        data = self.cache.get(self.LAYER_NAME, version, z, x, y)
+        if data is None:
+            index = self.load_index(version)
+            data = self.build_tile(index, z, x, y) if index is not None else b''
+            self.cache.put(self.LAYER_NAME, version, z, x, y, data)
+        return data
+
+    def build_tile(self, index: Dict, z: int, x: int, y: int) -> bytes:
+        """
+        Karonun alanlarını seç, kırp, sadeleştir ve MVT olarak kodla
+        """
+        left, bottom, right, top = tile_bounds(z, x, y)
+        size = right - left
+        margin = size * MVT_BUFFER / MVT_EXTENT
+
+        selected = np.sort(index['tree'].query(shapely.box(left - margin, bottom - margin,
+                                                           right + margin, top + margin)))
+
+        # Thinning: minor fields that would cover only a few screen pixels are skipped
+        pixel_size = 2 * WEB_MERCATOR_EXTENT / (256 * (1 << z))
+        visible = index['mercator_area'][selected] >= self.MIN_FEATURE_PIXELS * pixel_size * pixel_size
+        selected = selected[visible | ~index['minor'][selected]]
+        if len(selected) == 0:
+            return b''
+
+        geometries = shapely.clip_by_rect(index['geometries'][selected], left - margin, bottom - margin,
+                                          right + margin, top + margin)
+
+        # Tile coordinates (y down), simplified at screen resolution and snapped to the integer grid
+        scale = MVT_EXTENT / size
+
+        def to_tile(coords):
+            return np.column_stack(((coords[:, 0] - left) * scale, (top - coords[:, 1]) * scale))
+
+        geometries = shapely.transform(geometries, to_tile)
+        geometries = shapely.simplify(geometries, self.SIMPLIFY_PIXELS * MVT_EXTENT / 256, preserve_topology=True)
+        geometries = shapely.set_precision(geometries, 1.0)
+        geometries = shapely.orient_polygons(geometries, exterior_cw=False)
+
+        level_names = index['level_names']
+        features = []
+        for i, geometry in zip(selected.tolist(), geometries):
+            polygons = [part for part in shapely.get_parts(geometry)
+                        if part.geom_type == 'Polygon' and not part.is_empty]
+            commands = encode_polygon_geometry(polygons)
+            if not commands:
+                continue
+            level = int(index['level_index'][i])
+            features.append((int(index['field_id'][i]), {
+                'field_id': int(index['field_id'][i]),
+                'level': level_names[level - 1],
+                'level_index': level,
+                'area_m2': float(index['area_m2'][i]),
+                'intensity': float(index['intensity'][i])
+            }, commands))
+
+        return encode_layer(self.LAYER_NAME, features)
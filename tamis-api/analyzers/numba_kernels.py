@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Hatay Hasar Analizi için Numba Çekirdekleri
+Hızlı değişiklik tespitinin gri ton, yerel NCC, renk farkı, Sobel kenar farkı ve
+ağırlıklandırma adımlarını kutucuk başına iki geçişte birleştiren ve bölge
+yoğunluk istatistiklerini tek geçişte toplayan isteğe bağlı JIT çekirdekleri
+
+Numba kurulu değilse NUMBA_AVAILABLE False olur ve çağıranlar NumPy/OpenCV
+yoluna döner. Çekirdekler GIL'i bırakır, bu yüzden kutucuk iş parçacıklarıyla
+paralel çalışır.
+"""
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    print("Uyarı: Numba mevcut değil")
+    numba = None
+
+NUMBA_AVAILABLE = numba is not None
+
+# Window radius of the 11x11 NCC box filter (same as cv2.blur(..., (11, 11)))
+NCC_RADIUS = 5
+
+# Smallest tile side the kernels accept (reflected borders must stay inside the tile)
+MIN_SIDE = 2 * NCC_RADIUS + 2
+
+
+def _jit(func):
+    """Numba varsa fonksiyonu GIL'siz ve disk önbellekli derle, yoksa olduğu gibi bırak"""
+    if numba is None:
+        return func
+    return numba.njit(nogil=True, cache=True, error_model='numpy')(func)
+
+
+@_jit
+def _reflect(i, n):
+    # OpenCV's BORDER_REFLECT_101 (the default border of blur, Sobel and GaussianBlur)
+    if i < 0:
+        return -i
+    if i >= n:
+        return 2 * n - 2 - i
+    return i
+
+
+@_jit
+def _gray_row(img, y, out):
+    # Same integer weights and truncation as compute_change_map_fast
+    for x in range(out.shape[0]):
+        out[x] = np.float32((np.int64(img[0, y, x]) * 299 + np.int64(img[1, y, x]) * 587
+                             + np.int64(img[2, y, x]) * 114) // 1000)
+
+
+@_jit
+def change_terms(img1, img2, base, edge_diff):
+    """
+    1. geçiş: NCC ve renk terimlerini base'e, Sobel kenar farkını edge_diff'e yaz
+
+    Gri ton satırları bir kez hesaplanıp 2 * NCC_RADIUS + 2 satırlık halka arabellekte
+    tutulur; kutu filtreleri kayan sütun toplamlarıyla, Sobel aynı halkadan hesaplanır.
+    Kenar farkı, tüm kutucuğun en büyük kenar değerine göre ölçekleneceği için ikinci
+    geçişe bırakılır.
+
+    Args:
+        img1, img2: (kanal, yükseklik, genişlik) görüntüler (kenarlar en az MIN_SIDE piksel)
+        base, edge_diff: (yükseklik, genişlik) float32 çıktı dizileri
+
+    Returns:
+        İki görüntünün en büyük Sobel kenar büyüklükleri (max1, max2)
+    """
+    bands, height, width = img1.shape
+    radius = NCC_RADIUS
+    slots = 2 * radius + 2
+    scale = 1.0 / ((2 * radius + 1) * (2 * radius + 1))
+    color_weight = np.float32(0.3 / (np.sqrt(3.0) * 255.0))
+    half, eps, zero = np.float32(0.5), np.float32(1e-10), np.float32(0.0)
+
+    # Gray rows, row r lives in slot r % slots: the window's rows plus the one leaving it
+    ring1 = np.empty((slots, width), dtype=np.float32)
+    ring2 = np.empty((slots, width), dtype=np.float32)
+    computed = 0
+    while computed <= radius:
+        _gray_row(img1, computed, ring1[computed % slots])
+        _gray_row(img2, computed, ring2[computed % slots])
+        computed += 1
+
+    # Column sums of g1, g2, g1^2, g2^2 and g1*g2 over the current 11-row window (exact integers)
+    colsum = np.zeros((5, width), dtype=np.float64)
+    for k in range(-radius, radius + 1):
+        slot = _reflect(k, height) % slots
+        for x in range(width):
+            a, b = np.float64(ring1[slot, x]), np.float64(ring2[slot, x])
+            colsum[0, x] += a
+            colsum[1, x] += b
+            colsum[2, x] += a * a
+            colsum[3, x] += b * b
+            colsum[4, x] += a * b
+
+    # Reflected column indices, looked up instead of branching per pixel
+    enter, leave = np.empty(width, dtype=np.int64), np.empty(width, dtype=np.int64)
+    left, right = np.empty(width, dtype=np.int64), np.empty(width, dtype=np.int64)
+    for x in range(width):
+        enter[x], leave[x] = _reflect(x + radius, width), _reflect(x - radius - 1, width)
+        left[x], right[x] = _reflect(x - 1, width), _reflect(x + 1, width)
+
+    max1, max2 = zero, zero
+    for y in range(height):
+        if y > 0:
+            if computed < height:
+                _gray_row(img1, computed, ring1[computed % slots])
+                _gray_row(img2, computed, ring2[computed % slots])
+                computed += 1
+            add, sub = _reflect(y + radius, height) % slots, _reflect(y - radius - 1, height) % slots
+            for x in range(width):
+                a, b = np.float64(ring1[add, x]), np.float64(ring2[add, x])
+                c, d = np.float64(ring1[sub, x]), np.float64(ring2[sub, x])
+                colsum[0, x] += a - c
+                colsum[1, x] += b - d
+                colsum[2, x] += a * a - c * c
+                colsum[3, x] += b * b - d * d
+                colsum[4, x] += a * b - c * d
+
+        up, down = _reflect(y - 1, height) % slots, _reflect(y + 1, height) % slots
+        center = y % slots
+
+        s0 = s1 = s2 = s3 = s4 = 0.0
+        for k in range(-radius, radius + 1):
+            col = _reflect(k, width)
+            s0 += colsum[0, col]
+            s1 += colsum[1, col]
+            s2 += colsum[2, col]
+            s3 += colsum[3, col]
+            s4 += colsum[4, col]
+
+        for x in range(width):
+            if x > 0:
+                add, sub = enter[x], leave[x]
+                s0 += colsum[0, add] - colsum[0, sub]
+                s1 += colsum[1, add] - colsum[1, sub]
+                s2 += colsum[2, add] - colsum[2, sub]
+                s3 += colsum[3, add] - colsum[3, sub]
+                s4 += colsum[4, add] - colsum[4, sub]
+
+            # Local NCC, accumulated as 0.5 * (1 - ncc)
+            mean1, mean2 = np.float32(s0 * scale), np.float32(s1 * scale)
+            var1 = np.float32(s2 * scale) - mean1 * mean1
+            var2 = np.float32(s3 * scale) - mean2 * mean2
+            std1 = np.float32(np.sqrt(max(var1, zero))) + eps
+            std2 = np.float32(np.sqrt(max(var2, zero))) + eps
+            ncc = (np.float32(s4 * scale) - mean1 * mean2) / (std1 * std2)
+            ncc = min(max(ncc, np.float32(-1.0)), np.float32(1.0))
+            value = ncc * -half + half
+
+            # Color difference norm over all bands
+            color = zero
+            for band in range(bands):
+                diff = np.float32(img1[band, y, x]) - np.float32(img2[band, y, x])
+                color += diff * diff
+            base[y, x] = value + np.float32(np.sqrt(color)) * color_weight
+
+            # Sobel magnitudes from the gray ring
+            xl, xr = left[x], right[x]
+            gx = ((ring1[up, xr] + 2 * ring1[center, xr] + ring1[down, xr])
+                  - (ring1[up, xl] + 2 * ring1[center, xl] + ring1[down, xl]))
+            gy = ((ring1[down, xl] + 2 * ring1[down, x] + ring1[down, xr])
+                  - (ring1[up, xl] + 2 * ring1[up, x] + ring1[up, xr]))
+            edge1 = np.float32(np.sqrt(gx * gx + gy * gy))
+            gx = ((ring2[up, xr] + 2 * ring2[center, xr] + ring2[down, xr])
+                  - (ring2[up, xl] + 2 * ring2[center, xl] + ring2[down, xl]))
+            gy = ((ring2[down, xl] + 2 * ring2[down, x] + ring2[down, xr])
+                  - (ring2[up, xl] + 2 * ring2[up, x] + ring2[up, xr]))
+            edge2 = np.float32(np.sqrt(gx * gx + gy * gy))
+
+            max1, max2 = max(max1, edge1), max(max2, edge2)
+            edge_diff[y, x] = abs(edge1 - edge2)
+
+    return max1, max2
+
+
+@_jit
+def smooth_combined(base, edge_diff, edge_weight, kernel, out):
+    """
+    2. geçiş: base + edge_weight * edge_diff toplamını 3x3 Gauss ile yumuşatıp out'a yaz
+
+    Yatay süzülmüş satırlar üç satırlık halka arabellekte tutulur; birleşik harita
+    ayrı bir dizi olarak oluşturulmaz.
+
+    Args:
+        base, edge_diff: change_terms çıktıları
+        edge_weight: Kenar farkı ağırlığı (0.2 / en büyük kenar değeri, float32)
+        kernel: Üç elemanlı float32 Gauss çekirdeği
+        out: (yükseklik, genişlik) float32 çıktı dizisi
+    """
+    height, width = base.shape
+    combined = np.empty(width, dtype=np.float32)
+    ring = np.empty((3, width), dtype=np.float32)
+    k0, k1, k2 = kernel[0], kernel[1], kernel[2]
+
+    computed = 0
+    for y in range(height):
+        # Horizontally filtered rows up to y + 1 (row r in slot r % 3)
+        while computed <= min(y + 1, height - 1):
+            row = ring[computed % 3]
+            for x in range(width):
+                combined[x] = base[computed, x] + edge_diff[computed, x] * edge_weight
+            for x in range(width):
+                row[x] = (k0 * combined[_reflect(x - 1, width)] + k1 * combined[x]
+                          + k2 * combined[_reflect(x + 1, width)])
+            computed += 1
+
+        up, center, down = ring[_reflect(y - 1, height) % 3], ring[y % 3], ring[_reflect(y + 1, height) % 3]
+        for x in range(width):
+            out[y, x] = k0 * up[x] + k1 * center[x] + k2 * down[x]
+
+
+@_jit
+def label_intensity_stats(labels, change_map, num_labels, bins):
+    """
+    Etiket başına yoğunluk toplamı, min, max ve [0, 1] histogramını tek geçişte hesapla
+
+    Sonuçlar measure_tile_regions'ın bincount/reduceat yoluyla aynıdır (toplam piksel
+    sırasıyla float64'te birikir, histogram kutusu float32 çarpımla bulunur).
+
+    Args:
+        labels: int32 etiket dizisi
+        change_map: Aynı şekilde float32 değişiklik haritası
+        num_labels: Arka plan dahil etiket sayısı
+        bins: Histogram kutu sayısı
+
+    Returns:
+        (intensity_sum, intensity_min, intensity_max, histogram)
+    """
+    total = np.zeros(num_labels, dtype=np.float64)
+    low = np.full(num_labels, np.inf, dtype=np.float32)
+    high = np.full(num_labels, -np.inf, dtype=np.float32)
+    histogram = np.zeros((num_labels, bins), dtype=np.int64)
+    bin_scale = np.float32(bins)
+
+    height, width = labels.shape
+    for y in range(height):
+        for x in range(width):
+            label, value = labels[y, x], change_map[y, x]
+            total[label] += value
+            low[label] = min(low[label], value)
+            high[label] = max(high[label], value)
+            if value >= 0 and value <= 1:
+                histogram[label, min(np.int64(value * bin_scale), bins - 1)] += 1
+
+    return total, low, high, histogram
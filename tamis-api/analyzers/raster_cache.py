@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Hatay Uydu Görüntüleri için Bulut Optimize GeoTIFF (COG) Önbelleği
+Kaynak GeoTIFF'lerin iç overview piramitli, döşemeli kopyalarını oluşturur ve
+dosya boyutu/değiştirilme zamanına göre önbellekte tutar; analiz rasterlarını
+(değişiklik yoğunluğu, hasar sınıfları) da aynı biçimde COG olarak yazar
+"""
+
+import os
+import json
+from datetime import datetime
+from typing import Callable, Dict, Any, Optional, List
+
+import numpy as np
+import rasterio
+import rasterio.shutil
+from rasterio.windows import Window
+
+
+class RasterCache:
+    """
+    Kaynak GeoTIFF dosyalarını overview piramitli COG kopyalarına dönüştürür
+
+    Küçültülmüş okumalar (out_shape ile) COG üzerinde tam çözümleme yerine
+    ucuz overview okumalarına dönüşür; tam çözünürlüklü pencere okumaları da
+    512x512 iç döşemelerden faydalanır.
+    """
+
+    # Lossless compression keeps change detection results identical to the source
+    COG_OPTIONS = {
+        'COMPRESS': 'DEFLATE',
+        'PREDICTOR': 'YES',
+        'BLOCKSIZE': 512,
+        'OVERVIEWS': 'AUTO',
+        'OVERVIEW_RESAMPLING': 'AVERAGE',
+        'NUM_THREADS': 'ALL_CPUS',
+        'BIGTIFF': 'IF_SAFER'
+    }
+
+    def __init__(self, data_dir: str = "1c__Hatay_Enkaz_Bina_Etiketleme", cache_dir: str = "cache"):
+        """
+        Raster önbelleğini başlat
+
+        Args:
+            data_dir (str): Uydu görüntüsü verilerini içeren dizin
+            cache_dir (str): COG kopyalarının ve manifest dosyasının yazılacağı dizin
+        """
+        self.data_dir = data_dir
+        self.cache_dir = os.path.join(cache_dir, "cog")
+        self.manifest_path = os.path.join(self.cache_dir, "manifest.json")
+        self.image_names = ["HATAY MERKEZ-2 2015.tif", "HATAY MERKEZ-2 2023.tif"]
+
+        # Progress tracking
+        self.progress_callbacks = []
+
+    def add_progress_callback(self, callback):
+        """İlerleme güncellemeleri için geri çağırma fonksiyonu ekle"""
+        self.progress_callbacks.append(callback)
+
+    def _update_progress(self, progress: float, message: str):
+        """Kayıtlı tüm geri çağırma fonksiyonları için ilerlemeyi güncelle"""
+        for callback in self.progress_callbacks:
+            try:
+                callback(progress, message)
+            except Exception as e:
+                print(f"Uyarı: İlerleme geri çağırma fonksiyonu başarısız: {e}")
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        """Önbellek manifest dosyasını oku"""
+        if os.path.exists(self.manifest_path):
+            try:
+                with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Uyarı: Önbellek manifesti okunamadı: {e}")
+        return {}
+
+    def _save_manifest(self, manifest: Dict[str, Any]):
+        """Önbellek manifest dosyasını kaydet"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.manifest_path)
+
+    @staticmethod
+    def source_signature(path: str) -> Dict[str, Any]:
+        """
+        Kaynak dosyanın önbellek anahtarını (boyut ve değiştirilme zamanı) hesapla
+
+        Args:
+            path: Kaynak dosya yolu
+
+        Returns:
+            size ve mtime anahtarlarını içeren sözlük
+        """
+        stat = os.stat(path)
+        return {'size': stat.st_size, 'mtime': stat.st_mtime}
+
+    def _cog_path(self, path: str) -> str:
+        """Kaynak dosya için COG kopyasının yolunu döndür"""
+        name = os.path.splitext(os.path.basename(path))[0]
+        return os.path.join(self.cache_dir, f"{name}.cog.tif")
+
+    def lookup(self, path: str) -> Optional[str]:
+        """
+        Kaynak dosya için güncel bir COG kopyası varsa yolunu döndür
+
+        Args:
+            path: Kaynak GeoTIFF yolu
+
+        Returns:
+            COG yolu veya önbellek eski/eksikse None
+        """
+        if not os.path.exists(path):
+            return None
+
+        entry = self._load_manifest().get(os.path.abspath(path))
+        if not entry or entry.get('source') != self.source_signature(path):
+            return None
+        if not os.path.exists(entry['cog_path']):
+            return None
+        return entry['cog_path']
+
+    def build(self, path: str) -> str:
+        """
+        Kaynak dosyadan COG kopyası oluştur ve manifest'e kaydet
+
+        Args:
+            path: Kaynak GeoTIFF yolu
+
+        Returns:
+            Oluşturulan COG dosyasının yolu
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        cog_path = self._cog_path(path)
+        tmp_path = cog_path + ".tmp.tif"
+        signature = self.source_signature(path)
+
+        print(f"COG kopyası oluşturuluyor: {os.path.basename(path)} -> {cog_path}")
+        rasterio.shutil.copy(path, tmp_path, driver='COG', **self.COG_OPTIONS)
+        os.replace(tmp_path, cog_path)
+
+        with rasterio.open(cog_path) as src:
+            overviews = src.overviews(1)
+
+        manifest = self._load_manifest()
+        manifest[os.path.abspath(path)] = {
+            'source': signature,
+            'cog_path': cog_path,
+            'overviews': overviews,
+            'created': datetime.now().isoformat()
+        }
+        self._save_manifest(manifest)
+
+        print(f"  Overview seviyeleri: {overviews}")
+        return cog_path
+
+    def ensure(self, path: str) -> str:
+        """
+        Kaynak dosya için güncel COG yolunu döndür, gerekirse oluştur
+
+        COG oluşturulamazsa kaynak dosya yolu döndürülür, böylece çağıranlar
+        önbellek olmadan çalışmaya devam eder.
+
+        Args:
+            path: Kaynak GeoTIFF yolu
+
+        Returns:
+            Okuma için kullanılacak dosya yolu
+        """
+        cached = self.lookup(path)
+        if cached:
+            return cached
+
+        if not os.path.exists(path):
+            return path
+
+        try:
+            return self.build(path)
+        except Exception as e:
+            print(f"Uyarı: {os.path.basename(path)} için COG oluşturulamadı, kaynak dosya kullanılacak: {e}")
+            return path
+
+    def ensure_images(self) -> Dict[str, str]:
+        """
+        2015 ve 2023 görüntülerinin COG kopyalarını hazırla
+
+        Returns:
+            Kaynak dosya adından okunacak dosya yoluna eşleme
+        """
+        resolved = {}
+        for i, name in enumerate(self.image_names):
+            self._update_progress(10 + 80 * i / len(self.image_names), f"{name} hazırlanıyor...")
+            resolved[name] = self.ensure(os.path.join(self.data_dir, name))
+        return resolved
+
+    def analyze(self) -> Dict[str, Any]:
+        """
+        Önbellek hazırlama adımını çalıştır (AnalyzerManager arayüzü)
+
+        Returns:
+            Hazırlanan dosyaların özetini içeren sözlük
+        """
+        self._update_progress(0, "Raster önbelleği kontrol ediliyor...")
+        resolved = self.ensure_images()
+        self._update_progress(100, "Raster önbelleği hazır")
+
+        return {
+            'cache_dir': self.cache_dir,
+            'images': {
+                name: {
+                    'path': path,
+                    'cached': path != os.path.join(self.data_dir, name)
+                }
+                for name, path in resolved.items()
+            }
+        }
+
+
+def resolve_raster_paths(data_dir: str, paths: List[str]) -> List[str]:
+    """
+    Verilen kaynak GeoTIFF yollarını önbellekteki COG kopyalarına çözümle
+
+    Args:
+        data_dir: Uydu görüntüsü verilerini içeren dizin
+        paths: Kaynak GeoTIFF yolları
+
+    Returns:
+        Okuma için kullanılacak yollar (aynı sırada)
+    """
+    cache = RasterCache(data_dir)
+    return [cache.ensure(path) for path in paths]
+
+
+def write_cog(path: str, array: np.ndarray, transform, crs=None, dtype: str = 'uint8',
+              encode: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+              colormap: Optional[Dict[int, tuple]] = None, scale: Optional[float] = None,
+              description: Optional[str] = None, resampling: str = 'AVERAGE',
+              block_rows: int = 1024) -> str:
+    """
+    Tek bantlı bir sahne dizisini overview piramitli COG olarak yaz
+
+    Dizi (np.memmap olabilir) satır blokları halinde döşemeli geçici bir GeoTIFF'e
+    yazılır, ardından COG sürücüsüyle kopyalanır; tüm sahne hiçbir zaman bellekte
+    dönüştürülmez. Dosya yerine os.replace ile taşınır.
+
+    Args:
+        path: Çıktı COG yolu
+        array: (yükseklik, genişlik) sahne dizisi
+        transform: Sahne afin dönüşümü
+        crs: Sahne koordinat sistemi (None olabilir)
+        dtype: Çıktı veri tipi
+        encode: Her satır bloğuna yazmadan önce uygulanacak dönüşüm (örn. ölçekleme)
+        colormap: Değerden (r, g, b, a) rengine eşleme (paletli sınıf rasterları için)
+        scale: Fiziksel değer = piksel * scale (GIS araçlarının okuduğu bant ölçeği)
+        description: Bant açıklaması
+        resampling: Overview örnekleme yöntemi (GDAL adı, örn. AVERAGE, MODE)
+        block_rows: Bir seferde yazılacak satır sayısı
+
+    Returns:
+        Yazılan COG yolu
+    """
+    height, width = array.shape
+    tmp_path = path + ".tmp.tif"
+    cog_tmp_path = path + ".tmp.cog.tif"
+
+    profile = {
+        'driver': 'GTiff', 'height': height, 'width': width, 'count': 1, 'dtype': dtype,
+        'crs': crs, 'transform': transform, 'tiled': True, 'blockxsize': 512, 'blockysize': 512,
+        'compress': 'DEFLATE', 'BIGTIFF': 'IF_SAFER'
+    }
+    try:
+        with rasterio.open(tmp_path, 'w', **profile) as dst:
+            for row in range(0, height, block_rows):
+                block = np.asarray(array[row:row + block_rows])
+                if encode is not None:
+                    block = encode(block)
+                dst.write(block.astype(dtype, copy=False), 1, window=Window(0, row, width, block.shape[0]))
+            if colormap is not None:
+                dst.write_colormap(1, colormap)
+            if scale is not None:
+                dst.scales = (scale,)
+                dst.offsets = (0.0,)
+            if description is not None:
+                dst.set_band_description(1, description)
+
+        options = dict(RasterCache.COG_OPTIONS, OVERVIEW_RESAMPLING=resampling)
+        rasterio.shutil.copy(tmp_path, cog_tmp_path, driver='COG', **options)
+        os.replace(cog_tmp_path, path)
+    finally:
+        for leftover in (tmp_path, cog_tmp_path):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+    return path
+
+
+def main():
+    """Bağımsız çalıştırma için ana fonksiyon"""
+    print("HATAY RASTER ÖNBELLEĞİ (COG)")
+    print("=" * 50)
+
+    cache = RasterCache()
+    result = cache.analyze()
+
+    for name, info in result['images'].items():
+        status = "önbellekte" if info['cached'] else "kaynak"
+        print(f"  • {name}: {info['path']} ({status})")
+
+    return result
+
+
+if __name__ == "__main__":
+    main()
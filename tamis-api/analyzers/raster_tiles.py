@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Hatay Hasar Analizi için XYZ Raster Karo Oluşturucu
+2015/2023 görüntülerinden ve değişiklik/hasar COG'larından Web Mercator (EPSG:3857)
+karolarını pencere okumalarıyla istek anında oluşturur. Karolar sınırlı bir bellek
+içi LRU önbellekte ve kaynak dosya sürümüne göre anahtarlanan disk önbelleğinde tutulur.
+"""
+
+import io
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import rasterio
+from rasterio.enums import ColorInterp
+from rasterio.vrt import WarpedVRT
+from rasterio.warp import Resampling
+from rasterio.windows import from_bounds
+from PIL import Image
+
+try:
+    from .raster_cache import RasterCache
+except ImportError:
+    try:
+        from raster_cache import RasterCache
+    except ImportError:
+        print("Uyarı: RasterCache mevcut değil")
+        RasterCache = None
+
+try:
+    import matplotlib
+except ImportError:
+    print("Uyarı: matplotlib mevcut değil")
+    matplotlib = None
+
+# Half the Web Mercator world width in metres
+WEB_MERCATOR_EXTENT = 20037508.342789244
+
+
+def tile_bounds(z: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    """
+    XYZ karosunun EPSG:3857 sınırlarını hesapla
+
+    Returns:
+        (left, bottom, right, top) metre cinsinden
+    """
+    size = 2 * WEB_MERCATOR_EXTENT / (1 << z)
+    left = -WEB_MERCATOR_EXTENT + x * size
+    top = WEB_MERCATOR_EXTENT - y * size
+    return left, top - size, left + size, top
+
+
+class TileLRU:
+    """
+    Toplam bayt sınırlı, iş parçacığı güvenli LRU karo önbelleği
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key) -> Optional[bytes]:
+        """Karoyu döndür ve en son kullanılan olarak işaretle (yoksa None)"""
+        with self._lock:
+            data = self._items.get(key)
+            if data is not None:
+                self._items.move_to_end(key)
+            return data
+
+    def put(self, key, data: bytes):
+        """Karoyu ekle, sınır aşılırsa en eski karoları çıkar"""
+        with self._lock:
+            if key in self._items:
+                self.size -= len(self._items.pop(key))
+            self._items[key] = data
+            self.size += len(data)
+            # Evict least recently used tiles until the budget holds
+            while self.size > self.max_bytes and self._items:
+                _, evicted = self._items.popitem(last=False)
+                self.size -= len(evicted)
+
+
+class TileCache:
+    """
+    Bellek içi LRU ve kaynak sürümüne göre anahtarlanan disk karo önbelleği
+
+    Disk karoları cache_dir/<katman>/<sürüm>/<z>/<x>/<y>.<uzantı> altında tutulur;
+    bir katmanın yeni sürümü ilk kez görüldüğünde eski sürümlerin karoları silinir.
+    """
+
+    def __init__(self, cache_dir: Optional[str], memory_bytes: int, suffix: str = 'png'):
+        """
+        Args:
+            cache_dir: Disk önbelleği dizini (None ise yalnızca bellek kullanılır)
+            memory_bytes: Bellek içi LRU önbelleğinin bayt sınırı
+            suffix: Disk karolarının dosya uzantısı
+        """
+        self.cache_dir = cache_dir
+        self.memory = TileLRU(memory_bytes)
+        self.suffix = suffix
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def _tile_path(self, layer: str, version: str, z: int, x: int, y: int) -> str:
+        return os.path.join(self.cache_dir, layer, version, str(z), str(x), f"{y}.{self.suffix}")
+
+    def get(self, layer: str, version: str, z: int, x: int, y: int) -> Optional[bytes]:
+        """Karoyu bellekten, yoksa diskten al (ikisinde de yoksa None)"""
+        key = (layer, version, z, x, y)
+        data = self.memory.get(key)
+        if data is not None or self.cache_dir is None:
+            return data
+
+        self._prune_versions(layer, version)
+        tile_path = self._tile_path(layer, version, z, x, y)
+        if not os.path.exists(tile_path):
+            return None
+        with open(tile_path, 'rb') as f:
+            data = f.read()
+        self.memory.put(key, data)
+        return data
+
+    def put(self, layer: str, version: str, z: int, x: int, y: int, data: bytes):
+        """Karoyu belleğe ve diske yaz"""
+        if self.cache_dir is not None:
+            tile_path = self._tile_path(layer, version, z, x, y)
+            os.makedirs(os.path.dirname(tile_path), exist_ok=True)
+            tmp_path = f"{tile_path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, tile_path)
+        self.memory.put((layer, version, z, x, y), data)
+
+    def _prune_versions(self, layer: str, version: str):
+        """Katmanın ilk kez görülen sürümünde eski sürümlerin disk karolarını sil"""
+        with self._lock:
+            if self._versions.get(layer) == version:
+                return
+            self._versions[layer] = version
+            layer_dir = os.path.join(self.cache_dir, layer)
+            if os.path.isdir(layer_dir):
+                for name in os.listdir(layer_dir):
+                    if name != version:
+                        shutil.rmtree(os.path.join(layer_dir, name), ignore_errors=True)
+
+
+class RasterTileRenderer:
+    """
+    Analiz rasterlarından 256x256 PNG XYZ karoları oluşturur
+
+    Kaynaklar WarpedVRT ile EPSG:3857'ye yansıtılır ve yalnızca karonun kapsadığı
+    pencere, karo boyutunda okunur; COG kaynaklarında uzak yakınlaştırmalar iç
+    overview'lardan gelir. Karolar bellek LRU'sunda ve disk önbelleğinde tutulur;
+    disk anahtarı kaynak dosyanın boyutu ve değiştirilme zamanını içerdiğinden yeni
+    bir analiz eski karoları kendiliğinden geçersiz kılar.
+    """
+
+    TILE_SIZE = 256
+
+    # Satellite images (read from their COG cache copies when available)
+    IMAGE_LAYERS = {
+        '2015': "HATAY MERKEZ-2 2015.tif",
+        '2023': "HATAY MERKEZ-2 2023.tif"
+    }
+
+    # Analysis COGs written by DisasterLabeler.export_scene_cogs
+    SCENE_LAYERS = {
+        'change': "hatay_change_intensity.tif",
+        'damage': "hatay_damage_classes.tif"
+    }
+
+    LAYERS = (*IMAGE_LAYERS, *SCENE_LAYERS)
+
+    # Change codes 0-127 (intensity 0-1) span the colormap, opacity follows intensity
+    CHANGE_COLORMAP = 'inferno'
+
+    def __init__(self, data_dir: str = "1c__Hatay_Enkaz_Bina_Etiketleme", output_dir: str = "output",
+                 cache_dir: str = os.path.join("cache", "tiles"), memory_bytes: int = 64 * 1024 * 1024):
+        """
+        Karo oluşturucuyu başlat
+
+        Args:
+            data_dir: Uydu görüntüsü verilerini içeren dizin
+            output_dir: Analiz çıktılarının (COG'lar) bulunduğu dizin
+            cache_dir: Disk karo önbelleği dizini (None ise disk önbelleği kullanılmaz)
+            memory_bytes: Bellek içi LRU önbelleğinin bayt sınırı
+        """
+        self.data_dir = data_dir
+        self.output_dir = output_dir
+        self.cache = TileCache(cache_dir, memory_bytes)
+        self._change_lut = None
+
+    def source_path(self, layer: str) -> Optional[str]:
+        """
+        Katmanın okunacak raster dosyasını bul
+
+        Returns:
+            Dosya yolu veya dosya yoksa None
+        """
+        if layer in self.IMAGE_LAYERS:
+            path = os.path.join(self.data_dir, self.IMAGE_LAYERS[layer])
+            cached = RasterCache(self.data_dir).lookup(path) if RasterCache is not None else None
+            path = cached or path
+        elif layer in self.SCENE_LAYERS:
+            path = os.path.join(self.output_dir, self.SCENE_LAYERS[layer])
+        else:
+            raise ValueError(f"Bilinmeyen karo katmanı: {layer}")
+        return path if os.path.exists(path) else None
+
+    @staticmethod
+    def source_version(path: str) -> str:
+        """Kaynak dosyanın boyutu ve değiştirilme zamanından kısa bir sürüm anahtarı oluştur"""
+        stat = os.stat(path)
+        return f"{stat.st_size:x}-{stat.st_mtime_ns:x}"
+
+    def render(self, layer: str, z: int, x: int, y: int) -> Optional[bytes]:
+        """
+        Karoyu önbellekten al veya oluştur
+
+        Args:
+            layer: Katman adı (LAYERS)
+            z, x, y: XYZ karo koordinatları
+
+        Returns:
+            PNG baytları veya katmanın kaynak dosyası yoksa None
+        """
+        path = self.source_path(layer)
+        if path is None:
+            return None
+        version = self.source_version(path)
+
+        data = self.cache.get(layer, version, z, x, y)
+        if data is None:
+            data = self.encode_png(self.render_rgba(layer, path, z, x, y))
+            self.cache.put(layer, version, z, x, y, data)
+        return data
+
+    def read_tile(self, path: str, z: int, x: int, y: int, resampling: Resampling,
+                  add_alpha: bool = False) -> Tuple[np.ndarray, Optional[Dict]]:
+        """
+        Kaynağın karoya düşen kısmını EPSG:3857'de karo boyutunda oku
+
+        Karonun raster dışında kalan kısmı sıfırla doldurulur.
+
+        Returns:
+            ((bant, TILE_SIZE, TILE_SIZE) dizi, paletli kaynaklarda renk tablosu veya None)
+        """
+        size = self.TILE_SIZE
+        left, bottom, right, top = tile_bounds(z, x, y)
+
+        with rasterio.open(path) as src, WarpedVRT(src, crs='EPSG:3857', resampling=resampling,
+                                                     add_alpha=add_alpha) as vrt:
+            colormap = None
+            if src.colorinterp[0] == ColorInterp.palette:
+                colormap = src.colormap(1)
+
+            tile = np.zeros((vrt.count, size, size), dtype=vrt.dtypes[0])
+            inner_left, inner_bottom = max(left, vrt.bounds.left), max(bottom, vrt.bounds.bottom)
+            inner_right, inner_top = min(right, vrt.bounds.right), min(top, vrt.bounds.top)
+            if inner_left >= inner_right or inner_bottom >= inner_top:
+                return tile, colormap
+
+            # Tile pixels covered by the raster; only that part is read, at that size
+            scale = size / (right - left)
+            col_start, col_end = round((inner_left - left) * scale), round((inner_right - left) * scale)
+            row_start, row_end = round((top - inner_top) * scale), round((top - inner_bottom) * scale)
+            if col_end <= col_start or row_end <= row_start:
+                return tile, colormap
+
+            window = from_bounds(inner_left, inner_bottom, inner_right, inner_top, vrt.transform)
+            tile[:, row_start:row_end, col_start:col_end] = vrt.read(
+                window=window, out_shape=(vrt.count, row_end - row_start, col_end - col_start),
+                resampling=resampling)
+        return tile, colormap
+
+    def render_rgba(self, layer: str, path: str, z: int, x: int, y: int) -> np.ndarray:
+        """
+        Katmanın karosunu (TILE_SIZE, TILE_SIZE, 4) RGBA dizisi olarak oluştur
+        """
+        if layer in self.IMAGE_LAYERS:
+            tile, _ = self.read_tile(path, z, x, y, Resampling.bilinear, add_alpha=True)
+            bands, alpha = tile[:-1], tile[-1]
+            rgb = np.repeat(bands[:1], 3, axis=0) if len(bands) < 3 else bands[:3]
+            return np.dstack([*rgb, alpha]).astype(np.uint8, copy=False)
+
+        if layer == 'change':
+            tile, _ = self.read_tile(path, z, x, y, Resampling.bilinear)
+            return self.change_lut()[tile[0]]
+
+        # Damage classes keep their exact values and use the file's color table;
+        # TIFF palettes carry no alpha, so class 0 (no damage) is made transparent here
+        tile, colormap = self.read_tile(path, z, x, y, Resampling.nearest)
+        lut = np.zeros((256, 4), dtype=np.uint8)
+        for value, color in (colormap or {}).items():
+            lut[value] = color
+        lut[0] = 0
+        return lut[tile[0]]
+
+    def change_lut(self) -> np.ndarray:
+        """Değişiklik kodlarından (0-255) RGBA renklerine 256 girdili tablo"""
+        if self._change_lut is None:
+            codes = np.minimum(np.arange(256) * 2, 255)
+            if matplotlib is not None:
+                lut = (matplotlib.colormaps[self.CHANGE_COLORMAP](codes) * 255).astype(np.uint8)
+            else:
+                lut = np.zeros((256, 4), dtype=np.uint8)
+                lut[:, 0] = codes
+            lut[:, 3] = codes
+            self._change_lut = lut
+        return self._change_lut
+
+    @staticmethod
+    def encode_png(rgba: np.ndarray) -> bytes:
+        """RGBA dizisini PNG baytlarına çevir"""
+        buffer = io.BytesIO()
+        Image.fromarray(rgba, 'RGBA').save(buffer, format='PNG')
+        return buffer.getvalue()
@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+Hatay Hasar Analizi için Kutucuklar Arası Bölge Birleştirme
+Her kutucukta ayrı etiketlenen değişiklik bölgelerini kenar şeritleri ve
+union-find ile sahne genelinde tekil alanlara birleştirir
+"""
+
+import os
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+# Import the optional one-pass region stats kernel
+try:
+    from .numba_kernels import NUMBA_AVAILABLE, label_intensity_stats
+except ImportError:
+    from numba_kernels import NUMBA_AVAILABLE, label_intensity_stats
+
+# Change intensity histogram bins per region (same as np.histogram(bins=10, range=(0, 1)))
+HISTOGRAM_BINS = 10
+
+
+class UnionFind:
+    """Yalnızca kutucuk kenarlarına değen bölge kimlikleri için seyrek union-find"""
+
+    def __init__(self):
+        self.parent: Dict[int, int] = {}
+
+    def find(self, item: int) -> int:
+        """Kümenin kökünü bul (yol sıkıştırmalı)"""
+        parent = self.parent
+        root = item
+        while parent.get(root, root) != root:
+            root = parent[root]
+        while item != root:
+            parent[item], item = root, parent[item]
+        return root
+
+    def union(self, a: int, b: int):
+        """İki kümeyi birleştir; küçük kimlik kök olarak kalır"""
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return
+        if root_b < root_a:
+            root_a, root_b = root_b, root_a
+        self.parent.setdefault(root_a, root_a)
+        self.parent[root_b] = root_a
+
+
+def measure_tile_regions(labels: np.ndarray, num_labels: int, stats: np.ndarray,
+                         centroids: np.ndarray, change_map: np.ndarray,
+                         origin: Tuple[int, int], min_size: int = 10, jit: bool = False) -> Dict[str, Any]:
+    """
+    Bir kutucuktaki bağlı bileşenlerin birleştirilebilir istatistiklerini çıkar
+
+    Alan, yoğunluk toplamı, ağırlık merkezi toplamları, sınır kutusu, min/max ve
+    histogram gibi toplanabilir değerler tutulur; böylece kenar boyunca bölünmüş
+    bir bölgenin parçaları daha sonra kesin olarak birleştirilebilir. Kutucuk
+    kenarına değmeyen ve min_size'dan küçük bölgeler hiçbir zaman büyüyemeyeceği
+    için hemen elenir.
+
+    Args:
+        labels: cv2.connectedComponentsWithStats etiket dizisi (halo hariç kutucuk)
+        num_labels: Arka plan dahil etiket sayısı
+        stats: cv2.connectedComponentsWithStats istatistikleri
+        centroids: cv2.connectedComponentsWithStats ağırlık merkezleri
+        change_map: Kutucuğun değişiklik haritası (labels ile aynı şekil)
+        origin: Kutucuğun sahnedeki (y_start, x_start) konumu
+        min_size: Kenara değmeyen bölgeler için en küçük alan (piksel)
+        jit: Yoğunluk istatistiklerini Numba çekirdeğiyle tek geçişte hesapla (Numba yoksa yok sayılır)
+
+    Returns:
+        Yerel etiket sayısı, tutulan bölgelerin istatistikleri ve kenar şeritleri
+    """
+    height, width = labels.shape
+    y_start, x_start = origin
+
+    regions = {
+        'count': int(num_labels - 1),
+        'edges': {
+            'top': labels[0, :].copy(),
+            'bottom': labels[-1, :].copy(),
+            'left': labels[:, 0].copy(),
+            'right': labels[:, -1].copy()
+        }
+    }
+
+    if num_labels <= 1:
+        regions['ids'] = np.zeros(0, dtype=np.int64)
+        return regions
+
+    left = stats[1:, 0]
+    top = stats[1:, 1]
+    right = left + stats[1:, 2]
+    bottom = top + stats[1:, 3]
+    area = stats[1:, 4]
+
+    touches_edge = (left == 0) | (top == 0) | (right == width) | (bottom == height)
+    keep = (area >= min_size) | touches_edge
+    ids = np.nonzero(keep)[0] + 1
+
+    if jit and NUMBA_AVAILABLE:
+        intensity_sum, intensity_min, intensity_max, histogram = label_intensity_stats(
+            labels, change_map, num_labels, HISTOGRAM_BINS)
+    else:
+        flat_labels = labels.ravel()
+        flat_change = change_map.ravel()
+
+        # Sum, min and max of the change intensity per label
+        intensity_sum = np.bincount(flat_labels, weights=flat_change, minlength=num_labels)
+        order = np.argsort(flat_labels, kind='stable')
+        sorted_change = flat_change[order]
+        starts = np.searchsorted(flat_labels[order], np.arange(num_labels))
+        intensity_min = np.minimum.reduceat(sorted_change, starts)
+        intensity_max = np.maximum.reduceat(sorted_change, starts)
+
+        # 10-bin histogram over [0, 1]; values outside the range are not counted
+        in_range = (flat_change >= 0) & (flat_change <= 1)
+        bins = np.minimum((flat_change[in_range] * HISTOGRAM_BINS).astype(np.int64), HISTOGRAM_BINS - 1)
+        histogram = np.bincount(flat_labels[in_range].astype(np.int64) * HISTOGRAM_BINS + bins,
+                                minlength=num_labels * HISTOGRAM_BINS).reshape(num_labels, HISTOGRAM_BINS)
+
+    regions.update({
+        'ids': ids.astype(np.int64),
+        'area': area[ids - 1].astype(np.int64),
+        'intensity_sum': intensity_sum[ids],
+        'intensity_min': intensity_min[ids].astype(np.float64),
+        'intensity_max': intensity_max[ids].astype(np.float64),
+        'histogram': histogram[ids].astype(np.int64),
+        # Centroid sums in scene coordinates, so merged centroids are exact
+        'sum_x': (centroids[ids, 0] + x_start) * area[ids - 1],
+        'sum_y': (centroids[ids, 1] + y_start) * area[ids - 1],
+        'min_x': (left[ids - 1] + x_start).astype(np.int64),
+        'max_x': (right[ids - 1] - 1 + x_start).astype(np.int64),
+        'min_y': (top[ids - 1] + y_start).astype(np.int64),
+        'max_y': (bottom[ids - 1] - 1 + y_start).astype(np.int64)
+    })
+    return regions
+
+
+class RegionStitcher:
+    """
+    Kutucuk bölgelerini sahne genelinde tekil alanlara birleştirir
+
+    Her kutucuk yerel etiketlerini diskteki int32 etiket rasterına yazar ve
+    yalnızca bölge istatistiklerini ve dört kenar şeridini bellekte bırakır.
+    resolve() komşu kutucukların kenar şeritlerini 8-komşuluk ile eşleştirip
+    union-find ile birleştirir; paint() ikinci geçişte etiketleri kutucuk kutucuk
+    nihai alan kimliklerine çevirip ayrı bir bölge rasterına yazar ve hasar
+    etiketlerini boyar. Yerel etiketler değiştirilmez, bu yüzden yarıda kalan bir
+    çalıştırma paint() sırasında kesilse bile kaldığı yerden devam edebilir. Sahnenin tamamı
+    hiçbir zaman bellekte tutulmaz.
+    """
+
+    REGION_RASTER = ('hatay_region_ids.dat', np.int32)
+
+    # Working file with the per-tile local labels (kept in the run directory when checkpointing)
+    TILE_LABELS = 'tile_labels.dat'
+
+    ACCUMULATED = ('area', 'intensity_sum', 'sum_x', 'sum_y')
+
+    def __init__(self, raster_dir: str, shape: Tuple[int, int], tile_size: int, min_size: int = 10,
+                 work_dir: Optional[str] = None):
+        """
+        Birleştiriciyi başlat ve yerel etiket rasterını oluştur
+
+        Args:
+            raster_dir: Nihai bölge rasterının yazılacağı dizin
+            shape: Sahne boyutu (yükseklik, genişlik)
+            tile_size: Kutucuk kenar uzunluğu (piksel)
+            min_size: Birleştirme sonrası alan sayılacak en küçük bölge (piksel)
+            work_dir: Yerel etiketlerin tutulacağı çalışma dizini; verilirse mevcut dosya
+                korunur (kaldığı yerden devam için), verilmezse raster_dir'de geçici dosya kullanılır
+        """
+        self.raster_dir = raster_dir
+        self.shape = shape
+        self.tile_size = tile_size
+        self.min_size = min_size
+        self.work_dir = work_dir
+
+        os.makedirs(raster_dir, exist_ok=True)
+        filename, dtype = self.REGION_RASTER
+        self.region_path = os.path.join(raster_dir, filename)
+
+        if work_dir:
+            labels_path = os.path.join(work_dir, self.TILE_LABELS)
+            mode = 'r+' if os.path.exists(labels_path) else 'w+'
+        else:
+            labels_path, mode = self.region_path + '.labels.tmp', 'w+'
+        self.tile_labels = np.memmap(labels_path, dtype=dtype, mode=mode, shape=shape)
+
+        self.next_id = 1
+        self.offsets: Dict[Tuple[int, int], int] = {}
+        self.edges: Dict[Tuple[int, int], Dict[str, np.ndarray]] = {}
+        self.tile_regions = []
+
+        # Set by resolve() and paint()
+        self.field_lut: Optional[np.ndarray] = None
+        self.fields: Optional[Dict[str, np.ndarray]] = None
+        self.region_ids: Optional[np.ndarray] = None
+
+    def _tile_key(self, y_start: int, x_start: int) -> Tuple[int, int]:
+        return y_start // self.tile_size, x_start // self.tile_size
+
+    def _tile_bounds(self, key: Tuple[int, int]) -> Tuple[int, int, int, int]:
+        height, width = self.shape
+        y_start, x_start = key[0] * self.tile_size, key[1] * self.tile_size
+        return y_start, min(y_start + self.tile_size, height), x_start, min(x_start + self.tile_size, width)
+
+    def add_tile(self, y_start: int, x_start: int, regions: Dict[str, Any]):
+        """
+        Bir kutucuğun bölgelerini kaydet ve yerel etiketlerine sahne genelinde kimlik aralığı ayır
+
+        Args:
+            y_start, x_start: Kutucuğun sahnedeki konumu
+            regions: measure_tile_regions çıktısı
+        """
+        key = self._tile_key(y_start, x_start)
+        offset = self.next_id - 1
+        self.offsets[key] = offset
+        self.next_id += regions['count']
+
+        # Keep edge strips as global ids (0 stays background)
+        self.edges[key] = {side: np.where(strip > 0, strip.astype(np.int64) + offset, 0)
+                           for side, strip in regions['edges'].items()}
+
+        if len(regions['ids']):
+            tile_regions = {name: regions[name] for name in regions if name not in ('count', 'edges')}
+            tile_regions['ids'] = regions['ids'] + offset
+            self.tile_regions.append(tile_regions)
+
+    def _strip_row(self, tile_row: int, side: str) -> np.ndarray:
+        """Bir kutucuk satırının üst/alt şeritlerini sahne genişliğinde birleştir"""
+        width = self.shape[1]
+        row = np.zeros(width, dtype=np.int64)
+        for tile_col in range((width + self.tile_size - 1) // self.tile_size):
+            edges = self.edges.get((tile_row, tile_col))
+            if edges is not None:
+                _, _, x_start, x_end = self._tile_bounds((tile_row, tile_col))
+                row[x_start:x_end] = edges[side]
+        return row
+
+    def _seam_pairs(self) -> np.ndarray:
+        """Kenar boyunca 8-komşu olan bölge kimliği çiftlerini topla"""
+        height, width = self.shape
+        tiles_y = (height + self.tile_size - 1) // self.tile_size
+        tiles_x = (width + self.tile_size - 1) // self.tile_size
+        pairs = []
+
+        def collect(a, b):
+            # Same position and both diagonal neighbours across the seam
+            for shift in (-1, 0, 1):
+                if shift >= 0:
+                    a_part, b_part = a[:len(a) - shift], b[shift:]
+                else:
+                    a_part, b_part = a[-shift:], b[:len(b) + shift]
+                both = (a_part > 0) & (b_part > 0)
+                if np.any(both):
+                    pairs.append(np.stack([a_part[both], b_part[both]], axis=1))
+
+        # Horizontal seams span the full scene width, which also covers tile corners
+        for tile_row in range(tiles_y - 1):
+            collect(self._strip_row(tile_row, 'bottom'), self._strip_row(tile_row + 1, 'top'))
+
+        # Vertical seams within each tile row
+        for (tile_row, tile_col), edges in self.edges.items():
+            if tile_col + 1 < tiles_x:
+                right = self.edges.get((tile_row, tile_col + 1))
+                if right is not None:
+                    collect(edges['right'], right['left'])
+
+        if not pairs:
+            return np.zeros((0, 2), dtype=np.int64)
+        return np.unique(np.concatenate(pairs), axis=0)
+
+    def resolve(self) -> Dict[str, np.ndarray]:
+        """
+        Kenar çiftlerini birleştir ve sahne genelindeki alanların istatistiklerini hesapla
+
+        Returns:
+            Alan başına dizileri içeren sözlük (area, intensity_mean/min/max, histogram,
+            centroid_x/y, min_x/max_x/min_y/max_y); alan kimliği = dizin + 1
+        """
+        self.tile_labels.flush()
+
+        union_find = UnionFind()
+        for a, b in self._seam_pairs():
+            union_find.union(int(a), int(b))
+
+        if self.tile_regions:
+            regions = {name: np.concatenate([tile[name] for tile in self.tile_regions])
+                       for name in self.tile_regions[0]}
+        else:
+            regions = {'ids': np.zeros(0, dtype=np.int64)}
+
+        ids = regions['ids']
+        roots = ids.copy()
+        for i in np.nonzero(np.isin(ids, np.fromiter(union_find.parent, dtype=np.int64)))[0]:
+            roots[i] = union_find.find(int(ids[i]))
+
+        unique_roots, inverse = np.unique(roots, return_inverse=True)
+        count = len(unique_roots)
+
+        merged = {name: np.bincount(inverse, weights=regions[name], minlength=count) for name in self.ACCUMULATED}
+        merged['area'] = merged['area'].astype(np.int64)
+
+        merged['intensity_min'] = np.full(count, np.inf)
+        merged['intensity_max'] = np.full(count, -np.inf)
+        merged['histogram'] = np.zeros((count, HISTOGRAM_BINS), dtype=np.int64)
+        for name in ('min_x', 'min_y'):
+            merged[name] = np.full(count, np.iinfo(np.int64).max, dtype=np.int64)
+        for name in ('max_x', 'max_y'):
+            merged[name] = np.full(count, -1, dtype=np.int64)
+
+        if count:
+            for name in ('intensity_min', 'min_x', 'min_y'):
+                np.minimum.at(merged[name], inverse, regions[name])
+            for name in ('intensity_max', 'max_x', 'max_y'):
+                np.maximum.at(merged[name], inverse, regions[name])
+            np.add.at(merged['histogram'], inverse, regions['histogram'])
+
+        # Only merged regions of min_size pixels become fields. They are numbered in
+        # scan order of their bounding boxes, so ids do not depend on the order tiles finished in
+        candidates = np.nonzero(merged['area'] >= self.min_size)[0]
+        area = merged['area'][candidates]
+        centroid_x = merged['sum_x'][candidates] / area
+        centroid_y = merged['sum_y'][candidates] / area
+        order = np.lexsort((centroid_x, centroid_y, merged['min_x'][candidates], merged['min_y'][candidates]))
+        selected = candidates[order]
+
+        field_index = np.zeros(count, dtype=np.int32)
+        field_index[selected] = np.arange(1, len(selected) + 1, dtype=np.int32)
+
+        self.field_lut = np.zeros(self.next_id, dtype=np.int32)
+        self.field_lut[ids] = field_index[inverse]
+
+        area = merged['area'][selected]
+        self.fields = {
+            'area': area,
+            'intensity_mean': merged['intensity_sum'][selected] / area,
+            'intensity_min': merged['intensity_min'][selected],
+            'intensity_max': merged['intensity_max'][selected],
+            'histogram': merged['histogram'][selected],
+            'centroid_x': centroid_x[order],
+            'centroid_y': centroid_y[order],
+            'min_x': merged['min_x'][selected],
+            'max_x': merged['max_x'][selected],
+            'min_y': merged['min_y'][selected],
+            'max_y': merged['max_y'][selected]
+        }
+
+        print(f"  Kenar birleştirme: {len(ids)} kutucuk bölgesi -> {len(area)} alan")
+        return self.fields
+
+    def paint(self, damage_labels: np.ndarray, field_levels: np.ndarray) -> np.ndarray:
+        """
+        Yerel etiketleri alan kimliklerine çevir ve hasar etiketlerini boya
+
+        Alan şekilleri (çevre, uzama) bu geçişte ölçülmez; region_ids tamamlandıktan
+        sonra her alanın sınır kutusu kesitinde konturdan hesaplanır.
+
+        Args:
+            damage_labels: Sahne hasar etiketi dizisi (memmap)
+            field_levels: Alan kimliğinden (dizin 0 = arka plan) hasar seviyesine eşleme
+
+        Returns:
+            Alan kimliği rasterı (region_ids, finalize() çağrılana kadar yazılabilir)
+        """
+        _, dtype = self.REGION_RASTER
+        self.region_ids = np.memmap(self.region_path + '.tmp', dtype=dtype, mode='w+', shape=self.shape)
+
+        for key, offset in self.offsets.items():
+            y_start, y_end, x_start, x_end = self._tile_bounds(key)
+            local = np.asarray(self.tile_labels[y_start:y_end, x_start:x_end])
+            fields = self.field_lut[np.where(local > 0, local.astype(np.int64) + offset, 0)]
+
+            self.region_ids[y_start:y_end, x_start:x_end] = fields
+            damage_labels[y_start:y_end, x_start:x_end] = field_levels[fields]
+
+        self.region_ids.flush()
+        return self.region_ids
+
+    def finalize(self) -> str:
+        """Bölge rasterını diske yaz, geçici dosyayı yerine taşı ve geçici etiketleri sil"""
+        self.region_ids.flush()
+        self.region_ids = None
+        os.replace(self.region_path + '.tmp', self.region_path)
+
+        labels_path = self.tile_labels.filename
+        self.tile_labels = None
+        if not self.work_dir:
+            os.remove(labels_path)
+        return self.region_path
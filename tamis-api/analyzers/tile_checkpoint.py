@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Hatay Hasar Analizi için Kutucuk Kontrol Noktaları
+Uzun kutucuk çalıştırmalarında biten her kutucuğu çalışma dizinine kaydeder;
+yeniden başlatılan çalıştırma tamamlanmış kutucukları atlar
+"""
+
+import os
+import json
+import shutil
+import hashlib
+from datetime import datetime
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+
+class TileCheckpoint:
+    """
+    Bir kutucuk çalıştırmasının kalıcı durumunu yönetir
+
+    Çalışma dizini girdilerin imzasından türetilir (runs/<anahtar>) ve şunları içerir:
+    sahne memmap'leri (kutucuklar doğrudan buraya yazılır), değişiklik haritası hesaplanan
+    her kutucuk için yoğunluk histogramını tutan bir .npy dosyası (1. geçiş), bölgeleri
+    etiketlenen her kutucuk için bölge istatistiklerini ve kenar şeritlerini tutan bir
+    .npz dosyası (2. geçiş) ve imzayla birlikte kutucuk boyutunu saklayan run.json.
+    Kutucuk dosyaları ancak dizileri diske yazıldıktan sonra oluşturulur, bu yüzden
+    dosyanın varlığı o geçişte kutucuğun tamamlandığı anlamına gelir.
+    """
+
+    # Bump when the per-tile computation changes so stale checkpoints are discarded
+    VERSION = 2
+
+    MANIFEST = 'run.json'
+
+    def __init__(self, runs_dir: str, signature: Dict[str, Any]):
+        """
+        Kontrol noktasını başlat
+
+        Args:
+            runs_dir: Çalışma dizinlerinin oluşturulacağı üst dizin
+            signature: Girdileri ve sonucu etkileyen ayarları tanımlayan JSON uyumlu sözlük
+        """
+        self.signature = dict(signature, version=self.VERSION)
+        key = hashlib.sha1(json.dumps(self.signature, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+        self.run_dir = os.path.join(runs_dir, key)
+        self.tiles_dir = os.path.join(self.run_dir, 'tiles')
+        self.change_dir = os.path.join(self.run_dir, 'change')
+        self.manifest_path = os.path.join(self.run_dir, self.MANIFEST)
+
+    def open(self, tile_size: int, required_files=()) -> Tuple[int, bool]:
+        """
+        Çalışma dizinini hazırla; aynı girdilerle yarıda kalmış bir çalıştırma varsa devam et
+
+        Args:
+            tile_size: Yeni çalıştırma için önerilen kutucuk boyutu
+            required_files: Devam edebilmek için çalışma dizininde bulunması gereken dosyalar
+
+        Returns:
+            (kullanılacak kutucuk boyutu, önceki çalıştırmaya devam ediliyor mu)
+        """
+        manifest = None
+        if os.path.exists(self.manifest_path):
+            try:
+                with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Uyarı: Kontrol noktası manifesti okunamadı, çalıştırma baştan başlayacak: {e}")
+
+        files_present = all(os.path.exists(os.path.join(self.run_dir, name)) for name in required_files)
+        if manifest and files_present and manifest.get('signature') == json.loads(json.dumps(self.signature, default=str)):
+            # The tile grid of the interrupted run must be kept, whatever memory allows now
+            return manifest['tile_size'], True
+
+        self.clear()
+        os.makedirs(self.tiles_dir, exist_ok=True)
+        os.makedirs(self.change_dir, exist_ok=True)
+        manifest = {
+            'signature': self.signature,
+            'tile_size': tile_size,
+            'created': datetime.now().isoformat()
+        }
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, default=str)
+        os.replace(tmp_path, self.manifest_path)
+        return tile_size, False
+
+    def _tile_path(self, y_start: int, x_start: int) -> str:
+        return os.path.join(self.tiles_dir, f"{y_start}_{x_start}.npz")
+
+    def save_change_tile(self, y_start: int, x_start: int, histogram: np.ndarray):
+        """
+        Değişiklik haritası hesaplanan kutucuğun yoğunluk histogramını kaydet
+
+        Kutucuğun değişiklik haritası çalışma dizinindeki memmap'e bu çağrıdan önce yazılmış olmalıdır.
+
+        Args:
+            y_start, x_start: Kutucuğun sahnedeki konumu
+            histogram: Kutucuğun değişiklik yoğunluğu histogramı
+        """
+        path = os.path.join(self.change_dir, f"{y_start}_{x_start}.npy")
+        tmp_path = path[:-len('.npy')] + '.tmp.npy'
+        np.save(tmp_path, histogram)
+        os.replace(tmp_path, path)
+
+    def completed_change_tiles(self) -> Dict[Tuple[int, int], np.ndarray]:
+        """
+        Önceki çalıştırmada değişiklik haritası hesaplanmış kutucukları yükle
+
+        Returns:
+            (y_start, x_start) konumundan yoğunluk histogramına eşleme
+        """
+        completed = {}
+        if not os.path.isdir(self.change_dir):
+            return completed
+
+        for name in os.listdir(self.change_dir):
+            if not name.endswith('.npy') or name.endswith('.tmp.npy'):
+                continue
+            y_start, x_start = (int(part) for part in name[:-len('.npy')].split('_'))
+            try:
+                completed[(y_start, x_start)] = np.load(os.path.join(self.change_dir, name))
+            except (OSError, ValueError) as e:
+                # A damaged checkpoint only costs recomputing that tile
+                print(f"Uyarı: Kutucuk kontrol noktası okunamadı, yeniden hesaplanacak ({name}): {e}")
+
+        return completed
+
+    def save_tile(self, y_start: int, x_start: int, regions: Dict[str, Any]):
+        """
+        Tamamlanan kutucuğun bölge istatistiklerini kaydet
+
+        Kutucuğun dizileri çalışma dizinindeki memmap'lere bu çağrıdan önce yazılmış olmalıdır.
+
+        Args:
+            y_start, x_start: Kutucuğun sahnedeki konumu
+            regions: measure_tile_regions çıktısı
+        """
+        arrays = {'count': np.array(regions['count'])}
+        for side, strip in regions['edges'].items():
+            arrays[f'edge_{side}'] = strip
+        for name, values in regions.items():
+            if name not in ('count', 'edges'):
+                arrays[name] = values
+
+        # Write under a temporary name so a half-written file never counts as done
+        path = self._tile_path(y_start, x_start)
+        tmp_path = path[:-len('.npz')] + '.tmp.npz'
+        np.savez(tmp_path, **arrays)
+        os.replace(tmp_path, path)
+
+    def completed_tiles(self) -> Dict[Tuple[int, int], Dict[str, Any]]:
+        """
+        Önceki çalıştırmada tamamlanmış kutucukları yükle
+
+        Returns:
+            (y_start, x_start) konumundan bölge istatistiklerine eşleme
+        """
+        completed = {}
+        if not os.path.isdir(self.tiles_dir):
+            return completed
+
+        for name in os.listdir(self.tiles_dir):
+            if not name.endswith('.npz') or name.endswith('.tmp.npz'):
+                continue
+            y_start, x_start = (int(part) for part in name[:-len('.npz')].split('_'))
+            try:
+                with np.load(os.path.join(self.tiles_dir, name)) as data:
+                    regions = {'count': int(data['count']), 'edges': {}}
+                    for key in data.files:
+                        if key.startswith('edge_'):
+                            regions['edges'][key[len('edge_'):]] = data[key]
+                        elif key != 'count':
+                            regions[key] = data[key]
+            except (OSError, ValueError, KeyError) as e:
+                # A damaged checkpoint only costs recomputing that tile
+                print(f"Uyarı: Kutucuk kontrol noktası okunamadı, yeniden hesaplanacak ({name}): {e}")
+                continue
+            completed[(y_start, x_start)] = regions
+
+        return completed
+
+    def clear(self):
+        """Çalışma dizinini sil"""
+        if os.path.isdir(self.run_dir):
+            shutil.rmtree(self.run_dir)
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Hatay Hasar Analizi için Üç Aşamalı Kutucuk Hattı
+Okuma, hesaplama ve yazma aşamalarını sınırlı kuyruklarla birbirine bağlayarak
+disk G/Ç'si ile hesaplamanın üst üste binmesini sağlar
+"""
+
+import importlib.util
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+
+class _StageError:
+    """Bir aşamada oluşan hatayı yazıcıya taşıyan kuyruk öğesi"""
+
+    def __init__(self, stage: str, error: BaseException):
+        self.stage = stage
+        self.error = error
+
+
+_END = object()  # Marks the end of a stage's output
+
+
+class TilePipeline:
+    """
+    Okuyucu -> hesaplama havuzu -> yazıcı şeklinde çalışan kutucuk hattı
+
+    Okuyucu iş parçacığı kutucukları sırayla önceden okur, hesaplama havuzu
+    kutucukları paralel işler ve yazıcı (çağıran iş parçacığı) sonuçları
+    geldikçe diske akıtır. Aşamalar arasındaki sınırlı kuyruklar geri basınç
+    sağlar: yazıcı yavaşlarsa hesaplama, hesaplama yavaşlarsa okuma bekler.
+    Böylece hiçbir kutucuk en yavaş komşusunu beklemez ve bellekteki kutucuk
+    sayısı kuyruk boyutlarıyla sınırlı kalır.
+    """
+
+    def __init__(self, read_tiles: Iterable[Any], compute_tile: Callable[[Any], Any],
+                 write_result: Callable[[Any], None], num_workers: int = 4,
+                 prefetch: Optional[int] = None, executor_factory: Optional[Callable[[int], Any]] = None,
+                 on_stop: Optional[Callable[[], None]] = None):
+        """
+        Kutucuk hattını başlat
+
+        Args:
+            read_tiles: Kutucukları okuma sırasında üreten yinelenebilir (okuyucu iş parçacığında tüketilir)
+            compute_tile: Bir kutucuğu işleyip sonucu döndüren fonksiyon
+            write_result: Her sonucu yazan fonksiyon (çağıran iş parçacığında çalışır)
+            num_workers: Hesaplama havuzundaki çalışan sayısı
+            prefetch: Okuma ve yazma kuyruklarının kapasitesi (varsayılan: 2 x çalışan)
+            executor_factory: Çalışan sayısını alıp concurrent.futures yürütücüsü döndüren fonksiyon
+                (varsayılan: ThreadPoolExecutor)
+            on_stop: Hat durdurulurken, aşamalar beklenmeden önce çağrılan fonksiyon
+                (ör. okuyucuyu bekleten paylaşımlı bellek yuvalarını iptal etmek için)
+        """
+        self.read_tiles = read_tiles
+        self.compute_tile = compute_tile
+        self.write_result = write_result
+        self.num_workers = max(1, num_workers)
+        self.prefetch = prefetch or 2 * self.num_workers
+        self.executor_factory = executor_factory or (lambda n: ThreadPoolExecutor(max_workers=n))
+        self.on_stop = on_stop
+
+        self._stop = threading.Event()
+
+    def _put(self, q: queue.Queue, item: Any) -> bool:
+        """Kuyruğa öğe koy; hat durdurulduysa False döndür"""
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _reader(self, tile_queue: queue.Queue, result_queue: queue.Queue):
+        """Okuma aşaması: kutucukları sırayla okuyup hesaplama kuyruğuna koy"""
+        try:
+            for tile in self.read_tiles:
+                if not self._put(tile_queue, tile):
+                    return
+        except BaseException as e:
+            self._put(result_queue, _StageError('okuma', e))
+        finally:
+            # Release open datasets held by a generator that was stopped early
+            if hasattr(self.read_tiles, 'close'):
+                self.read_tiles.close()
+            self._put(tile_queue, _END)
+
+    def _dispatcher(self, tile_queue: queue.Queue, result_queue: queue.Queue):
+        """Hesaplama aşaması: kutucukları havuza dağıt, en fazla num_workers işi uçuşta tut"""
+        in_flight = threading.Semaphore(self.num_workers)
+
+        def on_done(future):
+            in_flight.release()
+            try:
+                self._put(result_queue, future.result())
+            except BaseException as e:
+                self._put(result_queue, _StageError('hesaplama', e))
+
+        try:
+            with self.executor_factory(self.num_workers) as executor:
+                while not self._stop.is_set():
+                    try:
+                        tile = tile_queue.get(timeout=0.1)
+                    except queue.Empty:
+                        continue
+                    if tile is _END:
+                        break
+
+                    # Backpressure: wait for a free worker before taking more tiles
+                    while not in_flight.acquire(timeout=0.1):
+                        if self._stop.is_set():
+                            return
+                    executor.submit(self.compute_tile, tile).add_done_callback(on_done)
+        except BaseException as e:
+            self._put(result_queue, _StageError('hesaplama', e))
+        finally:
+            self._put(result_queue, _END)
+
+    def run(self, progress: Optional[Callable[[int], None]] = None) -> int:
+        """
+        Hattı çalıştır ve tüm sonuçlar yazılana kadar bekle
+
+        Args:
+            progress: Her yazılan sonuçtan sonra toplam yazılan sayısıyla çağrılan fonksiyon
+
+        Returns:
+            Yazılan sonuç sayısı
+
+        Raises:
+            RuntimeError: Okuma veya hesaplama aşamasında hata oluşursa
+        """
+        tile_queue = queue.Queue(maxsize=self.prefetch)
+        result_queue = queue.Queue(maxsize=self.prefetch)
+
+        reader = threading.Thread(target=self._reader, args=(tile_queue, result_queue), daemon=True)
+        dispatcher = threading.Thread(target=self._dispatcher, args=(tile_queue, result_queue), daemon=True)
+        reader.start()
+        dispatcher.start()
+
+        written = 0
+        try:
+            # Writer stage runs in the calling thread
+            while True:
+                item = result_queue.get()
+                if item is _END:
+                    break
+                if isinstance(item, _StageError):
+                    raise RuntimeError(f"Kutucuk hattı {item.stage} aşamasında başarısız: {item.error}") from item.error
+
+                self.write_result(item)
+                written += 1
+                if progress:
+                    progress(written)
+        finally:
+            self._stop.set()
+            if self.on_stop:
+                self.on_stop()
+            reader.join()
+            dispatcher.join()
+
+        return written
+
+
+class SharedTileSlots:
+    """
+    Kutucukları süreç çalışanlarına paylaşımlı bellek üzerinden aktaran yuva havuzu
+
+    Okuyucu kutucuk dizilerini boş bir yuvaya kopyalar ve çalışana yalnızca yuvanın
+    adını ve dizi düzenini içeren küçük bir görev sözlüğü gönderilir; diziler hiçbir
+    zaman pickle edilmez. Yuvalar yazıcı sonucu işledikten sonra serbest bırakılır,
+    bu yüzden yuva sayısı aynı anda bellekte tutulan kutucuk sayısını da sınırlar.
+    """
+
+    def __init__(self, num_slots: int, slot_bytes: int):
+        """
+        Yuva havuzunu oluştur
+
+        Args:
+            num_slots: Yuva sayısı (uçuştaki kutucuk sayısının üst sınırı)
+            slot_bytes: Bir kutucuğun tüm dizilerini alacak yuva boyutu (bayt)
+        """
+        self.slot_bytes = slot_bytes
+        self._blocks = []
+        self._free = queue.Queue()
+        self._cancelled = threading.Event()
+
+        try:
+            for slot in range(num_slots):
+                self._blocks.append(shared_memory.SharedMemory(create=True, size=slot_bytes))
+                self._free.put(slot)
+        except BaseException:
+            self.close()
+            raise
+
+    def put(self, arrays: List[np.ndarray], **info) -> Dict[str, Any]:
+        """
+        Dizileri boş bir yuvaya kopyala, yuva yoksa serbest kalana kadar bekle
+
+        Args:
+            arrays: Kopyalanacak diziler
+            **info: Göreve eklenecek ek alanlar (ör. pencere koordinatları)
+
+        Returns:
+            Çalışana gönderilecek görev sözlüğü
+
+        Raises:
+            RuntimeError: Havuz beklerken iptal edilirse
+        """
+        while True:
+            if self._cancelled.is_set():
+                raise RuntimeError("Paylaşımlı bellek yuvaları iptal edildi")
+            try:
+                slot = self._free.get(timeout=0.1)
+                break
+            except queue.Empty:
+                continue
+
+        block = self._blocks[slot]
+        layout = []
+        offset = 0
+        for array in arrays:
+            if offset + array.nbytes > self.slot_bytes:
+                self._free.put(slot)
+                raise ValueError(f"Kutucuk yuvaya sığmıyor: {offset + array.nbytes} > {self.slot_bytes} bayt")
+            view = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf, offset=offset)
+            view[...] = array
+            layout.append((array.shape, array.dtype.str, offset))
+            offset += array.nbytes
+
+        task = dict(info)
+        task.update({'slot': slot, 'shm_name': block.name, 'arrays': layout})
+        return task
+
+    def release(self, task: Dict[str, Any]):
+        """Görevin yuvasını havuza geri ver"""
+        self._free.put(task['slot'])
+
+    def cancel(self):
+        """Yuva bekleyen okuyucuyu serbest bırak (hat durdurulurken çağrılır)"""
+        self._cancelled.set()
+
+    def close(self):
+        """Tüm yuvaları kapat ve paylaşımlı belleği sistemden kaldır"""
+        self._cancelled.set()
+        for block in self._blocks:
+            block.close()
+            try:
+                block.unlink()
+            except FileNotFoundError:
+                pass
+        self._blocks = []
+
+
+class TileWorkspace:
+    """
+    Kutucuk hesaplamaları için iş parçacığına özel, yeniden kullanılan ara bellekler
+
+    Her iş parçacığı kendi ara belleklerini tutar; aynı ad ile istenen bellek bir
+    sonraki kutucukta yeniden kullanılır ve yalnızca daha büyük bir kutucuk
+    geldiğinde büyütülür. Sahne kenarındaki küçük kutucuklar mevcut belleğin başından
+    alınan görünümleri kullanır. Döndürülen diziler bir sonraki istekte üzerine
+    yazılır, bu yüzden kutucuk dışına taşınacak sonuçlar kopyalanmalıdır.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def get(self, name: str, shape, dtype=np.float32) -> np.ndarray:
+        """
+        Çağıran iş parçacığının adlandırılmış ara belleğini istenen biçimde döndür
+
+        Args:
+            name: Ara bellek adı (aynı hesaplamada eşzamanlı kullanılan bellekler farklı adlar almalı)
+            shape: İstenen dizi şekli
+            dtype: İstenen veri tipi
+
+        Returns:
+            Bitişik (C sıralı) ve ilklendirilmemiş dizi görünümü
+        """
+        buffers = getattr(self._local, 'buffers', None)
+        if buffers is None:
+            buffers = self._local.buffers = {}
+
+        dtype = np.dtype(dtype)
+        size = int(np.prod(shape))
+        buffer = buffers.get(name)
+        if buffer is None or buffer.dtype != dtype or buffer.size < size:
+            buffer = buffers[name] = np.empty(size, dtype=dtype)
+        return buffer[:size].reshape(shape)
+
+    def clear(self):
+        """Çağıran iş parçacığının ara belleklerini bırak"""
+        self._local.buffers = {}
+
+    def __getstate__(self):
+        # Buffers are per-thread scratch space; a pickled copy starts empty
+        return {}
+
+    def __setstate__(self, state):
+        self._local = threading.local()
+
+
+# Per-process state of tile workers (set up once by init_labeler_worker)
+_worker_state: Dict[str, Any] = {'labeler': None, 'outputs': {}, 'blocks': {}}
+
+
+def attach_shared_arrays(task: Dict[str, Any]) -> List[np.ndarray]:
+    """
+    Görevdeki paylaşımlı bellek yuvasına bağlanıp dizileri kopyasız görünüm olarak döndür
+
+    Args:
+        task: SharedTileSlots.put ile oluşturulan görev
+
+    Returns:
+        Yuvadaki dizilerin görünümleri
+    """
+    blocks = _worker_state['blocks']
+    block = blocks.get(task['shm_name'])
+    if block is None:
+        # Slots are reused across tiles, so each worker attaches to a block only once
+        block = shared_memory.SharedMemory(name=task['shm_name'])
+        blocks[task['shm_name']] = block
+
+    return [np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf, offset=offset)
+            for shape, dtype, offset in task['arrays']]
+
+
+def init_labeler_worker(module_path: str, class_name: str, state: Dict[str, Any],
+                        output_rasters: Dict[str, Any]):
+    """
+    Süreç çalışanını başlat: etiketleyiciyi kur ve sahne memmap'lerini aç
+
+    Modül dosya yolundan yüklenir; böylece ana süreç modülü betik, paket veya
+    AnalyzerManager üzerinden yüklemiş olsa da çalışan aynı sınıfı kullanır.
+
+    Args:
+        module_path: Etiketleyici sınıfını içeren modülün dosya yolu
+        class_name: Etiketleyici sınıfının adı
+        state: Etiketleyicinin yapılandırma öznitelikleri
+        output_rasters: Çıktı adından (yol, dtype, şekil) üçlüsüne eşleme
+    """
+    spec = importlib.util.spec_from_file_location("_tile_worker_module", module_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    # Skip __init__ so workers do not repeat the coordinate extractor setup
+    labeler_class = getattr(module, class_name)
+    labeler = labeler_class.__new__(labeler_class)
+    labeler.__dict__.update(state)
+
+    _worker_state['labeler'] = labeler
+    _worker_state['outputs'] = {
+        name: np.memmap(path, dtype=dtype, mode='r+', shape=tuple(shape))
+        for name, (path, dtype, shape) in output_rasters.items()
+    }
+
+
+def run_labeler_tile(task: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Süreç çalışanında bir kutucuğun değişiklik haritasını hesapla
+
+    Kutucuk paylaşımlı bellekten okunur, değişiklik haritası doğrudan sahne memmap'ine
+    yazılır; ana sürece yalnızca kutucuğun yoğunluk histogramı döner.
+
+    Args:
+        task: SharedTileSlots.put ile oluşturulan, 'window' alanı içeren görev
+
+    Returns:
+        Yuva bilgisi ve (y_start, y_end, x_start, x_end, None, histogram)
+        sonucunu (kutucuk atlandıysa None) içeren sözlük
+    """
+    tile1, tile2 = attach_shared_arrays(task)
+    y_start, y_end, x_start, x_end = task['window']
+
+    result = _worker_state['labeler'].compute_change_tile(y_start, y_end, x_start, x_end, tile1, tile2)
+    if result is not None:
+        change_map, histogram = result[4], result[5]
+        _worker_state['outputs']['change_map'][y_start:y_end, x_start:x_end] = change_map
+        result = (y_start, y_end, x_start, x_end, None, histogram)
+
+    return {'slot': task['slot'], 'result': result}
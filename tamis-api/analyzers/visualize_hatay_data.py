@@ -11,6 +11,16 @@ import matplotlib.pyplot as plt
 from rasterio.plot import show
 import numpy as np
 
+# Downsampled reads are served from the overview pyramids of cached COG copies
+try:
+    from .raster_cache import resolve_raster_paths
+except ImportError:
+    try:
+        from raster_cache import resolve_raster_paths
+    except ImportError:
+        print("Uyarı: RasterCache mevcut değil")
+        resolve_raster_paths = None
+
 def main():
     # Set the data directory
     data_dir = "C:\\Users\\furka\\Desktop\\TAMIS-V2\\tamis-api\\1c__Hatay_Enkaz_Bina_Etiketleme"
@@ -30,6 +40,9 @@ def main():
     print("Hatay deprem hasar değerlendirme verileri okunuyor...")
     print("=" * 60)
     
+    if resolve_raster_paths is not None:
+        img_2015_path, img_2023_path = resolve_raster_paths(data_dir, [img_2015_path, img_2023_path])
+    
     # Read the boundary shapefile
     print("Sınır verileri yükleniyor...")
     try:
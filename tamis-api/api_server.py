@@ -8,7 +8,7 @@ from tracemalloc import start
 from urllib import response
 from fastapi import FastAPI, HTTPException, BackgroundTasks, Query, Path as ApiPath
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, Field
 from typing import Optional, Dict, List, Any, Tuple
@@ -25,6 +25,7 @@ import queue
 import threading
 import time
 import uuid
+import numpy as np
 from typing import Dict, List
 
 # Import our analysis modules
@@ -32,6 +33,9 @@ try:
     from analyzers.analyzer_manager import AnalyzerManager
     from analyzers.check_data_info import check_data_info
     from analyzers.disaster_labeling import DisasterLabeler
+    from analyzers.field_output import iter_fields, load_field_columns, read_fields_at
+    from analyzers.raster_tiles import RasterTileRenderer
+    from analyzers.field_tiles import FieldTileRenderer
 except ImportError as e:
     print(f"Warning: Could not import analysis modules: {e}")
 
@@ -112,6 +116,7 @@ def analysis_worker():
                 analyzer_id = analysis_request["analyzer_id"]
                 task_name = analysis_request["task_name"]
                 timestamp = analysis_request["timestamp"]
+                options = analysis_request.get("options") or {}
                 
                 # Update status
                 analysis_status["running"] = True
@@ -123,11 +128,11 @@ def analysis_worker():
                 try:
                     # Use analyzer manager if available, fall back to script execution
                     if analyzer_manager:
-                        result = analyzer_manager.run_analyzer(analyzer_id, analysis_id)
+                        result = analyzer_manager.run_analyzer(analyzer_id, analysis_id, options=options)
                         success = result['status'] == 'completed'
                     else:
                         # Fallback to old script method
-                        success = run_analysis_with_progress_fallback(analyzer_id, task_name, analysis_id)
+                        success = run_analysis_with_progress_fallback(analyzer_id, task_name, analysis_id, options)
                     
                     # Store in history
                     analysis_history[analysis_id] = {
@@ -173,7 +178,8 @@ def analysis_worker():
             print(f"Çalışan thread hatası: {e}")
             time.sleep(1)
 
-def run_analysis_with_progress_fallback(analyzer_id: str, task_name: str, analysis_id: str) -> bool:
+def run_analysis_with_progress_fallback(analyzer_id: str, task_name: str, analysis_id: str,
+                                       options: Optional[Dict[str, Any]] = None) -> bool:
     """AnalyzerManager mevcut olmadığında subprocess kullanan yedek yöntem"""
     try:
         update_progress(task_name, 10, f"{analyzer_id} başlatılıyor")
@@ -196,6 +202,8 @@ def run_analysis_with_progress_fallback(analyzer_id: str, task_name: str, analys
         
         # Prepare the process with timeout
         cmd = [sys.executable, script_file] + script_args
+        if options:
+            cmd += ["--options", json.dumps(options)]
         timeout = 600  # 10 minutes max
         
         update_progress(task_name, 20, f"{script_file} çalıştırılıyor")
@@ -648,7 +656,12 @@ async def get_data_status():
         "hatay_interactive_map.html",
         "hatay_damage_assessment.png",
         "hatay_damage_report.json",
-        "hatay_field_analysis.json"
+        "hatay_field_analysis.json",
+        "hatay_fields.ndjson",
+        "hatay_damage_polygons.fgb",
+        "hatay_damage_polygons.geojson",
+        "hatay_change_intensity.tif",
+        "hatay_damage_classes.tif"
     ]
     
     outputs_status = {}
@@ -800,6 +813,7 @@ async def run_analysis(request: AnalysisRequest, background_tasks: BackgroundTas
     
     script_mapping = {
         "data_info": "data_info",
+        "raster_cache": "raster_cache",
         "visualization": "visualization", 
         "web_map": "web_map",
         "damage_labeling": "damage_labeling",
@@ -813,6 +827,14 @@ async def run_analysis(request: AnalysisRequest, background_tasks: BackgroundTas
         )
     
     analyzer_id = script_mapping[analysis_type]
+    options = request.options or {}
+    
+    if analyzer_id == "damage_labeling":
+        # Reject bad options now rather than failing the queued run later
+        try:
+            DisasterLabeler.validate_options(options)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
     
     # Get analyzer info for task name
     if analyzer_manager:
@@ -830,7 +852,7 @@ async def run_analysis(request: AnalysisRequest, background_tasks: BackgroundTas
         "analyzer_id": analyzer_id,
         "task_name": task_name,
         "timestamp": timestamp,
-        "options": request.options if hasattr(request, 'options') else {}
+        "options": options
     }
     
     analysis_queue.put(analysis_request)
@@ -869,6 +891,13 @@ async def get_damage_report():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Hasar raporu okunurken hata: {str(e)}")
 
+def iter_field_records(analysis_data: Dict[str, Any]):
+    """Alan kayıtlarını NDJSON alan dosyasından (eski çıktılarda JSON içinden) sırayla döndür"""
+    if "fields" in analysis_data:
+        yield from analysis_data["fields"]
+        return
+    yield from iter_fields(os.path.join("output", analysis_data["fields_file"]))
+
 @app.get("/api/results/field-analysis")
 async def get_field_analysis():
     """Koordinatları içeren saha analizi verilerini al"""
@@ -883,9 +912,109 @@ async def get_field_analysis():
     try:
         with open(analysis_path, 'r', encoding='utf-8') as f:
             analysis_data = json.load(f)
-        return analysis_data
+        if "fields" in analysis_data:
+            return analysis_data
+        fields_path = os.path.join("output", analysis_data["fields_file"])
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Saha analizi okunurken hata: {str(e)}")
+    
+    def body():
+        # Same {"metadata", "fields"} document, streamed from the NDJSON lines without parsing them
+        yield '{"metadata": ' + json.dumps(analysis_data["metadata"]) + ', "fields": ['
+        separator = ''
+        with open(fields_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield separator + line
+                    separator = ','
+        yield ']}'
+    
+    return StreamingResponse(body(), media_type="application/json")
+
+@app.get("/api/results/rasters")
+async def get_scene_rasters_info():
+    """Kaydedilmiş değişiklik haritası ve hasar etiketi rasterlarının meta verilerini al"""
+    metadata_path = os.path.join("output", "rasters", DisasterLabeler.SCENE_RASTER_METADATA)
+    
+    if not os.path.exists(metadata_path):
+        raise HTTPException(
+            status_code=404,
+            detail="Sahne rasterları bulunamadı. Önce afet etiketleme analizini çalıştırın."
+        )
+    
+    with open(metadata_path, 'r') as f:
+        return json.load(f)
+
+@app.get("/api/results/change-map/window")
+async def get_change_map_window(
+    x: int = Query(..., ge=0, description="Pencerenin sol piksel sütunu"),
+    y: int = Query(..., ge=0, description="Pencerenin üst piksel satırı"),
+    width: int = Query(..., gt=0, le=4096, description="Pencere genişliği (piksel)"),
+    height: int = Query(..., gt=0, le=4096, description="Pencere yüksekliği (piksel)")
+):
+    """Kaydedilmiş değişiklik haritasından bir pencerenin özetini yeniden hesaplamadan al"""
+    rasters = DisasterLabeler.load_scene_rasters(os.path.join("output", "rasters"))
+    if rasters is None:
+        raise HTTPException(status_code=404, detail="Sahne rasterları bulunamadı")
+    
+    change_map, damage_labels, raster_metadata = rasters
+    if x >= raster_metadata['width'] or y >= raster_metadata['height']:
+        raise HTTPException(status_code=400, detail="Pencere raster sınırlarının dışında")
+    
+    # Only the requested window is paged in from the memmaps
+    change_window = np.asarray(change_map[y:y + height, x:x + width])
+    labels_window = np.asarray(damage_labels[y:y + height, x:x + width])
+    del change_map, damage_labels
+    
+    # Level names come from the labeler run that wrote the rasters (older runs: default levels)
+    level_names = raster_metadata.get('damage_levels') or ['none'] + list(DisasterLabeler.DEFAULT_DAMAGE_THRESHOLDS)
+    class_counts = np.bincount(labels_window.ravel(), minlength=len(level_names))
+    
+    return {
+        "window": {"x": x, "y": y, "width": int(change_window.shape[1]), "height": int(change_window.shape[0])},
+        "change_intensity": {
+            "mean": float(change_window.mean()),
+            "max": float(change_window.max()),
+            "min": float(change_window.min())
+        },
+        "damage_pixels": {
+            (level_names[index] if index < len(level_names) else str(index)): int(count)
+            for index, count in enumerate(class_counts)
+        }
+    }
+
+@app.get("/api/results/damage-polygons")
+async def get_damage_polygons(
+    min_lon: Optional[float] = Query(None, description="Sınır kutusunun batı boylamı"),
+    min_lat: Optional[float] = Query(None, description="Sınır kutusunun güney enlemi"),
+    max_lon: Optional[float] = Query(None, description="Sınır kutusunun doğu boylamı"),
+    max_lat: Optional[float] = Query(None, description="Sınır kutusunun kuzey enlemi"),
+    damage_level: Optional[str] = Query(None, description="Hasar düzeyi filtresi")
+):
+    """Hasar bölgesi poligonlarını GeoJSON olarak al (isteğe bağlı sınır kutusu ile)"""
+    polygons_path = os.path.join("output", "hatay_damage_polygons.fgb")
+    
+    if not os.path.exists(polygons_path):
+        raise HTTPException(
+            status_code=404,
+            detail="Hasar poligonları bulunamadı. Önce afet etiketleme analizini çalıştırın."
+        )
+    
+    bbox = (min_lon, min_lat, max_lon, max_lat)
+    if any(value is None for value in bbox) and any(value is not None for value in bbox):
+        raise HTTPException(status_code=400, detail="Sınır kutusu için dört değer de verilmeli")
+    
+    try:
+        import geopandas as gpd
+        
+        # The FlatGeobuf spatial index returns only the features intersecting the box
+        polygons = gpd.read_file(polygons_path, bbox=None if bbox[0] is None else bbox)
+        if damage_level:
+            polygons = polygons[polygons["level"].str.lower() == damage_level.lower()]
+        return JSONResponse(content=json.loads(polygons.to_json()))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Hasar poligonları okunurken hata: {str(e)}")
 
 @app.get("/api/results/summary")
 async def get_analysis_summary():
@@ -915,6 +1044,8 @@ async def get_analysis_summary():
             summary["available_results"]["field_analysis"] = True
             if "fields" in field_data:
                 summary["statistics"]["total_fields"] = len(field_data["fields"])
+            elif "total_fields" in field_data.get("metadata", {}):
+                summary["statistics"]["total_fields"] = field_data["metadata"]["total_fields"]
         except:
             summary["available_results"]["field_analysis"] = False
     
@@ -939,6 +1070,41 @@ async def get_image(filename: str):
     
     return FileResponse(file_path)
 
+# XYZ tiles of the satellite images and analysis COGs (memory LRU + disk cache)
+try:
+    tile_renderer = RasterTileRenderer(get_data_dir())
+except Exception as e:
+    print(f"Karo oluşturucu başlatılamadı: {e}")
+    tile_renderer = None
+
+@app.get("/api/tiles/{layer}/{z}/{x}/{y}.png")
+def get_raster_tile(
+    layer: str = ApiPath(..., description="Katman: 2015, 2023, change veya damage"),
+    z: int = ApiPath(..., ge=0, le=24, description="Yakınlaştırma seviyesi"),
+    x: int = ApiPath(..., ge=0, description="Karo sütunu"),
+    y: int = ApiPath(..., ge=0, description="Karo satırı")
+):
+    """Uydu görüntüsü veya hasar katmanının 256x256 PNG XYZ karosunu al"""
+    # Plain def: rendering does blocking raster reads, so it runs in the threadpool
+    if tile_renderer is None:
+        raise HTTPException(status_code=503, detail="Karo oluşturucu kullanılamıyor")
+    if layer not in RasterTileRenderer.LAYERS:
+        raise HTTPException(status_code=404, detail=f"Bilinmeyen katman: {layer}")
+    if x >= 1 << z or y >= 1 << z:
+        raise HTTPException(status_code=400, detail="Karo koordinatları yakınlaştırma seviyesinin dışında")
+    
+    try:
+        tile = tile_renderer.render(layer, z, x, y)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Karo oluşturulurken hata: {str(e)}")
+    if tile is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Katman rasterı bulunamadı. Önce afet etiketleme analizini çalıştırın."
+        )
+    
+    return Response(content=tile, media_type="image/png", headers={"Cache-Control": "public, max-age=3600"})
+
 @app.get("/api/maps/{filename}")
 async def get_map(filename: str):
     """Oluşturulan HTML haritalarını sun"""
@@ -990,22 +1156,39 @@ async def search_fields(
         with open(os.path.join("output", "hatay_field_analysis.json"), 'r') as f:
             data = json.load(f)
         
-        fields = data.get("fields", [])
         filtered_fields = []
+        columns_dir = os.path.join("output", data.get("columns_dir", ""))
         
-        for field in fields:
-            # Apply filters
-            if min_area and field.get("area_m2", 0) < min_area:
-                continue
-            if max_area and field.get("area_m2", 0) > max_area:
-                continue
-            if damage_level and field.get("damage_level", "").lower() != damage_level.lower():
-                continue
-            
-            filtered_fields.append(field)
+        if "columns_dir" in data and os.path.isdir(columns_dir):
+            # Filter the memory-mapped columns, then read only the matching records
+            columns, manifest = load_field_columns(columns_dir)
+            selected = np.ones(manifest["count"], dtype=bool)
+            if min_area:
+                selected &= columns["area_m2"] >= min_area
+            if max_area:
+                selected &= columns["area_m2"] <= max_area
+            if damage_level:
+                levels = [level.lower() for level in manifest["levels"]]
+                level_index = levels.index(damage_level.lower()) + 1 if damage_level.lower() in levels else -1
+                selected &= columns["level_index"] == level_index
             
-            if len(filtered_fields) >= limit:
-                break
+            offsets = columns["ndjson_offset"][np.flatnonzero(selected)[:limit]]
+            filtered_fields = read_fields_at(os.path.join("output", data["fields_file"]), offsets)
+        else:
+            # Older outputs without columns: fields are read one line at a time until the limit
+            for field in iter_field_records(data):
+                # Apply filters
+                if min_area and field.get("area_m2", 0) < min_area:
+                    continue
+                if max_area and field.get("area_m2", 0) > max_area:
+                    continue
+                if damage_level and field.get("damage_level", "").lower() != damage_level.lower():
+                    continue
+                
+                filtered_fields.append(field)
+                
+                if len(filtered_fields) >= limit:
+                    break
         
         return {
             "total_matching": len(filtered_fields),
@@ -1020,6 +1203,39 @@ async def search_fields(
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Sahalar aranırken hata: {str(e)}")
+
+# Vector tiles of the damage fields, cached per analysis run
+try:
+    field_tile_renderer = FieldTileRenderer()
+except Exception as e:
+    print(f"Alan karo oluşturucu başlatılamadı: {e}")
+    field_tile_renderer = None
+
+@app.get("/api/fields/tiles/{z}/{x}/{y}.mvt")
+def get_field_tile(
+    z: int = ApiPath(..., ge=0, le=24, description="Yakınlaştırma seviyesi"),
+    x: int = ApiPath(..., ge=0, description="Karo sütunu"),
+    y: int = ApiPath(..., ge=0, description="Karo satırı")
+):
+    """Hasar alanlarının Mapbox Vector Tile karosunu al (yalnızca görünen alanlar)"""
+    # Plain def: building a tile reads the field table and runs in the threadpool
+    if field_tile_renderer is None:
+        raise HTTPException(status_code=503, detail="Alan karo oluşturucu kullanılamıyor")
+    if x >= 1 << z or y >= 1 << z:
+        raise HTTPException(status_code=400, detail="Karo koordinatları yakınlaştırma seviyesinin dışında")
+    
+    try:
+        tile = field_tile_renderer.render(z, x, y)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Alan karosu oluşturulurken hata: {str(e)}")
+    if tile is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Alan verileri bulunamadı. Önce afet etiketleme analizini çalıştırın."
+        )
+    
+    return Response(content=tile, media_type="application/vnd.mapbox-vector-tile",
+                    headers={"Cache-Control": "public, max-age=3600"})
     
 @app.get("/api/findOptimalRoute")
 async def find_optimal_route(
@@ -0,0 +1,23 @@
+"""
+Testler için ortak ayarlar
+
+Analizör modülleri API sunucusu gibi analyzers paketi üzerinden içe aktarılır.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def labeler():
+    """Veri dizini gerektirmeyen yöntemler için kurucusu atlanmış DisasterLabeler"""
+    from analyzers.disaster_labeling import DisasterLabeler
+    from analyzers.tile_pipeline import TileWorkspace
+
+    labeler = DisasterLabeler.__new__(DisasterLabeler)
+    labeler.workspace = TileWorkspace()
+    return labeler
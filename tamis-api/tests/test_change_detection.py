@@ -0,0 +1,57 @@
+"""Değişiklik tespiti çekirdeklerinin başvuru uygulamalarıyla karşılaştırılması"""
+
+import cv2
+import numpy as np
+import pytest
+from skimage.metrics import structural_similarity
+
+
+def gray_pair(shape, seed):
+    """Dokulu bir gri görüntü ve gürültülü, kısmen ters çevrilmiş kopyası"""
+    rng = np.random.default_rng(seed)
+    gray1 = cv2.GaussianBlur(rng.integers(0, 256, shape, dtype=np.uint8), (5, 5), 2)
+    gray2 = np.clip(gray1.astype(np.int16) + rng.integers(-40, 40, shape), 0, 255).astype(np.uint8)
+    gray2[10:40, 20:50] = 255 - gray2[10:40, 20:50]
+    gray1[-12:, -12:] = 128  # flat patch: only the stability constants keep SSIM defined
+    gray2[-12:, -12:] = 128
+    return gray1, gray2
+
+
+@pytest.mark.parametrize('shape', [(64, 64), (257, 190), (512, 384)])
+def test_ssim_map_matches_skimage(labeler, shape):
+    gray1, gray2 = gray_pair(shape, seed=shape[0])
+    expected = structural_similarity(gray1, gray2, full=True)[1]
+
+    ssim_map = labeler.compute_ssim_map(gray1, gray2)
+    assert ssim_map.shape == shape
+    assert np.allclose(ssim_map, expected, rtol=0, atol=1e-5)
+
+
+def test_ssim_map_workspace_reuse_across_shapes(labeler):
+    pairs = [gray_pair(shape, seed) for seed, shape in enumerate([(96, 80), (60, 130), (96, 80)])]
+    expected = [structural_similarity(gray1, gray2, full=True)[1] for gray1, gray2 in pairs]
+
+    # The result lives in the workspace, so copy it before the next call
+    results = [labeler.compute_ssim_map(gray1, gray2).copy() for gray1, gray2 in pairs]
+    for result, reference in zip(results, expected):
+        assert np.allclose(result, reference, rtol=0, atol=1e-5)
+
+
+def test_scene_threshold_from_tile_histograms(labeler):
+    rng = np.random.default_rng(5)
+    change_map = np.clip(rng.gamma(2.0, 0.08, (300, 420)), 0, 2).astype(np.float32)
+    labeler.change_threshold_std = 1.5
+
+    # Tile histograms add up to the scene histogram, whatever the tiling
+    histogram = np.zeros(labeler.CHANGE_HISTOGRAM_BINS, dtype=np.int64)
+    for y_start in range(0, 300, 128):
+        for x_start in range(0, 420, 128):
+            tile = change_map[y_start:y_start + 128, x_start:x_start + 128]
+            histogram += np.histogram(tile, bins=labeler.CHANGE_HISTOGRAM_BINS,
+                                      range=labeler.CHANGE_HISTOGRAM_RANGE)[0]
+
+    expected = change_map.mean(dtype=np.float64) + 1.5 * change_map.std(dtype=np.float64)
+    low, high = labeler.CHANGE_HISTOGRAM_RANGE
+    bin_width = (high - low) / labeler.CHANGE_HISTOGRAM_BINS
+    assert labeler.compute_change_threshold(histogram) == pytest.approx(expected, abs=bin_width)
+    assert labeler.compute_change_threshold(np.zeros_like(histogram)) == float('inf')
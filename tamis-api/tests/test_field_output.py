@@ -0,0 +1,118 @@
+"""FieldWriter/FieldColumns: sütunlu tablonun NDJSON bayt konumlarıyla kayıtlara geri dönmesi"""
+
+import os
+
+import numpy as np
+
+from analyzers.field_output import FieldWriter, iter_fields, load_field_columns, read_fields_at
+
+LEVELS = ['minimal', 'moderate', 'severe', 'catastrophic']
+
+
+def make_table(count, seed=0):
+    rng = np.random.default_rng(seed)
+    min_x = rng.integers(0, 500, count)
+    min_y = rng.integers(0, 500, count)
+    return {
+        'field_id': np.arange(1, count + 1),
+        'level': rng.integers(1, 5, count),
+        'area': rng.integers(10, 5000, count),
+        'min_x': min_x, 'max_x': min_x + rng.integers(0, 40, count),
+        'min_y': min_y, 'max_y': min_y + rng.integers(0, 40, count),
+        'centroid_x': min_x + rng.random(count) * 10,
+        'centroid_y': min_y + rng.random(count) * 10,
+        'intensity_mean': rng.random(count),
+        'intensity_min': rng.random(count) * 0.1,
+        'intensity_max': rng.random(count) + 1,
+        'histogram': rng.integers(0, 100, (count, 10))
+    }
+
+
+def build_records(table, start, stop):
+    """Kayıt içeriği tablodan bağımsız olabilir; burada yalnızca kimlik ve seviye yazılır"""
+    return [{'field_id': int(table['field_id'][i]), 'damage_level': LEVELS[int(table['level'][i]) - 1],
+             'note': 'ü' * int(i % 3)} for i in range(start, stop)]
+
+
+def write_fields(tmp_path, table, chunk_size, pixel_area_m2=0.25):
+    path = os.path.join(tmp_path, 'fields.ndjson')
+    columns_dir = os.path.join(tmp_path, 'columns')
+    writer = FieldWriter(path, LEVELS, columns_dir=columns_dir, pixel_area_m2=pixel_area_m2)
+    count = len(table['field_id'])
+    for start in range(0, count, chunk_size):
+        stop = min(start + chunk_size, count)
+        writer.write_table({name: column[start:stop] for name, column in table.items()},
+                           build_records(table, start, stop))
+    writer.close()
+    return path, columns_dir
+
+
+def test_offsets_read_back_the_records(tmp_path):
+    table = make_table(250)
+    path, columns_dir = write_fields(tmp_path, table, chunk_size=64)
+
+    columns, manifest = load_field_columns(columns_dir)
+    assert manifest['count'] == 250
+    assert manifest['levels'] == LEVELS
+
+    records = list(iter_fields(path))
+    assert records == build_records(table, 0, 250)
+
+    # Any subset, in any order, through the byte offsets of the columns
+    picked = np.array([249, 0, 17, 128, 17])
+    fields = read_fields_at(path, columns['ndjson_offset'][picked])
+    assert fields == [records[i] for i in picked]
+
+    # Vector filtering on the columns selects the same records
+    severe = np.nonzero(columns['level_index'] >= 3)[0]
+    assert [field['field_id'] for field in read_fields_at(path, columns['ndjson_offset'][severe])] == \
+        table['field_id'][table['level'] >= 3].tolist()
+
+
+def test_columns_hold_the_table_arrays(tmp_path):
+    table = make_table(100, seed=1)
+    _, columns_dir = write_fields(tmp_path, table, chunk_size=30)
+    columns, manifest = load_field_columns(columns_dir)
+
+    assert np.array_equal(columns['field_id'], table['field_id'])
+    assert np.array_equal(columns['area_pixels'], table['area'])
+    assert np.array_equal(columns['level_index'], table['level'])
+    assert np.array_equal(columns['min_x'], table['min_x'])
+    assert np.array_equal(columns['histogram'], table['histogram'])
+    assert np.array_equal(columns['intensity_mean'], table['intensity_mean'])
+    assert np.allclose(columns['area_m2'], table['area'] * 0.25)
+    assert manifest['pixel_area_m2'] == 0.25
+
+    # Columns the table does not have are missing values, not zeros
+    assert np.isnan(columns['longitude']).all()
+    assert np.isnan(columns['north']).all()
+
+
+def test_missing_histogram_and_empty_table(tmp_path):
+    table = make_table(5)
+    del table['histogram']
+    _, columns_dir = write_fields(tmp_path / 'nohist', table, chunk_size=5, pixel_area_m2=None)
+    columns, _ = load_field_columns(columns_dir)
+    assert (np.asarray(columns['histogram']) == -1).all()
+    assert np.isnan(columns['area_m2']).all()
+
+    path, columns_dir = write_fields(tmp_path / 'empty', make_table(0), chunk_size=5)
+    columns, manifest = load_field_columns(columns_dir)
+    assert manifest['count'] == 0
+    assert columns['ndjson_offset'].shape == (0,)
+    assert list(iter_fields(path)) == []
+
+
+def test_discarded_run_keeps_previous_output(tmp_path):
+    table = make_table(20)
+    path, columns_dir = write_fields(tmp_path, table, chunk_size=8)
+
+    writer = FieldWriter(path, LEVELS, columns_dir=columns_dir)
+    writer.write_table({name: column[:3] for name, column in make_table(3, seed=9).items()},
+                       build_records(make_table(3, seed=9), 0, 3))
+    writer.discard()
+
+    columns, manifest = load_field_columns(columns_dir)
+    assert manifest['count'] == 20
+    assert read_fields_at(path, columns['ndjson_offset'][[19]]) == build_records(table, 19, 20)
+    assert not os.path.exists(path + '.tmp')
@@ -0,0 +1,290 @@
+"""Alan vektör karoları: MVT kodlamasının geri çözülmesi ve alan ayak izlerinin field_id ile birleşmesi"""
+
+import os
+import struct
+
+import cv2
+import geopandas as gpd
+import numpy as np
+import pytest
+import shapely
+
+from analyzers.damage_polygons import vectorize_damage_labels
+from analyzers.field_output import FieldWriter
+from analyzers.field_tiles import (MVT_EXTENT, FieldTileRenderer, encode_layer, encode_polygon_geometry,
+                                   lonlat_to_web_mercator)
+from analyzers.raster_tiles import tile_bounds
+
+LEVEL_NAMES = ['minimal', 'moderate', 'severe', 'catastrophic']
+
+
+# Minimal protocol buffer reader for the vector tile schema
+
+def read_varint(data, pos):
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def read_message(data):
+    pos = 0
+    while pos < len(data):
+        key, pos = read_varint(data, pos)
+        number, wire_type = key >> 3, key & 7
+        if wire_type == 0:
+            value, pos = read_varint(data, pos)
+        elif wire_type == 1:
+            value, pos = data[pos:pos + 8], pos + 8
+        elif wire_type == 2:
+            length, pos = read_varint(data, pos)
+            value, pos = data[pos:pos + length], pos + length
+        else:
+            raise ValueError(f"unexpected wire type {wire_type}")
+        yield number, value
+
+
+def read_packed(data):
+    values, pos = [], 0
+    while pos < len(data):
+        value, pos = read_varint(data, pos)
+        values.append(value)
+    return values
+
+
+def decode_value(data):
+    for number, value in read_message(data):
+        if number == 1:
+            return value.decode('utf-8')
+        if number == 3:
+            return struct.unpack('<d', value)[0]
+        if number == 5:
+            return value
+    raise ValueError("empty value")
+
+
+def decode_polygons(commands):
+    """Komutları halkalara, halkaları işaretli alanlarına göre poligonlara çevir (spec 4.3.4.4)"""
+    rings, x, y, i = [], 0, 0, 0
+    while i < len(commands):
+        command, count = commands[i] & 7, commands[i] >> 3
+        i += 1
+        if command == 7:
+            rings[-1].append(rings[-1][0])
+            continue
+        for _ in range(count):
+            dx, dy = ((commands[i] >> 1) ^ -(commands[i] & 1)), ((commands[i + 1] >> 1) ^ -(commands[i + 1] & 1))
+            x, y = x + dx, y + dy
+            i += 2
+            if command == 1:
+                rings.append([(x, y)])
+            else:
+                rings[-1].append((x, y))
+
+    polygons = []
+    for ring in rings:
+        coords = np.array(ring, dtype=np.float64)
+        area = 0.5 * np.sum(coords[:-1, 0] * coords[1:, 1] - coords[1:, 0] * coords[:-1, 1])
+        assert area != 0
+        if area > 0:
+            polygons.append([ring])
+        else:
+            polygons[-1].append(ring)
+    return [shapely.Polygon(parts[0], parts[1:]) for parts in polygons]
+
+
+def decode_tile(data):
+    layers = {}
+    for number, layer_data in read_message(data):
+        assert number == 3
+        layer = {'features': []}
+        keys, values, features = [], [], []
+        for field, value in read_message(layer_data):
+            if field == 1:
+                layer['name'] = value.decode('utf-8')
+            elif field == 2:
+                features.append(value)
+            elif field == 3:
+                keys.append(value.decode('utf-8'))
+            elif field == 4:
+                values.append(decode_value(value))
+            elif field == 5:
+                layer['extent'] = value
+            elif field == 15:
+                layer['version'] = value
+        for feature_data in features:
+            feature = {}
+            for field, value in read_message(feature_data):
+                if field == 1:
+                    feature['id'] = value
+                elif field == 2:
+                    tags = read_packed(value)
+                    feature['properties'] = {keys[k]: values[v] for k, v in zip(tags[0::2], tags[1::2])}
+                elif field == 3:
+                    feature['type'] = value
+                elif field == 4:
+                    feature['polygons'] = decode_polygons(read_packed(value))
+            layer['features'].append(feature)
+        layers[layer['name']] = layer
+    return layers
+
+
+def test_encoded_layer_decodes_to_the_original_polygons():
+    donut = shapely.Polygon([(100, 100), (900, 100), (900, 800), (100, 800)],
+                            [[(300, 300), (500, 300), (500, 500), (300, 500)]])
+    pieces = shapely.MultiPolygon([shapely.box(1000, 1000, 1200, 1100), shapely.box(1200, 1100, 1500, 1400)])
+    geometries = shapely.orient_polygons([donut, pieces], exterior_cw=False)
+
+    features = [(7, {'field_id': 7, 'level': 'severe', 'area_m2': 12.5}, encode_polygon_geometry([geometries[0]])),
+                (9, {'field_id': 9, 'level': 'minimal', 'area_m2': 3.0},
+                 encode_polygon_geometry(list(shapely.get_parts(geometries[1]))))]
+    layers = decode_tile(encode_layer('fields', features))
+
+    layer = layers['fields']
+    assert layer['version'] == 2
+    assert layer['extent'] == MVT_EXTENT
+    assert [feature['id'] for feature in layer['features']] == [7, 9]
+    assert all(feature['type'] == 3 for feature in layer['features'])
+    assert layer['features'][0]['properties'] == {'field_id': 7, 'level': 'severe', 'area_m2': 12.5}
+    assert layer['features'][1]['properties'] == {'field_id': 9, 'level': 'minimal', 'area_m2': 3.0}
+
+    decoded_donut = layer['features'][0]['polygons']
+    assert len(decoded_donut) == 1 and len(decoded_donut[0].interiors) == 1
+    assert shapely.equals(decoded_donut[0], donut)
+    assert shapely.equals(shapely.MultiPolygon(layer['features'][1]['polygons']), pieces)
+    assert encode_layer('fields', []) == b''
+
+
+def make_index(geometries, level_index):
+    geometries = np.array(geometries, dtype=object)
+    count = len(geometries)
+    area = shapely.area(geometries)
+    return {
+        'geometries': geometries,
+        'tree': shapely.STRtree(geometries),
+        'mercator_area': area,
+        'minor': np.asarray(level_index) <= FieldTileRenderer.MINOR_LEVEL,
+        'field_id': np.arange(1, count + 1),
+        'level_index': np.asarray(level_index),
+        'area_m2': area,
+        'intensity': np.linspace(0.2, 0.9, count),
+        'level_names': LEVEL_NAMES
+    }
+
+
+def test_tile_geometry_maps_back_to_web_mercator():
+    z, x, y = 16, 39463, 25815
+    left, bottom, right, top = tile_bounds(z, x, y)
+    size = right - left
+    field = shapely.Polygon([(left + 0.2 * size, top - 0.2 * size), (left + 0.7 * size, top - 0.25 * size),
+                             (left + 0.6 * size, top - 0.8 * size), (left + 0.15 * size, top - 0.6 * size)],
+                            [[(left + 0.35 * size, top - 0.4 * size), (left + 0.45 * size, top - 0.4 * size),
+                              (left + 0.45 * size, top - 0.5 * size), (left + 0.35 * size, top - 0.5 * size)]])
+    far_away = shapely.box(left + 5 * size, bottom, left + 6 * size, top)
+    index = make_index([field, far_away], [3, 4])
+
+    layer = decode_tile(FieldTileRenderer.__new__(FieldTileRenderer).build_tile(index, z, x, y))['fields']
+    assert [feature['id'] for feature in layer['features']] == [1]
+    feature = layer['features'][0]
+    assert feature['properties']['level'] == 'severe'
+    assert feature['properties']['level_index'] == 3
+
+    # Back from the 4096 grid (y down) to metres; snapping moves vertices by at most half a unit
+    unit = size / MVT_EXTENT
+    polygon = shapely.transform(feature['polygons'][0],
+                                lambda coords: np.column_stack((left + coords[:, 0] * unit, top - coords[:, 1] * unit)))
+    assert shapely.hausdorff_distance(polygon, field) <= unit
+    assert polygon.area == pytest.approx(field.area, rel=1e-3)
+    assert len(polygon.interiors) == 1
+
+
+def test_small_minor_fields_are_thinned_at_low_zoom():
+    z, x, y = 12, 2466, 1613
+    left, bottom, right, top = tile_bounds(z, x, y)
+    pixel = (right - left) / 256
+    small = [shapely.box(left + 10 * pixel, top - 12 * pixel, left + 11 * pixel, top - 11 * pixel),
+             shapely.box(left + 30 * pixel, top - 32 * pixel, left + 31 * pixel, top - 31 * pixel)]
+    large = shapely.box(left + 50 * pixel, top - 80 * pixel, left + 80 * pixel, top - 50 * pixel)
+    index = make_index(small + [large], [1, 4, 2])
+
+    layer = decode_tile(FieldTileRenderer.__new__(FieldTileRenderer).build_tile(index, z, x, y))['fields']
+    # The tiny minimal field is dropped; tiny catastrophic and large moderate fields stay
+    assert [feature['id'] for feature in layer['features']] == [2, 3]
+
+
+def field_scene():
+    """Kutucuk kenarlarına yayılan, yalnızca köşeden değen ve delikli bölgeler"""
+    change_binary = np.zeros((90, 100), dtype=np.uint8)
+    change_binary[10:50, 25:40] = 1            # across a vertical seam
+    change_binary[20:30, 28:36] = 0            # with a hole
+    change_binary[60:64, 60:64] = 1            # two blocks meeting at a tile corner
+    change_binary[64:70, 64:70] = 1
+    change_binary[5:9, 70:95] = 1              # inside one tile
+    change_binary[80:82, 5:8] = 1              # too small to be a field
+    num_labels, labels = cv2.connectedComponents(change_binary, connectivity=8)
+    area = np.bincount(labels.ravel())
+    field_ids = np.where(area[labels] >= 10, labels, 0).astype(np.int32)
+    levels = np.zeros(num_labels, dtype=np.uint8)
+    levels[1:] = np.arange(num_labels - 1) % 4 + 1
+    return np.where(field_ids > 0, levels[labels], 0).astype(np.uint8), field_ids
+
+
+def test_vectorized_footprints_carry_their_field_id():
+    damage_labels, field_ids = field_scene()
+    geometries, fields, levels, areas = vectorize_damage_labels(damage_labels, field_ids, tile_size=32,
+                                                                simplify_tolerance=0)
+
+    expected = np.unique(field_ids[field_ids > 0])
+    assert fields.tolist() == expected.tolist()
+    rows, cols = np.mgrid[0:damage_labels.shape[0], 0:damage_labels.shape[1]]
+    for geometry, field, level, area in zip(geometries, fields, levels, areas):
+        mask = field_ids == field
+        assert area == mask.sum()
+        assert level == damage_labels[mask][0]
+        # The footprint covers exactly the field's pixel centers
+        assert np.array_equal(shapely.contains_xy(geometry, cols + 0.5, rows + 0.5), mask)
+
+
+def test_renderer_joins_polygons_on_field_id(tmp_path):
+    damage_labels, field_ids = field_scene()
+
+    # Pixel (col, row) -> lon/lat on a small north-up grid
+    def to_lonlat(coords):
+        return np.column_stack((36.1 + coords[:, 0] * 1e-5, 36.2 - coords[:, 1] * 1e-5))
+
+    geometries, fields, levels, areas = vectorize_damage_labels(damage_labels, field_ids, tile_size=32,
+                                                                transform_coords=to_lonlat)
+    output_dir = str(tmp_path)
+
+    # Field table in another order than the polygon file
+    order = np.arange(len(fields))[::-1]
+    centroids = to_lonlat(np.array([[1.0, 1.0]] * len(fields)))
+    table = {'field_id': fields[order], 'level': levels[order].astype(np.int64),
+             'area': np.rint(areas[order]).astype(np.int64),
+             'longitude': centroids[:, 0], 'latitude': centroids[:, 1]}
+    writer = FieldWriter(os.path.join(output_dir, 'hatay_fields.ndjson'), LEVEL_NAMES, pixel_area_m2=1.0,
+                         columns_dir=os.path.join(output_dir, FieldTileRenderer.FIELD_COLUMNS_DIR))
+    writer.write_table(table, [{'field_id': int(field)} for field in table['field_id']])
+    writer.close()
+
+    # Without polygons the footprint is the bounding box
+    renderer = FieldTileRenderer(output_dir, cache_dir=None)
+    assert renderer.load_polygons(table['field_id']) is None
+
+    gpd.GeoDataFrame({'field_id': fields, 'level_index': levels.astype(np.int32)},
+                     geometry=geometries, crs='EPSG:4326').to_file(
+        os.path.join(output_dir, FieldTileRenderer.POLYGONS_FILE), driver='FlatGeobuf', SPATIAL_INDEX='YES')
+
+    index = renderer.build_index()
+    assert index['field_id'].tolist() == table['field_id'].tolist()
+    for geometry, field in zip(index['geometries'], index['field_id']):
+        expected = shapely.transform(geometries[fields.tolist().index(field)],
+                                     lambda coords: np.column_stack(lonlat_to_web_mercator(coords[:, 0], coords[:, 1])))
+        assert shapely.equals(geometry, expected)
+
+    # A polygon file from another run (unknown field ids) is not joined
+    assert renderer.load_polygons(table['field_id'] + 100) is None
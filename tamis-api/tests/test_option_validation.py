@@ -0,0 +1,48 @@
+"""DisasterLabeler.validate_options: geçersiz seçeneklerin analiz başlamadan reddedilmesi"""
+
+import pytest
+
+from analyzers.disaster_labeling import DisasterLabeler
+
+
+@pytest.mark.parametrize('options', [
+    {'mode': 'partial'},
+    {'tile_backend': 'gpu'},
+    {'change_detector': 'ssim'},
+    {'kernel_backend': 'cuda'},
+    {'screening_level': -0.1},
+    {'screening_level': 'high'},
+    {'screening_level': True},
+    {'polygon_simplify_tolerance': -1},
+    {'damage_thresholds': [0.1, 0.3]},
+    {'damage_thresholds': {'unknown': 0.5}},
+    {'damage_thresholds': {'minimal': 0.5, 'moderate': 0.3}},
+])
+def test_invalid_options_are_rejected(options):
+    with pytest.raises(ValueError):
+        DisasterLabeler.validate_options(options)
+
+
+def test_valid_options_pass():
+    DisasterLabeler.validate_options({})
+    DisasterLabeler.validate_options({
+        'mode': 'reclassify',
+        'tile_backend': 'process',
+        'change_detector': 'fast',
+        'kernel_backend': 'numba',
+        'screening_level': 0,
+        'polygon_simplify_tolerance': 2.5,
+        'damage_thresholds': {'severe': 0.55},
+        'streaming': True,
+    })
+
+
+def test_apply_options_keeps_state_on_invalid_option():
+    labeler = DisasterLabeler.__new__(DisasterLabeler)
+    labeler.damage_thresholds = dict(DisasterLabeler.DEFAULT_DAMAGE_THRESHOLDS)
+    labeler.tile_backend = 'thread'
+
+    with pytest.raises(ValueError):
+        labeler.apply_options({'damage_thresholds': {'severe': 0.55}, 'tile_backend': 'gpu'})
+    assert labeler.damage_thresholds == DisasterLabeler.DEFAULT_DAMAGE_THRESHOLDS
+    assert labeler.tile_backend == 'thread'
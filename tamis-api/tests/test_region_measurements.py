@@ -0,0 +1,61 @@
+"""measure_regions: tek geçişli bölge istatistikleri ile etiket başına maske döngüsünün karşılaştırılması"""
+
+import cv2
+import numpy as np
+import pytest
+
+
+def mask_loop_regions(change_binary, change_map, min_size=10):
+    """Eski yöntem: her etiket için ayrı maske ile istatistikler"""
+    num_labels, labels = cv2.connectedComponents(change_binary.astype(np.uint8), connectivity=8)
+    regions = []
+    for label in range(1, num_labels):
+        mask = labels == label
+        area = int(np.sum(mask))
+        if area < min_size:
+            continue
+        ys, xs = np.where(mask)
+        values = change_map[mask]
+        regions.append({
+            'id': label,
+            'area': area,
+            'bounds': (xs.min(), xs.max(), ys.min(), ys.max()),
+            'centroid': (xs.mean(), ys.mean()),
+            'mean': float(np.mean(values.astype(np.float64))),
+            'min': float(np.min(values)),
+            'max': float(np.max(values)),
+            'histogram': np.histogram(values, bins=10, range=(0, 1))[0]
+        })
+    return labels, regions
+
+
+@pytest.mark.parametrize('seed', [0, 1])
+def test_measure_regions_matches_mask_loop(labeler, seed):
+    rng = np.random.default_rng(seed)
+    change_binary = (cv2.GaussianBlur(rng.random((240, 310)).astype(np.float32), (0, 0), 2.5) > 0.52).astype(np.uint8)
+    change_map = rng.random(change_binary.shape).astype(np.float32) * 1.2  # some values above the histogram range
+    change_map[5, 5] = 1.0  # the last bin is closed on the right
+
+    labels, num_labels, regions = labeler.measure_regions(change_binary, change_map)
+    expected_labels, expected = mask_loop_regions(change_binary, change_map)
+
+    assert np.array_equal(labels, expected_labels)
+    assert num_labels == labels.max() + 1
+    assert regions['ids'].tolist() == [region['id'] for region in expected]
+    for i, region in enumerate(expected):
+        assert regions['area'][i] == region['area']
+        assert (regions['min_x'][i], regions['max_x'][i], regions['min_y'][i], regions['max_y'][i]) == region['bounds']
+        assert regions['centroid_x'][i] == pytest.approx(region['centroid'][0])
+        assert regions['centroid_y'][i] == pytest.approx(region['centroid'][1])
+        assert regions['intensity_mean'][i] == pytest.approx(region['mean'], rel=1e-12)
+        assert regions['intensity_min'][i] == region['min']
+        assert regions['intensity_max'][i] == region['max']
+        assert np.array_equal(regions['histogram'][i], region['histogram'])
+
+
+def test_measure_regions_without_changes(labeler):
+    change_binary = np.zeros((50, 60), dtype=np.uint8)
+    labels, num_labels, regions = labeler.measure_regions(change_binary, np.zeros((50, 60), dtype=np.float32))
+    assert num_labels == 1
+    assert len(regions['ids']) == 0
+    assert regions['histogram'].shape == (0, 10)
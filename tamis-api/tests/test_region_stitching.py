@@ -0,0 +1,120 @@
+"""RegionStitcher: kutucuk kenarlarında bölünen bölgelerin tek sahne etiketlemesiyle aynı birleşmesi"""
+
+import cv2
+import numpy as np
+import pytest
+
+from analyzers.region_stitching import RegionStitcher, measure_tile_regions
+
+
+def stitch(binary, change_map, tile_size, raster_dir, min_size=10, tile_order=None):
+    """Sahneyi kutucuk kutucuk etiketleyip birleştir; (alanlar, alan kimliği rasterı) döndür"""
+    height, width = binary.shape
+    stitcher = RegionStitcher(str(raster_dir), binary.shape, tile_size, min_size=min_size)
+    origins = [(y, x) for y in range(0, height, tile_size) for x in range(0, width, tile_size)]
+    for index in (tile_order(len(origins)) if tile_order else range(len(origins))):
+        y_start, x_start = origins[index]
+        window = (slice(y_start, y_start + tile_size), slice(x_start, x_start + tile_size))
+        num_labels, labels, stats, centroids = cv2.connectedComponentsWithStats(binary[window], connectivity=8)
+        stitcher.tile_labels[window] = labels
+        stitcher.add_tile(y_start, x_start, measure_tile_regions(
+            labels, num_labels, stats, centroids, change_map[window], (y_start, x_start), min_size=min_size))
+
+    fields = stitcher.resolve()
+    field_levels = np.ones(len(fields['area']) + 1, dtype=np.uint8)
+    field_levels[0] = 0
+    damage_labels = np.zeros(binary.shape, dtype=np.uint8)
+    region_ids = np.array(stitcher.paint(damage_labels, field_levels))
+    stitcher.finalize()
+    assert np.array_equal(damage_labels, (region_ids > 0).astype(np.uint8))
+    return fields, region_ids
+
+
+def assert_matches_scene_labels(binary, change_map, fields, region_ids, min_size=10):
+    """Birleştirilmiş alanlar tüm sahnenin 8-bağlantılı etiketlemesiyle birebir eşleşmeli"""
+    num_labels, labels, stats, centroids = cv2.connectedComponentsWithStats(binary, connectivity=8)
+    kept = [label for label in range(1, num_labels) if stats[label, cv2.CC_STAT_AREA] >= min_size]
+
+    # Field ids are unique and consecutive
+    assert len(fields['area']) == len(kept)
+    assert np.array_equal(np.unique(region_ids[region_ids > 0]), np.arange(1, len(kept) + 1))
+
+    small = np.isin(labels, [label for label in range(1, num_labels) if label not in kept])
+    assert not region_ids[small | (labels == 0)].any()
+
+    for label in kept:
+        mask = labels == label
+        ids = np.unique(region_ids[mask])
+        assert len(ids) == 1 and ids[0] > 0
+        i = ids[0] - 1
+        ys, xs = np.nonzero(mask)
+        assert fields['area'][i] == mask.sum()
+        assert (fields['min_x'][i], fields['max_x'][i], fields['min_y'][i], fields['max_y'][i]) == \
+            (xs.min(), xs.max(), ys.min(), ys.max())
+        assert fields['centroid_x'][i] == pytest.approx(centroids[label, 0])
+        assert fields['centroid_y'][i] == pytest.approx(centroids[label, 1])
+        assert fields['intensity_mean'][i] == pytest.approx(change_map[mask].astype(np.float64).mean())
+        assert fields['intensity_min'][i] == change_map[mask].min()
+        assert fields['intensity_max'][i] == change_map[mask].max()
+
+
+def block_scene(tile_size):
+    """Kenarlara, kutucuk köşesine ve yalnızca çapraz temasla kenarlara yayılan bloklar"""
+    t = tile_size
+    binary = np.zeros((3 * t - 7, 3 * t - 11), dtype=np.uint8)
+    binary[5:20, t - 6:t + 6] = 1                  # across a vertical seam
+    binary[t - 4:t + 9, 10:25] = 1                 # across a horizontal seam
+    binary[2 * t - 5:2 * t + 5, 2 * t - 5:2 * t + 5] = 1  # over a four-tile corner
+    for step in range(-6, 6):                      # diagonal line through a tile corner
+        binary[t + step, t + step] = 1
+    for step in range(8):                          # diagonal line crossing a vertical seam
+        binary[2 * t + 10 + step, t - 4 + step] = 1
+    binary[t - 1, 2 * t - 1] = 1                   # corner contact only: two blocks meeting
+    binary[t - 6:t, 2 * t - 6:2 * t] = 1           # diagonally at the corner of four tiles
+    binary[t:t + 6, 2 * t:2 * t + 6] = 1
+    binary[40:43, 40:43] = 1                       # small region inside a tile, dropped
+    return binary
+
+
+@pytest.mark.parametrize('tile_size', [32, 50])
+def test_blocks_split_across_tiles_merge_into_single_fields(tmp_path, tile_size):
+    binary = block_scene(tile_size)
+    rng = np.random.default_rng(1)
+    change_map = rng.random(binary.shape).astype(np.float32)
+
+    fields, region_ids = stitch(binary, change_map, tile_size, tmp_path)
+    assert_matches_scene_labels(binary, change_map, fields, region_ids)
+
+
+def test_corner_contact_joins_regions_in_diagonal_tiles(tmp_path):
+    binary = np.zeros((64, 64), dtype=np.uint8)
+    binary[22:32, 22:32] = 1
+    binary[32:42, 32:42] = 1
+    change_map = np.full(binary.shape, 0.5, dtype=np.float32)
+
+    fields, region_ids = stitch(binary, change_map, 32, tmp_path)
+    assert len(fields['area']) == 1
+    assert fields['area'][0] == 200
+    assert set(np.unique(region_ids).tolist()) == {0, 1}
+
+
+def test_random_scene_matches_whole_scene_labeling(tmp_path):
+    rng = np.random.default_rng(7)
+    binary = (cv2.GaussianBlur(rng.random((203, 259)).astype(np.float32), (0, 0), 2.0) > 0.52).astype(np.uint8)
+    change_map = rng.random(binary.shape).astype(np.float32)
+
+    fields, region_ids = stitch(binary, change_map, 48, tmp_path)
+    assert_matches_scene_labels(binary, change_map, fields, region_ids)
+
+
+def test_field_ids_do_not_depend_on_tile_order(tmp_path):
+    rng = np.random.default_rng(3)
+    binary = (cv2.GaussianBlur(rng.random((150, 170)).astype(np.float32), (0, 0), 2.0) > 0.52).astype(np.uint8)
+    change_map = rng.random(binary.shape).astype(np.float32)
+
+    fields, region_ids = stitch(binary, change_map, 40, tmp_path / 'ordered')
+    shuffled_fields, shuffled_ids = stitch(binary, change_map, 40, tmp_path / 'shuffled',
+                                           tile_order=lambda count: rng.permutation(count))
+    assert np.array_equal(region_ids, shuffled_ids)
+    for name in fields:
+        assert np.allclose(fields[name], shuffled_fields[name])
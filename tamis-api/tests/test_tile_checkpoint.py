@@ -0,0 +1,123 @@
+"""TileCheckpoint: kaydedilen kutucukların devam eden çalıştırmada aynen geri okunması"""
+
+import cv2
+import numpy as np
+
+from analyzers.region_stitching import RegionStitcher, measure_tile_regions
+from analyzers.tile_checkpoint import TileCheckpoint
+
+SIGNATURE = {'img_2015': 'a.tif', 'img_2023': 'b.tif', 'size': [1, 2]}
+TILE_SIZE = 40
+
+
+def make_scene():
+    rng = np.random.default_rng(11)
+    binary = (cv2.GaussianBlur(rng.random((130, 150)).astype(np.float32), (0, 0), 2.0) > 0.52).astype(np.uint8)
+    return binary, rng.random(binary.shape).astype(np.float32)
+
+
+def tile_origins(shape):
+    return [(y, x) for y in range(0, shape[0], TILE_SIZE) for x in range(0, shape[1], TILE_SIZE)]
+
+
+def label_tile(binary, change_map, y_start, x_start):
+    window = (slice(y_start, y_start + TILE_SIZE), slice(x_start, x_start + TILE_SIZE))
+    num_labels, labels, stats, centroids = cv2.connectedComponentsWithStats(binary[window], connectivity=8)
+    return window, labels, measure_tile_regions(labels, num_labels, stats, centroids,
+                                                change_map[window], (y_start, x_start))
+
+
+def assert_regions_equal(saved, loaded):
+    assert loaded['count'] == saved['count']
+    assert set(loaded['edges']) == set(saved['edges'])
+    for side, strip in saved['edges'].items():
+        assert np.array_equal(loaded['edges'][side], strip)
+    assert set(loaded) == set(saved)
+    for name in saved:
+        if name not in ('count', 'edges'):
+            assert np.array_equal(loaded[name], saved[name])
+            assert loaded[name].dtype == saved[name].dtype
+
+
+def test_resumed_run_loads_saved_tiles(tmp_path):
+    binary, change_map = make_scene()
+    checkpoint = TileCheckpoint(str(tmp_path), SIGNATURE)
+    assert checkpoint.open(TILE_SIZE) == (TILE_SIZE, False)
+
+    saved = {}
+    for y_start, x_start in tile_origins(binary.shape)[:5]:
+        saved[(y_start, x_start)] = label_tile(binary, change_map, y_start, x_start)[2]
+        checkpoint.save_tile(y_start, x_start, saved[(y_start, x_start)])
+
+    # A tile interrupted while writing never counts as done
+    with open(checkpoint._tile_path(80, 80)[:-len('.npz')] + '.tmp.npz', 'wb') as f:
+        f.write(b'partial')
+
+    # The restarted run keeps the interrupted run's tile grid
+    resumed = TileCheckpoint(str(tmp_path), SIGNATURE)
+    assert resumed.run_dir == checkpoint.run_dir
+    assert resumed.open(2 * TILE_SIZE) == (TILE_SIZE, True)
+
+    completed = resumed.completed_tiles()
+    assert set(completed) == set(saved)
+    for origin, regions in saved.items():
+        assert_regions_equal(regions, completed[origin])
+
+
+def test_changed_signature_starts_over(tmp_path):
+    binary, change_map = make_scene()
+    checkpoint = TileCheckpoint(str(tmp_path), SIGNATURE)
+    checkpoint.open(TILE_SIZE)
+    checkpoint.save_tile(0, 0, label_tile(binary, change_map, 0, 0)[2])
+
+    changed = TileCheckpoint(str(tmp_path), dict(SIGNATURE, size=[1, 3]))
+    assert changed.open(TILE_SIZE) == (TILE_SIZE, False)
+    assert changed.completed_tiles() == {}
+
+    # Missing work files also restart the run
+    again = TileCheckpoint(str(tmp_path), SIGNATURE)
+    assert again.open(TILE_SIZE, required_files=['tile_labels.dat']) == (TILE_SIZE, False)
+    assert again.completed_tiles() == {}
+
+
+def test_stitching_resumed_tiles_matches_uninterrupted_run(tmp_path):
+    binary, change_map = make_scene()
+    origins = tile_origins(binary.shape)
+
+    def run(raster_dir, checkpoint=None, stop_after=None):
+        work_dir = checkpoint.run_dir if checkpoint else None
+        stitcher = RegionStitcher(str(raster_dir), binary.shape, TILE_SIZE, work_dir=work_dir)
+        done = checkpoint.completed_tiles() if checkpoint else {}
+        for y_start, x_start in origins:
+            if (y_start, x_start) in done:
+                stitcher.add_tile(y_start, x_start, done[(y_start, x_start)])
+                continue
+            if stop_after is not None and len(stitcher.offsets) == stop_after:
+                return None
+            window, labels, regions = label_tile(binary, change_map, y_start, x_start)
+            stitcher.tile_labels[window] = labels
+            stitcher.add_tile(y_start, x_start, regions)
+            if checkpoint:
+                stitcher.tile_labels.flush()
+                checkpoint.save_tile(y_start, x_start, regions)
+
+        fields = stitcher.resolve()
+        field_levels = np.ones(len(fields['area']) + 1, dtype=np.uint8)
+        field_levels[0] = 0
+        region_ids = np.array(stitcher.paint(np.zeros(binary.shape, dtype=np.uint8), field_levels))
+        stitcher.finalize()
+        return fields, region_ids
+
+    expected_fields, expected_ids = run(tmp_path / 'direct')
+
+    checkpoint = TileCheckpoint(str(tmp_path / 'runs'), SIGNATURE)
+    checkpoint.open(TILE_SIZE)
+    assert run(tmp_path / 'resumed', checkpoint, stop_after=len(origins) // 2) is None
+
+    resumed = TileCheckpoint(str(tmp_path / 'runs'), SIGNATURE)
+    assert resumed.open(TILE_SIZE, required_files=[RegionStitcher.TILE_LABELS]) == (TILE_SIZE, True)
+    fields, region_ids = run(tmp_path / 'resumed', resumed)
+
+    assert np.array_equal(region_ids, expected_ids)
+    for name in expected_fields:
+        assert np.array_equal(fields[name], expected_fields[name])